@@ -1,2 +1,4 @@
 # prospectconnect_sync/__init__.py
+from . import controllers
 from . import models
+from . import cli
@@ -1,6 +1,6 @@
 {
     "name": "ProspectConnect / Centripe Sync",
-    "version": "18.0.2.0.0",
+    "version": "18.0.2.1.0",
     "summary": "Complete bi-directional sync between Odoo 18 and ProspectConnect (Centripe) - Contacts, Deals, Tasks, Notes with field mapping and conflict resolution.",
     "description": """
 ProspectConnect / Centripe Sync
@@ -51,9 +51,13 @@ Synced Fields:
     "data": [
         "security/ir.model.access.csv",
         "views/pc_settings_view.xml",
+        "views/pc_account_views.xml",
         "views/pc_user_mapping_views.xml",
         "views/pc_pipeline_mapping_views.xml",
         "views/pc_task_mapping_views.xml",
+        "views/pc_sync_run_views.xml",
+        "views/pc_sync_bootstrap_views.xml",
+        "views/pc_sync_backfill_views.xml",
         "views/pc_menus.xml",
         "data/pc_cron_jobs.xml",
     ],
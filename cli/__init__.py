@@ -0,0 +1,2 @@
+# prospectconnect_sync/cli/__init__.py
+from . import pc_sync_worker
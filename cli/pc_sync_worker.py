@@ -0,0 +1,160 @@
+# prospectconnect_sync/cli/pc_sync_worker.py
+"""Dedicated low-latency push worker.
+
+Run next to the Odoo server (the module's directory must be in the addons
+path given first, so odoo-bin can find the command)::
+
+    odoo-bin --addons-path=/path/to/addons pc_sync_worker -c odoo.conf -d mydb \\
+        --concurrency 4 --rate-limit 5
+
+The worker LISTENs on the ``pc_sync_job`` channel, which the database
+notifies whenever a push job is committed or postponed, and drains the
+queue right away with ``--concurrency`` threads sharing one rate limit.
+Between notifications it sleeps, waking only when a debounced job becomes
+eligible or every ``--poll-interval`` seconds as a safety net (jobs to retry
+are not notified).
+"""
+import argparse
+import logging
+import select
+import signal
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from psycopg2.errors import SerializationFailure
+
+from odoo import SUPERUSER_ID, api, sql_db
+from odoo.cli import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+from ..models.pc_sync_job import NOTIFY_CHANNEL
+from ..tools import RateLimiter
+
+_logger = logging.getLogger(__name__)
+
+
+def _raise_keyboard_interrupt(*args):
+    raise KeyboardInterrupt()
+
+
+class SyncWorker:
+    """Pushes queued jobs of one database as soon as they are committed.
+
+    :param concurrency: number of threads pushing side by side, each with
+        its own cursor; jobs are claimed with ``SKIP LOCKED``
+    :param rate_limit: maximum calls per second over all threads
+    :param poll_interval: seconds between polls when nothing is notified
+    :param batch_size: jobs claimed per transaction
+    """
+
+    def __init__(self, dbname, concurrency=2, rate_limit=None, poll_interval=60, batch_size=10):
+        self.dbname = dbname
+        self.concurrency = max(concurrency, 1)
+        self.limiter = RateLimiter(rate_limit)
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self._drain_loop, name="pc_sync_worker_%s" % n, daemon=True)
+            for n in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        _logger.info(
+            "ProspectConnect sync worker started on %s (%s threads)", self.dbname, self.concurrency
+        )
+        try:
+            self._listen()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopping.set()
+            self.wake.set()
+            for thread in threads:
+                thread.join()
+            _logger.info("ProspectConnect sync worker stopped")
+
+    def _listen(self):
+        """Wake the drain threads on every notification."""
+        with sql_db.db_connect(self.dbname).cursor() as cr:
+            pg_conn = cr._cnx
+            cr.execute("LISTEN %s" % NOTIFY_CHANNEL)
+            cr.commit()
+            while not self.stopping.is_set():
+                if select.select([pg_conn], [], [], self.poll_interval) != ([], [], []):
+                    pg_conn.poll()
+                    if pg_conn.notifies:
+                        pg_conn.notifies.clear()
+                        self.wake.set()
+
+    def _drain_loop(self):
+        threading.current_thread().dbname = self.dbname
+        while not self.stopping.is_set():
+            # Cleared before draining: whatever is notified meanwhile is not lost
+            self.wake.clear()
+            try:
+                processed, next_at = self._drain_once()
+            except SerializationFailure:
+                # Another thread (or the cron) pushed the same jobs
+                continue
+            except Exception:
+                _logger.exception("ProspectConnect sync worker batch failed")
+                processed, next_at = 0, None
+            # Only pushes are progress: failed jobs wait for their backoff
+            if processed:
+                continue
+            timeout = self.poll_interval
+            if next_at:
+                timeout = min(timeout, max((next_at - datetime.utcnow()).total_seconds(), 0.1))
+            self.wake.wait(timeout)
+
+    def _drain_once(self):
+        """Push one batch in its own transaction.
+
+        :return: ``(jobs pushed, when the next postponed job or retry is due)``
+        """
+        registry = Registry(self.dbname).check_signaling()
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {"pc_rate_limiter": self.limiter})
+            Job = env["pc.sync.job"]
+            processed = Job.process_pending_jobs(limit=self.batch_size)
+            return processed, None if processed else Job._next_eligible_at()
+
+
+class PcSyncWorker(Command):
+    """Run the ProspectConnect push worker"""
+
+    name = "pc_sync_worker"
+
+    def run(self, cmdargs):
+        parser = argparse.ArgumentParser(
+            prog="%s %s" % (Path(sys.argv[0]).name, self.name),
+            description=self.__doc__,
+        )
+        parser.add_argument("--concurrency", type=int, default=2, help="pushing threads (default 2)")
+        parser.add_argument("--rate-limit", type=float, default=None, help="maximum calls per second")
+        parser.add_argument("--poll-interval", type=float, default=60, help="seconds between safety-net polls")
+        parser.add_argument("--batch-size", type=int, default=10, help="jobs per transaction")
+        options, odoo_args = parser.parse_known_args(cmdargs)
+
+        config.parse_config(odoo_args, setup_logging=True)
+        dbnames = config["db_name"]
+        if isinstance(dbnames, str):
+            dbnames = [name for name in dbnames.split(",") if name]
+        if len(dbnames or ()) != 1:
+            parser.error("exactly one database must be given with -d")
+
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+        SyncWorker(
+            dbnames[0],
+            concurrency=options.concurrency,
+            rate_limit=options.rate_limit,
+            poll_interval=options.poll_interval,
+            batch_size=options.batch_size,
+        ).run()
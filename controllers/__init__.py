@@ -0,0 +1,2 @@
+# prospectconnect_sync/controllers/__init__.py
+from . import main
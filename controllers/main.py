@@ -0,0 +1,62 @@
+# prospectconnect_sync/controllers/main.py
+import json
+import logging
+
+import psycopg2
+
+from odoo import http
+from odoo.http import request
+
+_logger = logging.getLogger(__name__)
+
+
+class PcWebhookController(http.Controller):
+
+    @http.route(
+        ["/prospectconnect/webhook", "/prospectconnect/webhook/<int:account_id>"],
+        type="http",
+        auth="public",
+        methods=["POST"],
+        csrf=False,
+        save_session=False,
+    )
+    def pc_webhook(self, account_id=None, **kwargs):
+        """Receive ProspectConnect change events.
+
+        Events of an account are posted to ``/prospectconnect/webhook/<id>``,
+        those of the default account to ``/prospectconnect/webhook``. The raw
+        body must be signed with HMAC-SHA256 using the webhook secret of that
+        account (``X-PC-Signature`` header). Events are only queued here; the
+        inbound jobs cron is triggered to apply them right away.
+        """
+        # Unknown or archived accounts are rejected like a bad signature
+        known = not account_id or account_id in request.env["pc.account"].sudo()._get_company_accounts().values()
+        Job = request.env["pc.sync.job"].with_context(pc_account_id=account_id or False)
+        body = request.httprequest.get_data()
+        signature = request.httprequest.headers.get("X-PC-Signature")
+        if not known or not Job._verify_webhook_signature(body, signature):
+            _logger.warning("Rejected ProspectConnect webhook with invalid signature")
+            return request.make_json_response({"error": "invalid signature"}, status=401)
+        # Signed by ProspectConnect: from here on the events are stored as superuser
+        Job = Job.sudo()
+
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return request.make_json_response({"error": "invalid JSON"}, status=400)
+        if isinstance(data, list):
+            events = data
+        else:
+            events = data.get("events") or [data]
+
+        try:
+            with Job.env.cr.savepoint():
+                accepted, duplicates = Job._enqueue_webhook_events(events)
+        except psycopg2.IntegrityError:
+            # The same event is being stored by a concurrent delivery; ask the
+            # sender to retry, the retry will be deduplicated.
+            return request.make_json_response({"error": "conflict, retry"}, status=409)
+
+        if accepted:
+            Job.env.ref("prospectconnect_sync.ir_cron_pc_inbound_jobs")._trigger()
+        return request.make_json_response({"accepted": accepted, "duplicates": duplicates})
@@ -0,0 +1,39 @@
+# prospectconnect_sync/migrations/18.0.2.1.0/post-migrate.py
+"""The single incremental sync cron became a push cron and one pull cron
+per object type: carry its active flag and interval over, so a database
+that was syncing keeps syncing at the same pace."""
+import logging
+
+from odoo import SUPERUSER_ID, api
+
+from odoo.addons.prospectconnect_sync.models.pc_sync_state import SYNC_CRONS
+
+_logger = logging.getLogger(__name__)
+
+MINUTES = {"minutes": 1, "hours": 60, "days": 24 * 60, "weeks": 7 * 24 * 60}
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    # Removed from the data file, it is only deleted once the update is done
+    old = env.ref("prospectconnect_sync.ir_cron_pc_incremental_sync", raise_if_not_found=False)
+    if not old:
+        return
+
+    if old.interval_type in MINUTES:
+        minutes = max(1, old.interval_number * MINUTES[old.interval_type])
+        env["ir.config_parameter"].set_param("prospectconnect_sync.poll_interval_minutes", minutes)
+    env["pc.sync.state"]._apply_sync_intervals()
+
+    crons = env["ir.cron"]
+    for unit, xmlid in SYNC_CRONS.items():
+        cron = env.ref(xmlid, raise_if_not_found=False)
+        if cron and unit != "mapping":
+            crons |= cron
+    crons.write({"active": old.active})
+    _logger.info(
+        "ProspectConnect: incremental sync cron replaced by %s, active=%s, every %s %s",
+        ", ".join(crons.mapped("name")), old.active, old.interval_number, old.interval_type,
+    )
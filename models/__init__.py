@@ -4,9 +4,15 @@ from . import res_partner
 from . import crm_lead
 from . import mail_activity
 from . import mail_message
+from . import pc_account
 from . import pc_user_mapping
 from . import pc_pipeline_mapping
+from . import pc_mapping_refresh
 from . import pc_task_mapping
+from . import pc_sync_run
 from . import pc_sync_state
 from . import pc_sync_job
-
+from . import pc_sync_inbound
+from . import pc_sync_bootstrap
+from . import pc_sync_backfill
+from . import pc_sync_breaker
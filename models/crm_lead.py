@@ -3,13 +3,23 @@ import logging
 
 from odoo import api, fields, models
 
+from ..tools import create_remote_id_index
+
 _logger = logging.getLogger(__name__)
 
 
 class CrmLead(models.Model):
     _inherit = "crm.lead"
 
-    pc_deal_id = fields.Char(string="ProspectConnect Deal ID", index=True)
+    # Unique per account where set, see init()
+    pc_deal_id = fields.Char(string="ProspectConnect Deal ID", copy=False)
+    pc_account_id = fields.Many2one(
+        "pc.account",
+        string="ProspectConnect Account",
+        copy=False,
+        ondelete="restrict",
+        help="Account the ProspectConnect ID belongs to (empty for the default account).",
+    )
     pc_last_sync_at = fields.Datetime(string="PC Deal Last Sync At")
     pc_last_remote_update = fields.Datetime(
         string="PC Deal Last Remote Update",
@@ -17,17 +27,24 @@ class CrmLead(models.Model):
     )
     pc_remote_assignee_id = fields.Char(
         string="PC Assignee ID",
-        help="ProspectConnect user ID of the assignee"
+        help="ProspectConnect user ID of the assignee",
+        index="btree_not_null",
     )
     pc_remote_stage_id = fields.Char(
         string="PC Stage ID",
-        help="ProspectConnect stage ID"
+        help="ProspectConnect stage ID",
+        index="btree_not_null",
     )
     pc_remote_pipeline_id = fields.Char(
         string="PC Pipeline ID",
         help="ProspectConnect pipeline ID"
     )
 
+    def init(self):
+        super().init()
+        # One opportunity per deal of a ProspectConnect account, whoever applies it first
+        create_remote_id_index(self.env.cr, self._table, "pc_deal_id")
+
     @api.model_create_multi
     def create(self, vals_list):
         leads = super().create(vals_list)
@@ -41,6 +58,8 @@ class CrmLead(models.Model):
 
     def _pc_maybe_sync_to_pc(self, trigger):
         """Schedule sync jobs for deals/opportunities."""
+        if self.env.context.get("pc_skip_sync"):
+            return
         config = self.env["ir.config_parameter"].sudo()
         if not config.get_param("prospectconnect_sync.sync_deals", "False") == "True":
             return
@@ -59,18 +78,9 @@ class CrmLead(models.Model):
         if direction not in ("odoo_to_pc", "bidirectional"):
             return
 
-        for lead in self.filtered(lambda l: l.type == "opportunity"):
-            self.env["pc.sync.job"].sudo().create(
-                {
-                    "direction": "odoo_to_pc",
-                    "object_type": "deal",
-                    "odoo_model": lead._name,
-                    "odoo_res_id": lead.id,
-                }
-            )
-            _logger.debug(
-                "ProspectConnect: queued sync job for deal %s (%s)",
-                lead.id,
-                lead.name,
-            )
+        priority = self.env["pc.sync.job"]._get_origin_priority(len(self))
+
+        records = self.filtered(lambda l: l.type == "opportunity")
+        self.env["pc.sync.job"].sudo()._queue_push("deal", records, priority)
+        _logger.debug("ProspectConnect: queued sync of deals %s", records.ids)
 
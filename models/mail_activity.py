@@ -3,13 +3,23 @@ import logging
 
 from odoo import api, fields, models
 
+from ..tools import create_remote_id_index
+
 _logger = logging.getLogger(__name__)
 
 
 class MailActivity(models.Model):
     _inherit = "mail.activity"
 
-    pc_task_id = fields.Char(string="ProspectConnect Task ID", index=True)
+    # Unique per account where set, see init()
+    pc_task_id = fields.Char(string="ProspectConnect Task ID", copy=False)
+    pc_account_id = fields.Many2one(
+        "pc.account",
+        string="ProspectConnect Account",
+        copy=False,
+        ondelete="restrict",
+        help="Account the ProspectConnect ID belongs to (empty for the default account).",
+    )
     pc_last_sync_at = fields.Datetime(string="PC Task Last Sync At")
     pc_last_remote_update = fields.Datetime(
         string="PC Task Last Remote Update",
@@ -17,9 +27,15 @@ class MailActivity(models.Model):
     )
     pc_remote_assignee_id = fields.Char(
         string="PC Assignee ID",
-        help="ProspectConnect user ID of the assignee"
+        help="ProspectConnect user ID of the assignee",
+        index="btree_not_null",
     )
 
+    def init(self):
+        super().init()
+        # One activity per task of a ProspectConnect account, whoever applies it first
+        create_remote_id_index(self.env.cr, self._table, "pc_task_id")
+
     @api.model_create_multi
     def create(self, vals_list):
         activities = super().create(vals_list)
@@ -33,6 +49,8 @@ class MailActivity(models.Model):
 
     def _pc_maybe_sync_to_pc(self, trigger):
         """Schedule sync jobs for tasks/activities."""
+        if self.env.context.get("pc_skip_sync"):
+            return
         config = self.env["ir.config_parameter"].sudo()
         if not config.get_param("prospectconnect_sync.sync_tasks", "False") == "True":
             return
@@ -51,17 +69,7 @@ class MailActivity(models.Model):
         if direction not in ("odoo_to_pc", "bidirectional"):
             return
 
-        for activity in self:
-            self.env["pc.sync.job"].sudo().create(
-                {
-                    "direction": "odoo_to_pc",
-                    "object_type": "task",
-                    "odoo_model": activity._name,
-                    "odoo_res_id": activity.id,
-                }
-            )
-            _logger.debug(
-                "ProspectConnect: queued sync job for task %s (%s)",
-                activity.id,
-                activity.summary,
-            )
+        priority = self.env["pc.sync.job"]._get_origin_priority(len(self))
+
+        self.env["pc.sync.job"].sudo()._queue_push("task", self, priority)
+        _logger.debug("ProspectConnect: queued sync of tasks %s", self.ids)
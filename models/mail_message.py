@@ -3,13 +3,23 @@ import logging
 
 from odoo import api, fields, models
 
+from ..tools import create_remote_id_index
+
 _logger = logging.getLogger(__name__)
 
 
 class MailMessage(models.Model):
     _inherit = "mail.message"
 
-    pc_note_id = fields.Char(string="ProspectConnect Note ID", index=True)
+    # Unique per account where set, see init()
+    pc_note_id = fields.Char(string="ProspectConnect Note ID", copy=False)
+    pc_account_id = fields.Many2one(
+        "pc.account",
+        string="ProspectConnect Account",
+        copy=False,
+        ondelete="restrict",
+        help="Account the ProspectConnect ID belongs to (empty for the default account).",
+    )
     pc_last_sync_at = fields.Datetime(string="PC Note Last Sync At")
     pc_last_remote_update = fields.Datetime(
         string="PC Note Last Remote Update",
@@ -21,6 +31,11 @@ class MailMessage(models.Model):
         help="Enable syncing this note to ProspectConnect"
     )
 
+    def init(self):
+        super().init()
+        # One message per note of a ProspectConnect account, whoever applies it first
+        create_remote_id_index(self.env.cr, self._table, "pc_note_id")
+
     @api.model_create_multi
     def create(self, vals_list):
         messages = super().create(vals_list)
@@ -45,6 +60,8 @@ class MailMessage(models.Model):
 
     def _pc_maybe_sync_to_pc(self, trigger):
         """Schedule sync jobs for notes."""
+        if self.env.context.get("pc_skip_sync"):
+            return
         config = self.env["ir.config_parameter"].sudo()
         if not config.get_param("prospectconnect_sync.sync_notes", "False") == "True":
             return
@@ -63,17 +80,7 @@ class MailMessage(models.Model):
         if direction not in ("odoo_to_pc", "bidirectional"):
             return
 
-        for message in self:
-            self.env["pc.sync.job"].sudo().create(
-                {
-                    "direction": "odoo_to_pc",
-                    "object_type": "note",
-                    "odoo_model": message._name,
-                    "odoo_res_id": message.id,
-                }
-            )
-            _logger.debug(
-                "ProspectConnect: queued sync job for note %s on %s",
-                message.id,
-                message.model,
-            )
+        priority = self.env["pc.sync.job"]._get_origin_priority(len(self))
+
+        self.env["pc.sync.job"].sudo()._queue_push("note", self, priority)
+        _logger.debug("ProspectConnect: queued sync of notes %s", self.ids)
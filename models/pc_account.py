@@ -0,0 +1,232 @@
+# prospectconnect_sync/models/pc_account.py
+import logging
+import threading
+from collections import defaultdict
+
+from odoo import api, fields, models, tools
+
+from ..tools import current_tape, is_testing
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.prospectconnect.ai"
+
+
+class PcAccount(models.Model):
+    """A ProspectConnect account serving the records of one company.
+
+    The credentials in Settings remain the default account, used by every
+    company without an account of its own; it is represented by an empty
+    ``pc.account`` recordset. Sync state, push jobs, staged records and the
+    user and pipeline mappings carry the account they belong to (empty for
+    the default one), and the code working for an account receives it as
+    ``pc_account_id`` in context.
+    """
+
+    _name = "pc.account"
+    _description = "ProspectConnect Account"
+    _order = "sequence, id"
+
+    name = fields.Char(required=True)
+    active = fields.Boolean(default=True)
+    sequence = fields.Integer(default=10)
+    company_id = fields.Many2one(
+        "res.company",
+        required=True,
+        ondelete="cascade",
+        help="Records of this company are pushed to, and pulled from, this account.",
+    )
+    api_key = fields.Char(string="API Key", required=True, groups="base.group_system")
+    base_url = fields.Char(string="Base URL", default=DEFAULT_BASE_URL, required=True)
+    webhook_secret = fields.Char(
+        string="Webhook Secret",
+        groups="base.group_system",
+        copy=False,
+        help="Shared secret used to verify the HMAC-SHA256 signature (X-PC-Signature) of this account's webhook calls.",
+    )
+    webhook_url = fields.Char(string="Webhook URL", compute="_compute_webhook_url")
+
+    _sql_constraints = [
+        ("pc_account_company_unique", "unique(company_id)", "A company can only sync with one ProspectConnect account."),
+    ]
+
+    # _get_company_accounts is cached: cleared once the change is written,
+    # so a concurrent read cannot cache the old accounts again
+    @api.model_create_multi
+    def create(self, vals_list):
+        accounts = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return accounts
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"company_id", "active"} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    def _compute_webhook_url(self):
+        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url", "")
+        for account in self:
+            account.webhook_url = "%s/prospectconnect/webhook/%s" % (base_url.rstrip("/"), account.id)
+
+    # ------------- LOOKUPS -------------
+
+    @api.model
+    @tools.ormcache()
+    def _get_company_accounts(self):
+        """Cached ``{res.company id: pc.account id}`` of the active accounts."""
+        return {
+            account.company_id.id: account.id
+            for account in self.sudo().search([])
+        }
+
+    @api.model
+    def _get_accounts(self):
+        """Every account to sync, the default one (empty recordset) first."""
+        account_ids = sorted(self._get_company_accounts().values())
+        return [self.browse()] + [self.browse(account_id) for account_id in account_ids]
+
+    @api.model
+    def _from_context(self):
+        """Account the current code works for (empty for the default one)."""
+        return self.browse(self.env.context.get("pc_account_id") or [])
+
+    def _get_credentials(self):
+        """``(api key, base url)`` of this account, or of the default one
+        when the recordset is empty."""
+        if self:
+            account = self.sudo()
+            return account.api_key, account.base_url or DEFAULT_BASE_URL
+        icp = self.env["ir.config_parameter"].sudo()
+        return (
+            icp.get_param("prospectconnect_sync.api_key"),
+            icp.get_param("prospectconnect_sync.base_url", DEFAULT_BASE_URL),
+        )
+
+    def _get_webhook_secret(self):
+        """Secret signing the webhook calls of this account, or of the
+        default one when the recordset is empty."""
+        if self:
+            return self.sudo().webhook_secret
+        return self.env["ir.config_parameter"].sudo().get_param("prospectconnect_sync.webhook_secret")
+
+    def _get_apply_context(self):
+        """Context applying remote records for this account: the account,
+        and its company for the records created."""
+        context = {"pc_account_id": self.id}
+        if self:
+            context["default_company_id"] = self.company_id.id
+        return context
+
+    def _param_key(self, name):
+        """Config parameter holding ``name`` for this account."""
+        if self:
+            return "prospectconnect_sync.account_%s_%s" % (self.id, name)
+        return "prospectconnect_sync.%s" % name
+
+    def _company_domain(self, field_name="company_id", shared=False):
+        """Domain on ``field_name`` selecting the records of this account's
+        company; for the default account, those of companies without an
+        account of their own and those without company.
+
+        :param shared: for an account, also select records without company
+        """
+        if self:
+            company_ids = [self.company_id.id, False] if shared else [self.company_id.id]
+            return [(field_name, "in", company_ids)]
+        company_ids = list(self._get_company_accounts())
+        return [(field_name, "not in", company_ids)] if company_ids else []
+
+    def _records_domain(self, model):
+        """Domain selecting the records of ``model`` synced with this
+        account: by company, or for models without one (activities) by the
+        account their ProspectConnect id belongs to."""
+        if "company_id" in self.env[model]._fields:
+            return self._company_domain()
+        return [("pc_account_id", "=", self.id)]
+
+    @api.model
+    def _split_by_account(self, records):
+        """Group ``records`` by the account of their company.
+
+        Activities and notes follow the company of the record they are on.
+
+        :return: ``{pc.account: records}``
+        """
+        accounts = self._get_company_accounts()
+        if not accounts or not records:
+            return {self.browse(): records}
+        if "company_id" in records._fields:
+            companies = {record.id: record.company_id.id for record in records}
+        else:
+            model_field = "res_model" if "res_model" in records._fields else "model"
+            targets = defaultdict(list)
+            for record in records:
+                if record[model_field] and record.res_id:
+                    targets[record[model_field]].append(record.res_id)
+            company_by_target = {}
+            for model, ids in targets.items():
+                if "company_id" in self.env[model]._fields:
+                    for target in self.env[model].browse(ids).exists():
+                        company_by_target[model, target.id] = target.company_id.id
+            companies = {
+                record.id: company_by_target.get((record[model_field], record.res_id))
+                for record in records
+            }
+        groups = defaultdict(list)
+        for record in records:
+            groups[accounts.get(companies[record.id], False)].append(record.id)
+        return {self.browse(account_id): records.browse(ids) for account_id, ids in groups.items()}
+
+    # ------------- PARALLEL RUNS -------------
+
+    @api.model
+    def _run_per_account(self, records, method_name, *args):
+        """Call ``records.<method_name>(*args)`` once per account.
+
+        With several accounts each one runs in its own thread and cursor,
+        so a slow or failing account does not hold back the others. Runs
+        that are profiled or recorded stay in the current thread.
+        """
+        accounts = self._get_accounts()
+        sequential = (
+            len(accounts) == 1
+            or is_testing()
+            or "pc_profiler" in self.env.context
+            or current_tape() is not None
+        )
+        if sequential:
+            for account in accounts:
+                getattr(records.with_context(pc_account_id=account.id), method_name)(*args)
+            return
+        errors = []
+        threads = [
+            threading.Thread(
+                target=self._run_account_thread,
+                args=(records, account.id, method_name, args, errors),
+                name="pc_account_%s" % (account.id or "default"),
+            )
+            for account in accounts
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    @api.model
+    def _run_account_thread(self, records, account_id, method_name, args, errors):
+        threading.current_thread().dbname = self.env.cr.dbname
+        try:
+            with self.env.registry.cursor() as cr:
+                env = api.Environment(cr, self.env.uid, dict(self.env.context, pc_account_id=account_id))
+                getattr(records.with_env(env), method_name)(*args)
+        except Exception as e:
+            _logger.exception("ProspectConnect %s failed for account %s", method_name, account_id or "default")
+            errors.append(e)
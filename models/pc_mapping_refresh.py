@@ -0,0 +1,133 @@
+# prospectconnect_sync/models/pc_mapping_refresh.py
+import hashlib
+import logging
+
+from odoo import api, models
+
+from ..tools import ACCEPT_ENCODING, decode_response
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import requests
+except Exception:  # pragma: no cover
+    requests = None
+
+
+class PcMappingRefresh(models.AbstractModel):
+    """Scheduled refresh of the user and pipeline mappings.
+
+    Lists are fetched with ``If-None-Match`` when ProspectConnect sent an
+    ETag, and compared by content hash otherwise, so an unchanged list costs
+    one request and no write. Changed lists are diffed against the existing
+    rows and applied as bulk inserts, updates and deactivations; rows that
+    did not change are not rewritten and the lookup caches stay warm.
+
+    Each account refreshes its own lists, with the account in context.
+    """
+
+    _name = "pc.mapping.refresh"
+    _description = "ProspectConnect Mapping Refresh"
+
+    @api.model
+    def _cron_refresh(self):
+        for account in self.env["pc.account"]._get_accounts():
+            if not account._get_credentials()[0]:
+                continue
+            for model in ("pc.user.mapping", "pc.pipeline.mapping"):
+                try:
+                    self.env[model].with_context(pc_account_id=account.id)._refresh_from_api()
+                except Exception:
+                    _logger.exception(
+                        "ProspectConnect mapping refresh of %s failed for account %s",
+                        model, account.display_name or "default",
+                    )
+
+    @api.model
+    def _conditional_get(self, kind, path, force=False):
+        """GET a mapping list unless it is unchanged since the last refresh.
+
+        :return: ``(data, version)`` or ``(None, None)`` when unchanged;
+            ``version`` is stored with :meth:`_mark_applied` once applied
+        """
+        if not requests:
+            raise ValueError("Python 'requests' library is not available.")
+        icp = self.env["ir.config_parameter"].sudo()
+        account = self.env["pc.account"]._from_context()
+        api_key, base_url = account._get_credentials()
+        if not api_key:
+            raise ValueError("ProspectConnect API key not configured.")
+
+        headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Authorization": api_key,
+        }
+        etag = icp.get_param(account._param_key("mapping_%s_etag" % kind))
+        if etag and not force:
+            headers["If-None-Match"] = etag
+        resp = requests.get(base_url.rstrip("/") + path, headers=headers, timeout=20)
+        if resp.status_code == 304:
+            return None, None
+        resp.raise_for_status()
+
+        digest = hashlib.sha256(resp.content).hexdigest()
+        if not force and digest == icp.get_param(account._param_key("mapping_%s_hash" % kind)):
+            return None, None
+        return decode_response(resp), (resp.headers.get("ETag") or False, digest)
+
+    @api.model
+    def _mark_applied(self, kind, version):
+        etag, digest = version
+        icp = self.env["ir.config_parameter"].sudo()
+        account = self.env["pc.account"]._from_context()
+        # set_param leaves unchanged values alone, so this only writes (and
+        # clears caches) when the list actually changed
+        icp.set_param(account._param_key("mapping_%s_etag" % kind), etag)
+        icp.set_param(account._param_key("mapping_%s_hash" % kind), digest)
+
+    @api.model
+    def _apply_diff(self, model, key_field, remote):
+        """Bring the rows of ``model`` of the account in context in line
+        with ``remote``.
+
+        :param remote: ``{key: vals}`` of the records listed remotely
+        :return: ``(created, updated, deactivated)`` counts
+        """
+        Mapping = self.env[model].with_context(active_test=False)
+        fnames = [key_field, "active"] + sorted({f for vals in remote.values() for f in vals})
+        account_id = self.env.context.get("pc_account_id") or False
+        existing = {
+            m[key_field]: m
+            for m in Mapping.search_fetch([("account_id", "=", account_id)], fnames)
+        }
+
+        to_create = [
+            dict(vals, **{key_field: key, "account_id": account_id})
+            for key, vals in remote.items()
+            if key not in existing
+        ]
+        # Rows with the same changes (e.g. reactivated) are written together
+        updates = {}
+        for key, vals in remote.items():
+            mapping = existing.get(key)
+            if not mapping:
+                continue
+            changes = tuple(sorted(
+                (fname, value) for fname, value in dict(vals, active=True).items()
+                if mapping[fname] != value
+            ))
+            if changes:
+                updates.setdefault(changes, []).append(mapping.id)
+        for changes, ids in updates.items():
+            Mapping.browse(ids).write(dict(changes))
+        updated = sum(len(ids) for ids in updates.values())
+        gone = Mapping.browse([
+            mapping.id for key, mapping in existing.items()
+            if key not in remote and mapping.active
+        ])
+        if to_create:
+            Mapping.create(to_create)
+        if gone:
+            gone.write({"active": False})
+        return len(to_create), updated, len(gone)
@@ -1,8 +1,10 @@
 # prospectconnect_sync/models/pc_pipeline_mapping.py
 import logging
+from collections import defaultdict
 
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
+from odoo.tools.sql import create_unique_index
 
 _logger = logging.getLogger(__name__)
 
@@ -17,16 +19,82 @@ class PcPipelineMapping(models.Model):
     _description = "ProspectConnect Pipeline/Stage Mapping"
     _rec_name = "odoo_stage_id"
 
+    # Rows are created by the refresh from ProspectConnect and mapped by hand
     odoo_stage_id = fields.Many2one(
-        "crm.stage", string="Odoo Stage", required=True, ondelete="cascade"
+        "crm.stage", string="Odoo Stage", ondelete="cascade"
     )
     pc_stage_id = fields.Char(string="ProspectConnect Stage ID", required=True)
     pc_stage_name = fields.Char(string="ProspectConnect Stage Name")
     pc_pipeline_id = fields.Char(string="ProspectConnect Pipeline ID")
+    active = fields.Boolean(default=True, help="Cleared when the stage is no longer listed by ProspectConnect.")
+    account_id = fields.Many2one(
+        "pc.account", string="Account", ondelete="cascade", help="Empty for the default account (Settings)."
+    )
+
+    def init(self):
+        # Unique per account: each account lists its own stages
+        self.env.cr.execute("ALTER TABLE pc_pipeline_mapping DROP CONSTRAINT IF EXISTS pc_pipeline_mapping_pc_stage_unique")
+        create_unique_index(
+            self.env.cr, "pc_pipeline_mapping_account_stage_id_uniq", self._table,
+            ["COALESCE(account_id, 0)", "pc_stage_id"],
+        )
+
+    # Cache cleared as for pc.user.mapping, when _get_stage_map changes
+    @api.model_create_multi
+    def create(self, vals_list):
+        mappings = super().create(vals_list)
+        if any(mappings.mapped("odoo_stage_id")):
+            self.env.registry.clear_cache()
+        mappings._remap_records()
+        return mappings
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"odoo_stage_id", "pc_stage_id", "active", "account_id", "pc_pipeline_id"} & set(vals):
+            self.env.registry.clear_cache()
+        if {"odoo_stage_id", "pc_stage_id", "active"} & set(vals):
+            self._remap_records()
+        return res
+
+    def unlink(self):
+        mapped = any(self.mapped("odoo_stage_id"))
+        res = super().unlink()
+        if mapped:
+            self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache("account_id")
+    def _get_stage_map(self, account_id=False):
+        """Cached ``({pc stage id: crm.stage id}, {crm.stage id: (pc pipeline id, pc stage id)})``."""
+        to_odoo, to_pc = {}, {}
+        for mapping in self.sudo().search(
+            [("odoo_stage_id", "!=", False), ("account_id", "=", account_id)], order="id"
+        ):
+            to_odoo.setdefault(mapping.pc_stage_id, mapping.odoo_stage_id.id)
+            to_pc.setdefault(mapping.odoo_stage_id.id, (mapping.pc_pipeline_id, mapping.pc_stage_id))
+        return to_odoo, to_pc
 
-    _sql_constraints = [
-        ("pc_stage_unique", "unique(pc_stage_id)", "ProspectConnect Stage ID must be unique."),
-    ]
+    def _remap_records(self):
+        """Move opportunities already pulled in these ProspectConnect stages
+        to the mapped Odoo stages, one grouped write per stage. Only the
+        opportunities of the mapping's account are moved."""
+        stage_by_pc = defaultdict(dict)
+        for mapping in self:
+            if mapping.active and mapping.odoo_stage_id:
+                stage_by_pc[mapping.account_id][mapping.pc_stage_id] = mapping.odoo_stage_id.id
+        Lead = self.env["crm.lead"].sudo().with_context(pc_skip_sync=True, tracking_disable=True)
+        for account, stages in stage_by_pc.items():
+            for pc_stage_id, leads in Lead._read_group(
+                [("pc_remote_stage_id", "in", list(stages))] + account._records_domain("crm.lead"),
+                ["pc_remote_stage_id"],
+                ["id:recordset"],
+            ):
+                stage_id = stages[pc_stage_id]
+                leads = leads.filtered(lambda l: l.stage_id.id != stage_id)
+                if leads:
+                    leads.write({"stage_id": stage_id})
+                    _logger.info("ProspectConnect: %s opportunities remapped to stage %s", len(leads), stage_id)
 
     @api.model
     def fetch_from_api(self):
@@ -37,44 +105,42 @@ class PcPipelineMapping(models.Model):
         if not requests:
             raise UserError(_("Python 'requests' library not available."))
 
-        icp = self.env["ir.config_parameter"].sudo()
-        api_key = icp.get_param("prospectconnect_sync.api_key")
-        base_url = icp.get_param("prospectconnect_sync.base_url", "https://api.prospectconnect.ai")
-
-        if not api_key:
+        accounts = [
+            account for account in self.env["pc.account"]._get_accounts()
+            if account._get_credentials()[0]
+        ]
+        if not accounts:
             raise UserError(_("Please configure API key in settings first."))
 
-        # Endpoint verified from user screenshot: GET /deal/getPipelineList
-        url = base_url.rstrip("/") + "/deal/getPipelineList"
-        headers = {
-            "Accept": "application/json",
-            "Authorization": api_key,
-        }
-
         try:
-            resp = requests.get(url, headers=headers, timeout=20)
-            resp.raise_for_status()
-            data = resp.json()
+            for account in accounts:
+                self.with_context(pc_account_id=account.id)._refresh_from_api(force=True)
         except Exception as e:
             _logger.exception("Error fetching ProspectConnect pipelines")
             raise UserError(_("Error fetching pipelines from ProspectConnect: %s") % e)
 
+    @api.model
+    def _refresh_from_api(self, force=False):
+        """Apply the changes of the remote pipeline list, if any."""
+        Refresh = self.env["pc.mapping.refresh"]
+        # Endpoint verified from user screenshot: GET /deal/getPipelineList
+        data, version = Refresh._conditional_get("pipelines", "/deal/getPipelineList", force=force)
+        if data is None:
+            return
+
         # Expected structure: {"data": [{"id": "...", "stages": [...]}]}
-        pipelines = data.get("data") or []
-        for pipeline in pipelines:
-            pipeline_id = pipeline.get("id")
+        remote = {}
+        for pipeline in data.get("data") or []:
+            pipeline_id = pipeline.get("id") or False
             for stage in pipeline.get("stages") or []:
                 pc_stage_id = stage.get("id")
-                name = stage.get("name") or pc_stage_id
                 if not pc_stage_id:
                     continue
-                mapping = self.search([("pc_stage_id", "=", pc_stage_id)], limit=1)
-                vals = {
-                    "pc_stage_id": pc_stage_id,
-                    "pc_stage_name": name,
+                remote[pc_stage_id] = {
+                    "pc_stage_name": stage.get("name") or pc_stage_id,
                     "pc_pipeline_id": pipeline_id,
                 }
-                if mapping:
-                    mapping.write(vals)
-                else:
-                    self.create(vals)
+
+        counts = Refresh._apply_diff(self._name, "pc_stage_id", remote)
+        Refresh._mark_applied("pipelines", version)
+        _logger.info("ProspectConnect stages refreshed: %s new, %s updated, %s deactivated", *counts)
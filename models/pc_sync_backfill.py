@@ -0,0 +1,233 @@
+# prospectconnect_sync/models/pc_sync_backfill.py
+import logging
+from contextlib import ExitStack
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+from ..tools import PcTransport, is_testing
+from .pc_sync_job import CREATE_PATHS, IDEMPOTENCY_HEADER, PRIORITY_BULK
+from .pc_sync_run import wire_stats
+
+_logger = logging.getLogger(__name__)
+
+# object type -> (model, ProspectConnect id field); contacts first so deals
+# and tasks pushed afterwards can reference them
+BACKFILL_MODELS = {
+    "contact": ("res.partner", "pc_contact_id"),
+    "deal": ("crm.lead", "pc_deal_id"),
+    "task": ("mail.activity", "pc_task_id"),
+}
+
+
+class PcSyncBackfill(models.Model):
+    """Initial export of existing Odoo records to ProspectConnect.
+
+    Records without a ProspectConnect id are read in id-ordered chunks and
+    pushed directly, several requests in flight at the configured rate
+    limit. The last exported id is checkpointed after each chunk, so an
+    interrupted run resumes where it stopped. No sync job is created, except
+    for records whose push failed: those are handed to the regular job
+    queue for retry.
+
+    Each chunk is split by account: records go to the account of their
+    company, each account through its own transport.
+    """
+
+    _name = "pc.sync.backfill"
+    _description = "ProspectConnect Initial Export"
+    _order = "id desc"
+
+    name = fields.Char(required=True, default=lambda self: "Initial export %s" % fields.Date.today())
+    state = fields.Selection(
+        [
+            ("draft", "Draft"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="draft",
+        required=True,
+    )
+    include_contacts = fields.Boolean(string="Contacts", default=True)
+    include_deals = fields.Boolean(string="Opportunities", default=True)
+    include_tasks = fields.Boolean(string="Tasks", default=True)
+    chunk_size = fields.Integer(default=200, help="Records read and checkpointed together.")
+    concurrency = fields.Integer(default=8, help="Requests in flight at the same time.")
+    rate_limit = fields.Float(default=10.0, help="Maximum requests per second (0 for no limit).")
+
+    started_at = fields.Datetime(readonly=True)
+    finished_at = fields.Datetime(readonly=True)
+    last_object_type = fields.Char(string="Checkpoint Type", readonly=True)
+    last_id = fields.Integer(string="Checkpoint ID", readonly=True)
+    total_count = fields.Integer(string="To Export", readonly=True)
+    pushed_count = fields.Integer(string="Exported", readonly=True)
+    failed_count = fields.Integer(string="Failed", readonly=True, help="Handed to the sync job queue for retry.")
+    progress = fields.Float(compute="_compute_progress")
+    eta = fields.Datetime(string="ETA", compute="_compute_progress")
+    error_message = fields.Text(readonly=True)
+
+    @api.depends("state", "total_count", "pushed_count", "failed_count")
+    def _compute_progress(self):
+        now = fields.Datetime.now()
+        for run in self:
+            done = run.pushed_count + run.failed_count
+            if run.state == "done":
+                run.progress, run.eta = 100.0, False
+                continue
+            run.progress = min(100.0, 100.0 * done / run.total_count) if run.total_count else 0.0
+            elapsed = (now - run.started_at).total_seconds() if run.started_at else 0
+            if run.state == "running" and done and run.total_count > done and elapsed:
+                run.eta = now + timedelta(seconds=elapsed * (run.total_count - done) / done)
+            else:
+                run.eta = False
+
+    # ------------- ACTIONS -------------
+
+    def action_start(self):
+        """Start, or resume a failed run from its checkpoint."""
+        for run in self.filtered(lambda r: r.state in ("draft", "failed")):
+            vals = {"state": "running", "error_message": False}
+            if run.state == "draft":
+                vals.update(
+                    started_at=fields.Datetime.now(),
+                    total_count=sum(
+                        self.env[model].search_count(run._get_domain(object_type))
+                        for object_type, (model, _field) in BACKFILL_MODELS.items()
+                        if object_type in run._get_object_types()
+                    ),
+                )
+            run.write(vals)
+        cron = self.env.ref("prospectconnect_sync.ir_cron_pc_backfill", raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        return True
+
+    @api.model
+    def _cron_process(self):
+        for run in self.search([("state", "=", "running")], order="id"):
+            run._process()
+
+    def _process(self):
+        self.ensure_one()
+        try:
+            self._export()
+        except Exception as e:
+            _logger.exception("ProspectConnect initial export %s failed", self.id)
+            if is_testing():
+                raise
+            self.env.cr.rollback()
+            self.write({"state": "failed", "error_message": str(e)})
+            self._commit()
+
+    def _commit(self):
+        if not is_testing():
+            self.env.cr.commit()
+
+    def _get_object_types(self):
+        return [
+            object_type for object_type in BACKFILL_MODELS
+            if self["include_%ss" % object_type]
+        ]
+
+    def _get_domain(self, object_type):
+        _model, field_name = BACKFILL_MODELS[object_type]
+        domain = [(field_name, "=", False)]
+        if object_type == "contact":
+            # Partners of Odoo users are not CRM contacts
+            domain.append(("user_ids", "=", False))
+        if object_type == "task":
+            domain.append(("res_model", "in", ["res.partner", "crm.lead"]))
+        return domain
+
+    # ------------- EXPORT -------------
+
+    def _export(self):
+        object_types = self._get_object_types()
+        if self.last_object_type in object_types:
+            object_types = object_types[object_types.index(self.last_object_type):]
+        with ExitStack() as stack:
+            # Opened on the first record of each account
+            transports = {}
+            for object_type in object_types:
+                if object_type != self.last_object_type:
+                    self.write({"last_object_type": object_type, "last_id": 0})
+                model, _field = BACKFILL_MODELS[object_type]
+                Model = self.env[model].with_context(pc_skip_sync=True)
+                while True:
+                    records = Model.search(
+                        self._get_domain(object_type) + [("id", ">", self.last_id)],
+                        order="id",
+                        limit=self.chunk_size,
+                    )
+                    if not records:
+                        break
+                    for account, account_records in self.env["pc.account"]._split_by_account(records).items():
+                        if account not in transports:
+                            transports[account] = stack.enter_context(self._open_transport(account))
+                        self.with_context(pc_account_id=account.id)._push_chunk(
+                            object_type, account_records, transports[account]
+                        )
+                    self.last_id = records[-1].id
+                    self._commit()
+                    # Keep the cache from growing with every chunk
+                    self.env.invalidate_all()
+                    _logger.info(
+                        "ProspectConnect initial export %s: %s/%s %ss",
+                        self.id, self.pushed_count + self.failed_count, self.total_count, object_type,
+                    )
+        self.write({"state": "done", "finished_at": fields.Datetime.now()})
+        self._commit()
+
+    def _open_transport(self, account):
+        """Transport to the API of ``account`` at the run's rate limit."""
+        Job = self.env["pc.sync.job"].with_context(pc_account_id=account.id)
+        base_url, headers = Job._get_api_context()
+        return PcTransport(
+            base_url, headers, rate_limit=self.rate_limit, concurrency=self.concurrency,
+            timeout=Job._get_push_timeout(), stats=wire_stats(self.env),
+        )
+
+    def _push_chunk(self, object_type, records, transport):
+        """Push one chunk of the account in context concurrently and write
+        the returned ids back."""
+        Job = self.env["pc.sync.job"]
+        prepare = getattr(Job, "_prepare_%s_payload" % object_type)
+        write_back = getattr(Job, "_write_back_%s" % object_type)
+
+        calls = []
+        for record in records:
+            path, payload = prepare(record)
+            if path:
+                calls.append((record, path, payload))
+        results = transport.post_many([
+            (path, payload, {IDEMPOTENCY_HEADER: payload["externalId"]} if path in CREATE_PATHS else None)
+            for _record, path, payload in calls
+        ])
+
+        failed = []
+        for (record, _path, payload), (data, error) in zip(calls, results):
+            if error:
+                failed.append((record, error))
+                continue
+            write_back(record, payload, data)
+        if failed:
+            Job.sudo().create([
+                {
+                    "direction": "odoo_to_pc",
+                    "object_type": object_type,
+                    "odoo_model": record._name,
+                    "odoo_res_id": record.id,
+                    "status": "failed",
+                    "priority": PRIORITY_BULK,
+                    "retry_count": 1,
+                    "next_retry_at": Job._get_retry_at(1),
+                    "account_id": Job._get_account().id,
+                    "error_message": str(error),
+                }
+                for record, error in failed
+            ])
+        self.write({
+            "pushed_count": self.pushed_count + len(calls) - len(failed),
+            "failed_count": self.failed_count + len(failed),
+        })
@@ -0,0 +1,731 @@
+# prospectconnect_sync/models/pc_sync_bootstrap.py
+import csv
+import io
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+from ..tools import CONCURRENCY_ERRORS, decode_response, is_testing, post_json
+from .pc_sync_inbound import MAX_CONFLICT_RETRIES
+from .pc_sync_state import PULL_ENDPOINTS
+
+_logger = logging.getLogger(__name__)
+
+# Contacts first so deals, tasks and notes can link to them
+OBJECT_ORDER = ["contact", "deal", "task", "note"]
+
+# Latest staged version of each remote record of a chunk
+_SRC_CTE = """
+    src AS (
+        SELECT DISTINCT ON (remote_id) remote_id, payload::jsonb AS p
+        FROM pc_sync_bootstrap_line
+        WHERE id = ANY(%(line_ids)s)
+        ORDER BY remote_id, id DESC
+    )
+"""
+
+_CONTACT_CTE = _SRC_CTE + """,
+    row AS (
+        SELECT src.remote_id,
+               src.p,
+               COALESCE(
+                   NULLIF(src.p->>'name', ''),
+                   COALESCE(src.p->>'firstName', '') || ' ' || COALESCE(src.p->>'lastName', '')
+               ) AS name,
+               src.p->>'email' AS email,
+               src.p->>'phone' AS phone,
+               src.p->>'address1' AS street,
+               src.p->>'city' AS city,
+               src.p->>'postalCode' AS zip,
+               src.p->>'source' AS source,
+               src.p->>'assignedTo' AS assignee,
+               country.id AS country_id,
+               state.id AS state_id,
+               mapping.odoo_user_id AS user_id
+        FROM src
+        LEFT JOIN res_country country ON country.code = src.p->'country'->>'country_code'
+        LEFT JOIN LATERAL (
+            SELECT s.id FROM res_country_state s
+            WHERE s.country_id = country.id AND lower(s.name) = lower(src.p->>'state')
+            ORDER BY s.id LIMIT 1
+        ) state ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT m.odoo_user_id FROM pc_user_mapping m
+            WHERE m.pc_user_id = src.p->>'assignedTo' AND m.active AND m.odoo_user_id IS NOT NULL
+              AND m.account_id IS NOT DISTINCT FROM %(account_id)s
+            ORDER BY m.id LIMIT 1
+        ) mapping ON TRUE
+    )
+"""
+
+_DEAL_CTE = _SRC_CTE + """,
+    row AS (
+        SELECT src.remote_id,
+               COALESCE(NULLIF(src.p->>'name', ''), 'Deal') AS name,
+               CASE WHEN src.p->>'value' ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$'
+                    THEN (src.p->>'value')::numeric ELSE 0 END AS expected_revenue,
+               COALESCE(src.p->>'status', '') != 'closed' AS active,
+               partner.id AS partner_id,
+               src.p->>'pipelineId' AS pipeline,
+               src.p->>'stageId' AS stage,
+               stage_map.odoo_stage_id AS stage_id,
+               src.p->>'assignedTo' AS assignee,
+               user_map.odoo_user_id AS user_id,
+               NULLIF(src.p->>'notes', '') AS description
+        FROM src
+        LEFT JOIN LATERAL (
+            SELECT rp.id FROM res_partner rp
+            WHERE rp.pc_contact_id = src.p->>'contactId'
+              AND rp.pc_account_id IS NOT DISTINCT FROM %(account_id)s
+            ORDER BY rp.id LIMIT 1
+        ) partner ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT m.odoo_stage_id FROM pc_pipeline_mapping m
+            WHERE m.pc_stage_id = src.p->>'stageId' AND m.active AND m.odoo_stage_id IS NOT NULL
+              AND m.account_id IS NOT DISTINCT FROM %(account_id)s
+            ORDER BY m.id LIMIT 1
+        ) stage_map ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT m.odoo_user_id FROM pc_user_mapping m
+            WHERE m.pc_user_id = src.p->>'assignedTo' AND m.active AND m.odoo_user_id IS NOT NULL
+              AND m.account_id IS NOT DISTINCT FROM %(account_id)s
+            ORDER BY m.id LIMIT 1
+        ) user_map ON TRUE
+    )
+"""
+
+
+class PcSyncBootstrap(models.Model):
+    """One-shot full load of a ProspectConnect account.
+
+    Every remote record is streamed page by page into
+    ``pc.sync.bootstrap.line`` with ``COPY``, then merged in chunks:
+    contacts and deals with set-based SQL into ``res_partner`` and
+    ``crm_lead`` (defaults and stored computed fields are then filled
+    through the ORM, as a regular ``create`` would), tasks and notes through
+    their batch apply. Chunks are claimed with ``SKIP LOCKED`` by several
+    worker threads and committed one by one, so an interrupted run resumes
+    where it stopped.
+
+    A run imports one account: it fetches with the account's credentials
+    and merges with the account in context, new records going to its
+    company.
+    """
+
+    _name = "pc.sync.bootstrap"
+    _description = "ProspectConnect Bootstrap Import"
+    _order = "id desc"
+
+    name = fields.Char(required=True, default=lambda self: "Bootstrap %s" % fields.Date.today())
+    account_id = fields.Many2one(
+        "pc.account",
+        string="Account",
+        ondelete="cascade",
+        help="Account to import; empty for the default account (Settings).",
+    )
+    state = fields.Selection(
+        [
+            ("draft", "Draft"),
+            ("fetching", "Fetching"),
+            ("merging", "Merging"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="draft",
+        required=True,
+    )
+    include_contacts = fields.Boolean(string="Contacts", default=True)
+    include_deals = fields.Boolean(string="Opportunities", default=True)
+    include_tasks = fields.Boolean(string="Tasks", default=True)
+    include_notes = fields.Boolean(string="Notes", default=True)
+    page_size = fields.Integer(default=500, help="Records requested per page while fetching.")
+    chunk_size = fields.Integer(default=2000, help="Staged records merged per transaction.")
+    workers = fields.Integer(default=4, help="Parallel merge threads.")
+
+    started_at = fields.Datetime(readonly=True)
+    merge_started_at = fields.Datetime(readonly=True)
+    finished_at = fields.Datetime(readonly=True)
+    fetch_object_type = fields.Char(readonly=True)
+    fetch_page = fields.Integer(readonly=True, default=1)
+    total_count = fields.Integer(string="Remote Records", readonly=True)
+    fetched_count = fields.Integer(string="Fetched", readonly=True)
+    staged_count = fields.Integer(string="To Merge", readonly=True)
+    merged_count = fields.Integer(string="Merged", readonly=True)
+    progress = fields.Float(compute="_compute_progress")
+    eta = fields.Datetime(string="ETA", compute="_compute_progress", help="Estimated end of the current phase.")
+    error_message = fields.Text(readonly=True)
+
+    @api.depends("state", "total_count", "fetched_count", "staged_count", "merged_count")
+    def _compute_progress(self):
+        now = fields.Datetime.now()
+        for run in self:
+            if run.state == "fetching":
+                done, total, since = run.fetched_count, run.total_count, run.started_at
+            elif run.state == "merging":
+                done, total, since = run.merged_count, run.staged_count, run.merge_started_at
+            else:
+                run.progress = 100.0 if run.state == "done" else 0.0
+                run.eta = False
+                continue
+            run.progress = min(100.0, 100.0 * done / total) if total else 0.0
+            elapsed = (now - since).total_seconds() if since else 0
+            if done and total > done and elapsed:
+                run.eta = now + timedelta(seconds=elapsed * (total - done) / done)
+            else:
+                run.eta = False
+
+    # ------------- ACTIONS -------------
+
+    def action_start(self):
+        """Start, or resume a failed run where it stopped."""
+        now = fields.Datetime.now()
+        for run in self.filtered(lambda r: r.state in ("draft", "failed")):
+            run.write({
+                "state": "merging" if run.merge_started_at else "fetching",
+                "started_at": run.started_at or now,
+                "error_message": False,
+            })
+        cron = self.env.ref("prospectconnect_sync.ir_cron_pc_bootstrap", raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        return True
+
+    @api.model
+    def _cron_process(self):
+        for run in self.search([("state", "in", ("fetching", "merging"))], order="id"):
+            run._process()
+
+    def _process(self):
+        self.ensure_one()
+        run = self.with_context(**self.account_id._get_apply_context())
+        try:
+            if run.state == "fetching":
+                run._fetch()
+            if run.state == "merging":
+                run._merge()
+        except Exception as e:
+            _logger.exception("ProspectConnect bootstrap %s failed", self.id)
+            if is_testing():
+                raise
+            self.env.cr.rollback()
+            self.write({"state": "failed", "error_message": str(e)})
+            self._commit()
+
+    def _commit(self):
+        # Each page / chunk is its own transaction, so progress is visible
+        # and an interrupted run resumes from the last committed one.
+        if not is_testing():
+            self.env.cr.commit()
+
+    def _get_object_types(self):
+        return [
+            object_type for object_type in OBJECT_ORDER
+            if self["include_%ss" % object_type]
+        ]
+
+    # ------------- FETCH (PC → STAGING TABLE) -------------
+
+    def _fetch(self):
+        """Stream every page of every object type into the staging table."""
+        base_url, headers = self.env["pc.sync.state"]._get_api_context()
+        if not base_url:
+            raise ValueError("ProspectConnect API is not configured")
+
+        object_types = self._get_object_types()
+        if not self.fetch_object_type:
+            self.total_count = self._count_remote(base_url, headers, object_types)
+            self._commit()
+        if self.fetch_object_type in object_types:
+            object_types = object_types[object_types.index(self.fetch_object_type):]
+        for object_type in object_types:
+            if object_type != self.fetch_object_type:
+                self.write({"fetch_object_type": object_type, "fetch_page": 1})
+            path, key = PULL_ENDPOINTS[object_type]
+            while True:
+                resp = post_json(
+                    base_url + path,
+                    {"page": self.fetch_page, "limit": self.page_size},
+                    headers,
+                    timeout=60,
+                )
+                resp.raise_for_status()
+                data = decode_response(resp)
+                records = data.get("data", []) or data.get(key, [])
+                self._copy_lines(object_type, records)
+                self.write({
+                    "fetch_page": self.fetch_page + 1,
+                    "fetched_count": self.fetched_count + len(records),
+                })
+                self._commit()
+                if not records or not data.get("hasMore", len(records) >= self.page_size):
+                    break
+            _logger.info("ProspectConnect bootstrap %s fetched all %ss", self.id, object_type)
+
+        staged = self._dedup_lines()
+        self.write({
+            "state": "merging",
+            "staged_count": staged,
+            "merge_started_at": fields.Datetime.now(),
+        })
+        self._commit()
+
+    def _count_remote(self, base_url, headers, object_types):
+        """Total number of remote records, used for progress and ETA."""
+        total = 0
+        for object_type in object_types:
+            path, _key = PULL_ENDPOINTS[object_type]
+            resp = post_json(base_url + path, {"page": 1, "limit": 1}, headers, timeout=60)
+            resp.raise_for_status()
+            total += int(decode_response(resp).get("total") or 0)
+        return total
+
+    def _copy_lines(self, object_type, records):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            remote_id = record.get("id") or record.get("taskId")
+            if remote_id:
+                writer.writerow([self.id, object_type, remote_id, json.dumps(record)])
+        buffer.seek(0)
+        self.env.cr.copy_expert(
+            "COPY pc_sync_bootstrap_line (bootstrap_id, object_type, remote_id, payload) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+    def _dedup_lines(self):
+        """Keep the last fetched version of records seen on several pages."""
+        self.env.cr.execute(
+            """
+            DELETE FROM pc_sync_bootstrap_line older
+            USING pc_sync_bootstrap_line newer
+            WHERE older.bootstrap_id = %(id)s AND newer.bootstrap_id = %(id)s
+              AND older.object_type = newer.object_type
+              AND older.remote_id = newer.remote_id
+              AND older.id < newer.id
+            """,
+            {"id": self.id},
+        )
+        self.env.cr.execute(
+            "SELECT count(*) FROM pc_sync_bootstrap_line WHERE bootstrap_id = %s", (self.id,)
+        )
+        return self.env.cr.fetchone()[0]
+
+    # ------------- MERGE (STAGING TABLE → ODOO) -------------
+
+    def _merge(self):
+        for object_type in self._get_object_types():
+            self._run_workers(object_type)
+        for object_type in self._get_object_types():
+            # Incremental pulls continue from the start of the fetch
+            self.env["pc.sync.state"]._get_state(object_type).last_pull_at = self.started_at
+        self.write({"state": "done", "finished_at": fields.Datetime.now()})
+        self._commit()
+        _logger.info("ProspectConnect bootstrap %s done: %s records", self.id, self.merged_count)
+
+    def _run_workers(self, object_type):
+        workers = max(self.workers, 1)
+        if workers == 1 or is_testing():
+            self._merge_worker(object_type)
+            return
+        self._commit()
+        errors = []
+        threads = [
+            threading.Thread(
+                target=self._merge_worker_thread,
+                args=(object_type, errors),
+                name="pc_bootstrap_%s_%s" % (self.id, n),
+            )
+            for n in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.invalidate_recordset()
+        if errors:
+            raise errors[0]
+
+    def _merge_worker_thread(self, object_type, errors):
+        try:
+            with self.env.registry.cursor() as cr:
+                env = api.Environment(cr, self.env.uid, self.env.context)
+                env[self._name].browse(self.id)._merge_worker(object_type)
+        except Exception as e:
+            _logger.exception("ProspectConnect bootstrap %s worker failed", self.id)
+            errors.append(e)
+
+    def _merge_worker(self, object_type):
+        """Claim and merge chunks of ``object_type`` until none are left.
+
+        Staged lines were deduplicated, so a remote id is merged by a single
+        chunk. Chunks of other workers can still touch the same Odoo rows
+        (a partner matched by email for two contacts, records applied by a
+        pull at the same time): a chunk colliding with them is rolled back
+        and claimed again in a new transaction, which sees their result.
+        """
+        cr = self.env.cr
+        merge = getattr(self, "_merge_%s_chunk" % object_type, None) or (
+            lambda line_ids: self._apply_chunk(object_type, line_ids)
+        )
+        conflicts = 0
+        while True:
+            cr.execute(
+                """
+                SELECT id FROM pc_sync_bootstrap_line
+                WHERE bootstrap_id = %s AND object_type = %s
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+                """,
+                (self.id, object_type, self.chunk_size),
+            )
+            line_ids = [row[0] for row in cr.fetchall()]
+            if not line_ids:
+                return
+            try:
+                with cr.savepoint():
+                    merge(line_ids)
+            except CONCURRENCY_ERRORS as e:
+                conflicts += 1
+                if conflicts > MAX_CONFLICT_RETRIES:
+                    raise
+                _logger.info(
+                    "ProspectConnect bootstrap %s %s chunk collided with another worker (%s), retrying",
+                    self.id, object_type, e.__class__.__name__,
+                )
+                self.env["pc.sync.inbound"]._rollback_chunk(conflicts)
+                continue
+            conflicts = 0
+            cr.execute("DELETE FROM pc_sync_bootstrap_line WHERE id = ANY(%s)", (line_ids,))
+            cr.execute(
+                "UPDATE pc_sync_bootstrap SET merged_count = merged_count + %s WHERE id = %s",
+                (len(line_ids), self.id),
+            )
+            self._commit()
+            self.env.invalidate_all()
+            _logger.info(
+                "ProspectConnect bootstrap %s: %s/%s merged (%s)",
+                self.id, self.merged_count, self.staged_count, object_type,
+            )
+
+    def _apply_chunk(self, object_type, line_ids):
+        """Tasks and notes go through their regular batch apply."""
+        self.env.cr.execute(
+            "SELECT payload FROM pc_sync_bootstrap_line WHERE id = ANY(%s) ORDER BY id",
+            (line_ids,),
+        )
+        payloads = [json.loads(payload) for payload, in self.env.cr.fetchall()]
+        self.env["pc.sync.state"]._apply_batch(object_type, payloads)
+
+    def _merge_params(self, line_ids):
+        """Parameters of the merge queries of a chunk.
+
+        ``account_id`` is the account the run imports (the one in context,
+        NULL for the default account): remote ids and mappings are matched
+        within it. ``company_id`` is its company, and ``account_company_ids``
+        the companies of every account, which the default account does not
+        serve.
+        """
+        account = self.env["pc.account"]._from_context()
+        return {
+            "line_ids": line_ids,
+            "uid": self.env.uid,
+            "now": fields.Datetime.now(),
+            "account_id": account.id or None,
+            "company_id": account.company_id.id or None,
+            "account_company_ids": list(self.env["pc.account"]._get_company_accounts()),
+        }
+
+    def _merge_contact_chunk(self, line_ids):
+        cr = self.env.cr
+        self.env.flush_all()
+        params = self._merge_params(line_ids)
+
+        # Link partners not yet known to ProspectConnect by email, then phone,
+        # among those of the account's company or without company
+        cr.execute(
+            "WITH " + _CONTACT_CTE + """,
+            candidate AS (
+                SELECT DISTINCT ON (row.remote_id) row.remote_id, rp.id
+                FROM row
+                JOIN res_partner rp ON rp.pc_contact_id IS NULL AND rp.active AND (
+                    rp.pc_email_key = lower(trim(row.email))
+                    OR (trim(row.phone) LIKE '+%%'
+                        AND rp.pc_phone_key = '+' || regexp_replace(row.phone, '\\D', '', 'g'))
+                ) AND (
+                    rp.company_id IS NULL
+                    OR rp.company_id = %(company_id)s
+                    OR (%(company_id)s IS NULL AND rp.company_id != ALL(%(account_company_ids)s::int[]))
+                )
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM res_partner x
+                    WHERE x.pc_contact_id = row.remote_id AND x.pc_account_id IS NOT DISTINCT FROM %(account_id)s
+                )
+                ORDER BY row.remote_id, rp.pc_email_key = lower(trim(row.email)) DESC, rp.id
+            ),
+            link AS (
+                SELECT DISTINCT ON (id) id, remote_id FROM candidate ORDER BY id, remote_id
+            )
+            UPDATE res_partner rp SET pc_contact_id = link.remote_id, pc_account_id = %(account_id)s
+            FROM link
+            WHERE rp.id = link.id AND rp.pc_contact_id IS NULL
+            """,
+            params,
+        )
+
+        updated_columns = [
+            "name", "email", "phone", "street", "city", "zip", "pc_lead_source",
+            "country_id", "state_id", "pc_remote_assignee_id", "pc_assigned_user_id",
+            "pc_last_remote_update", "pc_contact_id",
+        ]
+        cr.execute(
+            "WITH " + _CONTACT_CTE + """
+            UPDATE res_partner rp
+            SET name = row.name, email = row.email, phone = row.phone,
+                street = row.street, city = row.city, zip = row.zip,
+                pc_lead_source = row.source,
+                country_id = COALESCE(row.country_id, rp.country_id),
+                state_id = COALESCE(row.state_id, rp.state_id),
+                pc_remote_assignee_id = COALESCE(row.assignee, rp.pc_remote_assignee_id),
+                pc_assigned_user_id = COALESCE(row.user_id, rp.pc_assigned_user_id),
+                pc_last_remote_update = %(now)s,
+                write_uid = %(uid)s, write_date = %(now)s
+            FROM row
+            WHERE rp.pc_contact_id = row.remote_id AND rp.pc_account_id IS NOT DISTINCT FROM %(account_id)s
+            RETURNING rp.id
+            """,
+            params,
+        )
+        updated_ids = [row[0] for row in cr.fetchall()]
+
+        created_ids, inserted = self._insert_rows("res.partner", _CONTACT_CTE, {
+            "name": "row.name",
+            "email": "row.email",
+            "phone": "row.phone",
+            "street": "row.street",
+            "city": "row.city",
+            "zip": "row.zip",
+            "pc_lead_source": "row.source",
+            "country_id": "row.country_id",
+            "state_id": "row.state_id",
+            "pc_remote_assignee_id": "row.assignee",
+            "pc_assigned_user_id": "row.user_id",
+            "pc_contact_id": "row.remote_id",
+            "pc_account_id": "%(account_id)s",
+            "pc_last_remote_update": "%(now)s",
+        }, """NOT EXISTS (
+            SELECT 1 FROM res_partner x
+            WHERE x.pc_contact_id = row.remote_id AND x.pc_account_id IS NOT DISTINCT FROM %(account_id)s
+        )""", params)
+
+        self._merge_contact_tags(params)
+        self._finish_sql_merge(
+            "res.partner", created_ids, inserted + ["category_id"],
+            updated_ids, updated_columns + ["category_id"],
+        )
+
+    def _merge_contact_tags(self, params):
+        """Replace the tags of contacts that carry tags, like ``(6, 0, ids)``."""
+        cr = self.env.cr
+        cr.execute(
+            "WITH " + _SRC_CTE + """
+            SELECT DISTINCT tag.name
+            FROM src
+            CROSS JOIN LATERAL jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(src.p->'tags') = 'array' THEN src.p->'tags' END
+            ) AS tag(name)
+            """,
+            params,
+        )
+        tag_ids_by_name = self.env["pc.sync.state"]._resolve_tag_ids(
+            name for name, in cr.fetchall()
+        )
+        if not tag_ids_by_name:
+            return
+        field = self.env["res.partner"]._fields["category_id"]
+        params = dict(
+            params,
+            tag_names=list(tag_ids_by_name),
+            tag_ids=list(tag_ids_by_name.values()),
+        )
+        tagged = "WITH " + _SRC_CTE + """,
+            tagged AS (
+                SELECT rp.id AS partner_id, t.tag_id
+                FROM src
+                JOIN res_partner rp ON rp.pc_contact_id = src.remote_id
+                    AND rp.pc_account_id IS NOT DISTINCT FROM %(account_id)s
+                CROSS JOIN LATERAL jsonb_array_elements_text(
+                    CASE WHEN jsonb_typeof(src.p->'tags') = 'array' THEN src.p->'tags' END
+                ) AS tag(name)
+                JOIN unnest(%(tag_names)s::varchar[], %(tag_ids)s::int[]) AS t(name, tag_id)
+                    ON t.name = tag.name
+            )
+        """
+        cr.execute(
+            tagged + "DELETE FROM {rel} WHERE {col1} IN (SELECT partner_id FROM tagged)".format(
+                rel=field.relation, col1=field.column1
+            ),
+            params,
+        )
+        cr.execute(
+            tagged + """
+            INSERT INTO {rel} ({col1}, {col2})
+            SELECT DISTINCT partner_id, tag_id FROM tagged
+            ON CONFLICT DO NOTHING
+            """.format(rel=field.relation, col1=field.column1, col2=field.column2),
+            params,
+        )
+
+    def _merge_deal_chunk(self, line_ids):
+        cr = self.env.cr
+        self.env.flush_all()
+        params = self._merge_params(line_ids)
+
+        updated_columns = [
+            "name", "type", "expected_revenue", "active", "partner_id", "stage_id",
+            "user_id", "description", "pc_remote_pipeline_id", "pc_remote_stage_id",
+            "pc_remote_assignee_id", "pc_last_remote_update",
+        ]
+        cr.execute(
+            "WITH " + _DEAL_CTE + """
+            UPDATE crm_lead lead
+            SET name = row.name, type = 'opportunity',
+                expected_revenue = row.expected_revenue, active = row.active,
+                partner_id = COALESCE(row.partner_id, lead.partner_id),
+                pc_remote_pipeline_id = CASE WHEN row.stage IS NOT NULL
+                                             THEN row.pipeline ELSE lead.pc_remote_pipeline_id END,
+                pc_remote_stage_id = COALESCE(row.stage, lead.pc_remote_stage_id),
+                stage_id = COALESCE(row.stage_id, lead.stage_id),
+                pc_remote_assignee_id = COALESCE(row.assignee, lead.pc_remote_assignee_id),
+                user_id = COALESCE(row.user_id, lead.user_id),
+                description = COALESCE(row.description, lead.description),
+                pc_last_remote_update = %(now)s,
+                write_uid = %(uid)s, write_date = %(now)s
+            FROM row
+            WHERE lead.pc_deal_id = row.remote_id AND lead.pc_account_id IS NOT DISTINCT FROM %(account_id)s
+            RETURNING lead.id
+            """,
+            params,
+        )
+        updated_ids = [row[0] for row in cr.fetchall()]
+
+        created_ids, inserted = self._insert_rows("crm.lead", _DEAL_CTE, {
+            "name": "row.name",
+            "type": "'opportunity'",
+            "expected_revenue": "row.expected_revenue",
+            "active": "row.active",
+            "partner_id": "row.partner_id",
+            "stage_id": "row.stage_id",
+            "user_id": "row.user_id",
+            "description": "row.description",
+            "pc_deal_id": "row.remote_id",
+            "pc_account_id": "%(account_id)s",
+            "pc_remote_pipeline_id": "CASE WHEN row.stage IS NOT NULL THEN row.pipeline END",
+            "pc_remote_stage_id": "row.stage",
+            "pc_remote_assignee_id": "row.assignee",
+            "pc_last_remote_update": "%(now)s",
+        }, """NOT EXISTS (
+            SELECT 1 FROM crm_lead x
+            WHERE x.pc_deal_id = row.remote_id AND x.pc_account_id IS NOT DISTINCT FROM %(account_id)s
+        )""", params)
+
+        self._finish_sql_merge("crm.lead", created_ids, inserted, updated_ids, updated_columns)
+
+    # ------------- ORM INVARIANTS -------------
+
+    def _column_defaults(self, model):
+        """Defaults a regular ``create`` would add, converted for SQL."""
+        Model = self.env[model]
+        names = [
+            name for name, field in Model._fields.items()
+            if field.store and field.column_type and name not in models.MAGIC_COLUMNS
+        ]
+        return {
+            name: Model._fields[name].convert_to_column_insert(value, Model)
+            for name, value in Model.default_get(names).items()
+            if value is not False and value is not None
+        }
+
+    def _insert_rows(self, model, cte, exprs, where, params):
+        """``INSERT ... SELECT`` new rows, completed with the model defaults.
+
+        A default also backs an explicit expression that evaluates to NULL.
+
+        :return: (new ids, inserted column names)
+        """
+        defaults = self._column_defaults(model)
+        params = dict(params)
+        columns, values = [], []
+        for column in sorted(set(exprs) | set(defaults)):
+            expr = exprs.get(column)
+            if column in defaults:
+                params["default_%s" % column] = defaults[column]
+                default = "%%(default_%s)s" % column
+                expr = "COALESCE(%s, %s)" % (expr, default) if expr else default
+            columns.append(column)
+            values.append(expr)
+        self.env.cr.execute(
+            "WITH " + cte + """
+            INSERT INTO {table} ({columns}, create_uid, create_date, write_uid, write_date)
+            SELECT {values}, %(uid)s, %(now)s, %(uid)s, %(now)s
+            FROM row
+            WHERE {where}
+            ON CONFLICT DO NOTHING
+            RETURNING id
+            """.format(
+                table=self.env[model]._table,
+                columns=", ".join('"%s"' % column for column in columns),
+                values=", ".join(values),
+                where=where,
+            ),
+            params,
+        )
+        return [row[0] for row in self.env.cr.fetchall()], columns
+
+    def _finish_sql_merge(self, model, created_ids, inserted_fields, updated_ids, updated_fields):
+        """Fill stored computed fields and dependencies like ``create``/``write``."""
+        Model = self.env[model].with_context(pc_skip_sync=True)
+        Model.invalidate_model()
+        created = Model.browse(created_ids)
+        if created:
+            for name, field in Model._fields.items():
+                if not (field.store and field.compute):
+                    continue
+                if name not in inserted_fields:
+                    self.env.add_to_compute(field, created)
+                else:
+                    # Explicit value missing for some rows: compute it instead
+                    missing = created.filtered(lambda record: not record[name])
+                    if missing:
+                        self.env.add_to_compute(field, missing)
+            created.modified([name for name in inserted_fields if name in Model._fields], create=True)
+        updated = Model.browse(updated_ids)
+        if updated:
+            updated.modified([name for name in updated_fields if name in Model._fields])
+        self.env.flush_all()
+
+
+class PcSyncBootstrapLine(models.Model):
+    _name = "pc.sync.bootstrap.line"
+    _description = "ProspectConnect Bootstrap Staging Row"
+    _log_access = False
+
+    bootstrap_id = fields.Many2one("pc.sync.bootstrap", required=True, ondelete="cascade")
+    object_type = fields.Char(required=True)
+    remote_id = fields.Char(required=True)
+    payload = fields.Text(required=True)
+
+    def init(self):
+        create_index(
+            self.env.cr, "pc_sync_bootstrap_line_claim_idx", self._table,
+            ["bootstrap_id", "object_type", "id"],
+        )
+        create_index(
+            self.env.cr, "pc_sync_bootstrap_line_remote_idx", self._table,
+            ["bootstrap_id", "object_type", "remote_id"],
+        )
@@ -0,0 +1,340 @@
+# prospectconnect_sync/models/pc_sync_breaker.py
+import logging
+import time
+from contextlib import contextmanager
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_unique_index
+
+from ..tools import is_testing
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import requests
+except Exception:  # pragma: no cover
+    requests = None
+
+# Endpoint families, one breaker each per account: a failing deals API does
+# not stop contacts, and an account's outage does not stop the others
+BREAKER_FAMILIES = [
+    ("contact", "Contacts"),
+    ("deal", "Opportunities"),
+    ("task", "Tasks"),
+    ("note", "Notes"),
+]
+
+
+def _batch_state(state, failures, cooled_down):
+    """State of one breaker as kept by a batch."""
+    return {
+        "state": state,
+        "failures": failures,
+        "cooled_down": cooled_down,
+        "pending": 0,
+        "error": None,
+        "latency": 0.0,
+    }
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an endpoint family whose breaker is open."""
+
+
+class PcSyncBreaker(models.Model):
+    """Circuit breaker per ProspectConnect account and endpoint family.
+
+    The state lives in the database and is read and written through a
+    separate, immediately committed cursor, so every cron worker sees a
+    trip as soon as it happens, whatever its own transaction does. A batch
+    of calls reads it once and writes it when it changes (``_batch``).
+
+    * closed: calls go through; consecutive failures (errors, 5xx, 429,
+      timeouts or calls slower than the latency limit) are counted and the
+      breaker opens once they reach the threshold.
+    * open: calls are skipped without touching the network until the
+      cool-down has elapsed.
+    * half_open: one worker won the probe; everyone else still skips. The
+      probe's outcome closes the breaker or opens it for another cool-down.
+    """
+
+    _name = "pc.sync.breaker"
+    _description = "ProspectConnect Circuit Breaker"
+    _order = "account_id, family"
+    _log_access = False
+
+    family = fields.Selection(BREAKER_FAMILIES, required=True, readonly=True)
+    account_id = fields.Many2one(
+        "pc.account", string="Account", ondelete="cascade", readonly=True,
+        help="Empty for the default account (Settings).",
+    )
+    state = fields.Selection(
+        [
+            ("closed", "Closed"),
+            ("open", "Open"),
+            ("half_open", "Half-open"),
+        ],
+        default="closed",
+        required=True,
+        readonly=True,
+    )
+    failure_count = fields.Integer(string="Consecutive Failures", readonly=True)
+    opened_at = fields.Datetime(readonly=True)
+    last_error = fields.Text(readonly=True)
+    last_latency = fields.Float(string="Last Latency (s)", readonly=True)
+
+    def init(self):
+        # One breaker per account and family
+        self.env.cr.execute("ALTER TABLE pc_sync_breaker DROP CONSTRAINT IF EXISTS pc_sync_breaker_pc_breaker_family_unique")
+        create_unique_index(
+            self.env.cr, "pc_sync_breaker_account_family_uniq", self._table,
+            ["COALESCE(account_id, 0)", "family"],
+        )
+
+    # ------------- SETTINGS -------------
+
+    @api.model
+    def _get_limits(self):
+        """(failure threshold, cool-down seconds, latency limit seconds)."""
+        icp = self.env["ir.config_parameter"].sudo()
+        return (
+            max(1, int(icp.get_param("prospectconnect_sync.breaker_threshold", 5) or 5)),
+            max(1, int(icp.get_param("prospectconnect_sync.breaker_cooldown", 60) or 60)),
+            float(icp.get_param("prospectconnect_sync.breaker_slow_seconds", 10) or 0),
+        )
+
+    # ------------- STATE CHANGES -------------
+
+    @contextmanager
+    def _cursor(self):
+        """Cursor seeing and publishing breaker state outside the current
+        transaction (the test cursor itself while testing)."""
+        if is_testing():
+            yield self.env.cr
+            return
+        with self.env.registry.cursor() as cr:
+            yield cr
+
+    @contextmanager
+    def _batch(self):
+        """Breaker states shared by the calls of one batch.
+
+        The states are keyed by ``(account id, family)``; those of every
+        account and family are read once, on the first call of the batch,
+        and only written back when they change: probe claimed, breaker
+        opened or closed. Failures that did not open a breaker are added to
+        its shared count once, when the batch ends.
+        """
+        states = {}
+        try:
+            yield states
+        finally:
+            for key, breaker in states.items():
+                if breaker["pending"]:
+                    self._write_failures(key, breaker)
+
+    @api.model
+    def _load(self, states, key):
+        """State of ``key`` in the batch, reading all breakers at once."""
+        if not states:
+            _threshold, cooldown, _slow = self._get_limits()
+            with self._cursor() as cr:
+                cr.execute(
+                    """
+                    SELECT account_id, family, state, failure_count,
+                           opened_at <= now() AT TIME ZONE 'UTC' - make_interval(secs => %s)
+                      FROM pc_sync_breaker
+                    """,
+                    [cooldown],
+                )
+                for account_id, family, state, failures, cooled_down in cr.fetchall():
+                    states[account_id or False, family] = _batch_state(state, failures, bool(cooled_down))
+        if key not in states:
+            # No row yet: closed, without failures
+            states[key] = _batch_state("closed", 0, False)
+        return states[key]
+
+    @api.model
+    def _allow(self, states, key):
+        """Whether a call through the breaker ``key`` (``(account id,
+        family)``) may be dispatched now.
+
+        Claims the probe when the cool-down of an open breaker has elapsed,
+        so exactly one worker calls a recovering endpoint.
+        """
+        account_id, family = key
+        breaker = self._load(states, key)
+        if breaker["state"] == "closed":
+            return True
+        if not breaker["cooled_down"]:
+            return False
+        # Claimed or lost, the probe is not tried again in this batch
+        breaker.update(state="half_open", cooled_down=False)
+        _threshold, cooldown, _slow = self._get_limits()
+        with self._cursor() as cr:
+            # Stale half-open states (a probe that never reported) are
+            # claimable again as well
+            cr.execute(
+                """
+                UPDATE pc_sync_breaker
+                   SET state = 'half_open', opened_at = now() AT TIME ZONE 'UTC'
+                 WHERE family = %s AND account_id IS NOT DISTINCT FROM %s
+                   AND state IN ('open', 'half_open')
+                   AND opened_at <= now() AT TIME ZONE 'UTC' - make_interval(secs => %s)
+             RETURNING id
+                """,
+                [family, account_id or None, cooldown],
+            )
+            if not cr.fetchone():
+                return False
+        _logger.info("ProspectConnect %s circuit half-open, probing (account %s)", family, account_id or "default")
+        return True
+
+    @api.model
+    def _record(self, states, key, latency, error=None):
+        """Count the outcome of one call and open or close the breaker."""
+        threshold, _cooldown, slow = self._get_limits()
+        if not error and slow and latency > slow:
+            error = "Slow response: %.1fs" % latency
+        account_id, family = key
+        breaker = self._load(states, key)
+        if not error:
+            if breaker["state"] == "closed" and not breaker["failures"]:
+                return
+            with self._cursor() as cr:
+                cr.execute(
+                    """
+                    UPDATE pc_sync_breaker
+                       SET state = 'closed', failure_count = 0, last_latency = %s
+                     WHERE family = %s AND account_id IS NOT DISTINCT FROM %s
+                       AND (state != 'closed' OR failure_count != 0)
+                 RETURNING id
+                    """,
+                    [latency, family, account_id or None],
+                )
+                if cr.fetchone() and breaker["state"] != "closed":
+                    _logger.info("ProspectConnect %s circuit closed (account %s)", family, account_id or "default")
+            breaker.update(state="closed", failures=0, pending=0)
+            return
+        breaker["failures"] += 1
+        breaker["pending"] += 1
+        breaker.update(error=str(error)[:1000], latency=latency)
+        if breaker["state"] == "half_open" or breaker["failures"] >= threshold:
+            self._write_failures(key, breaker, trip=True)
+
+    @api.model
+    def _write_failures(self, key, breaker, trip=False):
+        """Add the failures counted in the batch to the shared count, and
+        open the breaker when ``trip`` or once the count reaches the
+        threshold."""
+        threshold, _cooldown, _slow = self._get_limits()
+        account_id, family = key
+        with self._cursor() as cr:
+            cr.execute(
+                """
+                INSERT INTO pc_sync_breaker AS b
+                       (account_id, family, state, failure_count, opened_at, last_error, last_latency)
+                VALUES (%(account_id)s, %(family)s,
+                        CASE WHEN %(trip)s THEN 'open' ELSE 'closed' END,
+                        %(failures)s,
+                        CASE WHEN %(trip)s THEN now() AT TIME ZONE 'UTC' END,
+                        %(error)s, %(latency)s)
+                ON CONFLICT (COALESCE(account_id, 0), family) DO UPDATE
+                   SET failure_count = b.failure_count + EXCLUDED.failure_count,
+                       state = CASE WHEN %(trip)s OR (b.state = 'closed'
+                                    AND b.failure_count + EXCLUDED.failure_count >= %(threshold)s)
+                                    THEN 'open' ELSE b.state END,
+                       opened_at = CASE WHEN %(trip)s OR (b.state = 'closed'
+                                        AND b.failure_count + EXCLUDED.failure_count >= %(threshold)s)
+                                        THEN now() AT TIME ZONE 'UTC' ELSE b.opened_at END,
+                       last_error = EXCLUDED.last_error,
+                       last_latency = EXCLUDED.last_latency
+             RETURNING state, failure_count
+                """,
+                {
+                    "account_id": account_id or None,
+                    "family": family,
+                    "trip": trip,
+                    "failures": breaker["pending"],
+                    "threshold": threshold,
+                    "error": breaker["error"],
+                    "latency": breaker["latency"],
+                },
+            )
+            state, failures = cr.fetchone()
+        opened = state == "open" and breaker["state"] != "open"
+        breaker.update(state=state, failures=failures, pending=0, cooled_down=False)
+        if opened:
+            _logger.warning(
+                "ProspectConnect %s circuit open after %s failures (account %s): %s",
+                family, failures, account_id or "default", breaker["error"],
+            )
+
+    @api.model
+    def _is_outage(self, error):
+        """Whether an exception says the endpoint is unavailable, rather
+        than rejecting this particular request."""
+        if requests is None:
+            return False
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return False
+
+    @contextmanager
+    def _guard(self, family, states=None):
+        """Run one call to ``family`` through the breaker of the account in
+        context.
+
+        :param states: breaker states of the batch (see ``_batch``); a batch
+            of its own for this single call when not given
+        :raise CircuitOpen: when the breaker does not let the call through
+        """
+        if states is None:
+            with self._batch() as states, self._guard(family, states):
+                yield
+            return
+        key = (self.env.context.get("pc_account_id") or False, family)
+        if not self._allow(states, key):
+            raise CircuitOpen("ProspectConnect %s endpoints unavailable, call skipped" % family)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._record(states, key, time.monotonic() - started, e if self._is_outage(e) else None)
+            raise
+        self._record(states, key, time.monotonic() - started)
+
+    # ------------- ACTIONS -------------
+
+    @api.model
+    def _get_status(self):
+        """One line per account and family for the settings screen."""
+        # Written through raw SQL, possibly by other workers
+        self.invalidate_model()
+        states = {(b.account_id, b.family): b for b in self.search([])}
+        lines = []
+        for account in self.env["pc.account"]._get_accounts():
+            for family, label in BREAKER_FAMILIES:
+                if account:
+                    label = "%s, %s" % (account.name, label)
+                breaker = states.get((account, family))
+                if not breaker or breaker.state == "closed":
+                    lines.append("%s: closed" % label)
+                    continue
+                lines.append("%s: %s since %s (%s)" % (
+                    label,
+                    dict(self._fields["state"].selection)[breaker.state].lower(),
+                    fields.Datetime.to_string(breaker.opened_at),
+                    breaker.last_error or "",
+                ))
+        return "\n".join(lines)
+
+    @api.model
+    def action_reset(self):
+        """Close every breaker, e.g. once an outage is known to be over."""
+        with self._cursor() as cr:
+            cr.execute("UPDATE pc_sync_breaker SET state = 'closed', failure_count = 0, opened_at = NULL")
+        self.env.invalidate_all()
+        return True
@@ -0,0 +1,300 @@
+# prospectconnect_sync/models/pc_sync_inbound.py
+import json
+import logging
+import random
+import time
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_unique_index
+
+from ..tools import CONCURRENCY_ERRORS, is_testing
+
+_logger = logging.getLogger(__name__)
+
+# Contacts first so deals, tasks and notes fetched in the same run can link
+OBJECT_ORDER = ["contact", "deal", "task", "note"]
+MAX_ATTEMPTS = 5
+# Times a batch is started over when another worker applied the same records
+MAX_CONFLICT_RETRIES = 3
+
+
+class PcSyncInbound(models.Model):
+    """Staging queue between fetching from ProspectConnect and applying.
+
+    One row per remote record: a record fetched again before it was applied
+    overwrites its pending payload, so it is applied once with the latest
+    version. Rows are deleted once applied. Rows that cannot be applied
+    yet because the records they link to are not in Odoo (tasks or notes on
+    a contact that was not pulled) are kept as deferred and retried once
+    contacts or deals have been applied, up to ``MAX_ATTEMPTS`` times.
+
+    Rows keep the account they were fetched from and are applied for it,
+    new records going to the account's company.
+    """
+
+    _name = "pc.sync.inbound"
+    _description = "ProspectConnect Inbound Staging Queue"
+    _order = "id"
+
+    object_type = fields.Selection(
+        [
+            ("contact", "Contact"),
+            ("deal", "Deal"),
+            ("task", "Task"),
+            ("note", "Note"),
+        ],
+        required=True,
+    )
+    remote_id = fields.Char(string="ProspectConnect ID", required=True)
+    payload = fields.Text(required=True)
+    state = fields.Selection(
+        [("pending", "Pending"), ("deferred", "Deferred"), ("failed", "Failed")],
+        default="pending",
+        required=True,
+        index=True,
+    )
+    attempts = fields.Integer(default=0)
+    error_message = fields.Text()
+    fetched_at = fields.Datetime(string="Fetched At")
+    account_id = fields.Many2one("pc.account", string="Account", ondelete="cascade")
+
+    def init(self):
+        # Only one staged version per remote record of each account
+        self.env.cr.execute(
+            "ALTER TABLE pc_sync_inbound DROP CONSTRAINT IF EXISTS pc_sync_inbound_pc_inbound_remote_unique"
+        )
+        create_unique_index(
+            self.env.cr, "pc_sync_inbound_account_remote_uniq", self._table,
+            ["COALESCE(account_id, 0)", "object_type", "remote_id"],
+        )
+
+    # ------------- FETCH SIDE -------------
+
+    @api.model
+    def _stage(self, object_type, payloads, chunk_size=500, state="pending"):
+        """Bulk upsert fetched payloads, newer versions replacing staged ones.
+
+        Rows are staged for the account in context.
+        """
+        rows = {}
+        for payload in payloads:
+            remote_id = payload.get("id") or payload.get("taskId")
+            if remote_id:
+                rows[str(remote_id)] = payload
+        if not rows:
+            return 0
+
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        account_id = self.env.context.get("pc_account_id") or None
+        items = list(rows.items())
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            params = []
+            for remote_id, payload in chunk:
+                params.extend([
+                    account_id, object_type, remote_id, json.dumps(payload), state, now, uid, now, uid, now,
+                ])
+            self.env.cr.execute(
+                """
+                INSERT INTO pc_sync_inbound
+                    (account_id, object_type, remote_id, payload, state, attempts, fetched_at,
+                     create_uid, create_date, write_uid, write_date)
+                VALUES %s
+                ON CONFLICT (COALESCE(account_id, 0), object_type, remote_id) DO UPDATE
+                SET payload = EXCLUDED.payload,
+                    state = EXCLUDED.state,
+                    -- Deferring again keeps the count of retries
+                    attempts = CASE WHEN EXCLUDED.state = 'deferred'
+                                    THEN pc_sync_inbound.attempts ELSE 0 END,
+                    error_message = NULL,
+                    fetched_at = EXCLUDED.fetched_at,
+                    write_uid = EXCLUDED.write_uid,
+                    write_date = EXCLUDED.write_date
+                """ % ", ".join(["(%s, %s, %s, %s, %s, 0, %s, %s, %s, %s, %s)"] * len(chunk)),
+                params,
+            )
+        self.invalidate_model()
+        return len(rows)
+
+    @api.model
+    def _defer(self, object_type, payloads):
+        """Keep payloads whose linked records are missing until they show up."""
+        return self._stage(object_type, payloads, state="deferred")
+
+    @api.model
+    def _requeue_deferred(self, object_type):
+        """Retry the deferred rows of the account in context.
+
+        Every retry counts as an attempt; rows still deferred after
+        ``MAX_ATTEMPTS`` retries link to records that never came and are
+        marked failed, like rows that failed to apply that often, instead
+        of cycling forever.
+        """
+        self.env.cr.execute(
+            """
+            UPDATE pc_sync_inbound
+            SET attempts = attempts + 1,
+                state = CASE WHEN attempts + 1 >= %(max)s THEN 'failed' ELSE 'pending' END,
+                error_message = CASE WHEN attempts + 1 >= %(max)s
+                                     THEN %(message)s ELSE error_message END
+            WHERE object_type = %(object_type)s AND state = 'deferred'
+              AND account_id IS NOT DISTINCT FROM %(account_id)s
+            RETURNING state
+            """,
+            {
+                "max": MAX_ATTEMPTS,
+                "message": "Linked contact or deal not found in Odoo",
+                "object_type": object_type,
+                "account_id": self.env.context.get("pc_account_id") or None,
+            },
+        )
+        return sum(1 for (state,) in self.env.cr.fetchall() if state == "pending")
+
+    @api.model
+    def _trigger_apply(self):
+        """Wake the apply worker if anything is waiting."""
+        self.env.cr.execute("SELECT 1 FROM pc_sync_inbound WHERE state = 'pending' LIMIT 1")
+        if self.env.cr.fetchone():
+            cron = self.env.ref("prospectconnect_sync.ir_cron_pc_apply_staged", raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger()
+
+    # ------------- APPLY SIDE -------------
+
+    @api.model
+    def process_staged(self, batch_size=200):
+        """Drain the staging queue in batches (apply worker, called by cron).
+
+        Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers
+        can drain the queue side by side. Each account's rows are applied
+        with the account in context and its company as default company.
+
+        Every batch is flushed and committed, and the record cache cleared,
+        before the next one is claimed: memory stays flat however many
+        records a run applies, and an interrupted run keeps what it applied.
+        A batch that collides with another worker applying the same remote
+        records (unique ProspectConnect ids, concurrent updates) is rolled
+        back and started over in a new transaction, which sees their result
+        and updates the records instead of creating them again.
+
+        :return: number of rows processed
+        """
+        SyncRun = self.env["pc.sync.run"]
+        if SyncRun._profiling_requested():
+            return SyncRun._run_profiled(self, "process_staged")
+
+        processed = 0
+        self.env.cr.execute("SELECT DISTINCT account_id FROM pc_sync_inbound")
+        account_ids = [row[0] or False for row in self.env.cr.fetchall()]
+        for account_id in account_ids:
+            account = self.env["pc.account"].browse(account_id)
+            staged = self.with_context(**account._get_apply_context())
+            for object_type in OBJECT_ORDER:
+                # Deferred tasks and notes may link to contacts or deals applied just before
+                if object_type in ("task", "note") and processed:
+                    staged._requeue_deferred(object_type)
+                    self._end_chunk()
+                last_id = 0
+                conflicts = 0
+                while True:
+                    rows = staged._claim(object_type, batch_size, last_id)
+                    if not rows:
+                        break
+                    try:
+                        staged._apply_rows(object_type, rows)
+                    except CONCURRENCY_ERRORS as e:
+                        conflicts += 1
+                        if conflicts > MAX_CONFLICT_RETRIES:
+                            raise
+                        _logger.info(
+                            "ProspectConnect staged %s batch collided with another worker (%s), retrying",
+                            object_type, e.__class__.__name__,
+                        )
+                        self._rollback_chunk(conflicts)
+                        continue
+                    conflicts = 0
+                    last_id = rows[-1][0]
+                    processed += len(rows)
+                    self._end_chunk()
+        if processed:
+            _logger.info("ProspectConnect applied %s staged records", processed)
+        return processed
+
+    @api.model
+    def _end_chunk(self):
+        """Commit the applied batch and drop the records it loaded."""
+        self.env.flush_all()
+        if not is_testing():
+            self.env.cr.commit()
+        self.env.invalidate_all()
+
+    @api.model
+    def _rollback_chunk(self, attempt):
+        """Undo the failed batch before starting it over.
+
+        The new transaction sees the records committed meanwhile. Under tests
+        the failed savepoints were already rolled back.
+        """
+        if not is_testing():
+            self.env.cr.rollback()
+            time.sleep(random.uniform(0, 0.1 * 2 ** attempt))
+
+    @api.model
+    def _claim(self, object_type, limit, after_id=0):
+        """Lock the next rows of the account in context."""
+        self.env.cr.execute(
+            """
+            SELECT id, payload FROM pc_sync_inbound
+            WHERE object_type = %s AND state IN ('pending', 'failed')
+              AND COALESCE(account_id, 0) = %s
+              AND attempts < %s AND id > %s
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (object_type, self.env.context.get("pc_account_id") or 0, MAX_ATTEMPTS, after_id, limit),
+        )
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _apply_rows(self, object_type, rows):
+        """Apply claimed rows; on failure retry one by one to isolate bad rows."""
+        State = self.env["pc.sync.state"]
+        payloads = [json.loads(payload) for _id, payload in rows]
+        try:
+            with self.env.cr.savepoint():
+                State._apply_batch(object_type, payloads)
+            self._done([row_id for row_id, _payload in rows])
+            return
+        except CONCURRENCY_ERRORS:
+            # Not the rows' fault: the whole batch is started over
+            raise
+        except Exception:
+            _logger.warning(
+                "ProspectConnect staged %s batch failed, applying row by row", object_type
+            )
+        for (row_id, _payload), payload in zip(rows, payloads):
+            try:
+                with self.env.cr.savepoint():
+                    State._apply_batch(object_type, [payload])
+                self._done([row_id])
+            except CONCURRENCY_ERRORS:
+                raise
+            except Exception as e:
+                _logger.exception("ProspectConnect staged %s %s failed", object_type, row_id)
+                self.env.cr.execute(
+                    """
+                    UPDATE pc_sync_inbound
+                    SET state = 'failed', attempts = attempts + 1, error_message = %s
+                    WHERE id = %s
+                    """,
+                    (str(e), row_id),
+                )
+
+    @api.model
+    def _done(self, row_ids):
+        # Rows deferred while being applied stay in the queue
+        self.env.cr.execute(
+            "DELETE FROM pc_sync_inbound WHERE id = ANY(%s) AND state != 'deferred'", (row_ids,)
+        )
@@ -1,8 +1,19 @@
 # prospectconnect_sync/models/pc_sync_job.py
+import hashlib
+import hmac
+import json
 import logging
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 from odoo import api, fields, models
+from odoo.http import request
+from odoo.tools.sql import create_index, create_unique_index
+
+from ..tools import ACCEPT_ENCODING, decode_response, post_json
+from .pc_sync_breaker import CircuitOpen
+from .pc_sync_run import http_tape, profile_phase, wire_stats
+from .pc_sync_state import PULL_ENDPOINTS, SYNC_CRONS
 
 _logger = logging.getLogger(__name__)
 
@@ -11,11 +22,51 @@ try:
 except Exception:  # pragma: no cover
     requests = None
 
+# Priority lanes, drained in this order ("0" first)
+PRIORITY_INTERACTIVE = "0"
+PRIORITY_NORMAL = "1"
+PRIORITY_RETRY = "2"
+PRIORITY_BULK = "3"
+PRIORITIES = [
+    (PRIORITY_INTERACTIVE, "Interactive"),
+    (PRIORITY_NORMAL, "Normal"),
+    (PRIORITY_RETRY, "Retry"),
+    (PRIORITY_BULK, "Bulk"),
+]
+# Share of each batch guaranteed to every lower lane that has work waiting
+LOWER_LANE_SHARE = 0.1
+# A single write queuing more records than this is a bulk change
+BULK_THRESHOLD = 50
+
+# Failed jobs are attempted this many times, then left failed for review
+MAX_RETRIES = 5
+# Seconds before the first retry of a failed push, doubled on every failure
+RETRY_BACKOFF = 30
+
+# PostgreSQL channel notified when pushes are queued
+NOTIFY_CHANNEL = "pc_sync_job"
+
+# Create calls, which carry an idempotency key: path -> object type created
+CREATE_PATHS = {
+    "/deal/addDeal": "deal",
+    "/task/createTask": "task",
+    "/note/createNote": "note",
+}
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# Pages of recent records searched for the result of an earlier create attempt
+RECONCILE_MAX_PAGES = 5
+
+# Records other objects link to on ProspectConnect: model -> (object type, id field)
+PARENT_TYPES = {
+    "res.partner": ("contact", "pc_contact_id"),
+    "crm.lead": ("deal", "pc_deal_id"),
+}
+
 
 class PcSyncJob(models.Model):
     _name = "pc.sync.job"
     _description = "ProspectConnect Sync Job"
-    _order = "create_date asc"
+    _order = "priority, id"
 
     direction = fields.Selection(
         [("odoo_to_pc", "Odoo → ProspectConnect"), ("pc_to_odoo", "ProspectConnect → Odoo")],
@@ -44,31 +95,618 @@ class PcSyncJob(models.Model):
         default="pending",
         index=True,
     )
+    priority = fields.Selection(
+        PRIORITIES,
+        default=lambda self: self._get_origin_priority(),
+        required=True,
+        help="Lane of the job: interactive edits are pushed before imports, retries and backfills.",
+    )
+    eligible_at = fields.Datetime(
+        string="Push After",
+        help="Debounced pushes wait until the record has been quiet for a while; empty when the job can run right away.",
+    )
+    account_id = fields.Many2one(
+        "pc.account",
+        string="Account",
+        ondelete="cascade",
+        help="Account the record is pushed to; empty for the default account (Settings).",
+    )
     retry_count = fields.Integer(default=0)
-    next_retry_at = fields.Datetime()
+    next_retry_at = fields.Datetime(
+        help="Failed pushes are retried after an exponential backoff; empty when the job can run right away.",
+    )
     error_message = fields.Text()
 
+    # Inbound (webhook) jobs carry the remote record and the latest event
+    # that sent it; every event received is kept in pc.sync.event
+    event_id = fields.Char(string="Webhook Event ID", index=True, copy=False)
+    event_ids = fields.One2many("pc.sync.event", "job_id", string="Webhook Events")
+    payload = fields.Text(string="Payload")
+
+    def init(self):
+        create_index(
+            self.env.cr, "pc_sync_job_claim_idx", self._table,
+            ["direction", "priority", "id"],
+            where="status IN ('pending', 'failed')",
+        )
+        # Wakes the sync worker (``odoo-bin pc_sync_worker``) when pushes are
+        # queued or postponed; notifications are delivered on commit and
+        # merged per transaction.
+        self.env.cr.execute(
+            """
+            CREATE OR REPLACE FUNCTION pc_sync_job_notify() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify(%s, '');
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS pc_sync_job_notify_insert ON pc_sync_job;
+            CREATE TRIGGER pc_sync_job_notify_insert
+                AFTER INSERT ON pc_sync_job
+                FOR EACH ROW WHEN (NEW.direction = 'odoo_to_pc')
+                EXECUTE FUNCTION pc_sync_job_notify();
+
+            DROP TRIGGER IF EXISTS pc_sync_job_notify_update ON pc_sync_job;
+            CREATE TRIGGER pc_sync_job_notify_update
+                AFTER UPDATE OF eligible_at ON pc_sync_job
+                FOR EACH ROW WHEN (
+                    NEW.direction = 'odoo_to_pc' AND NEW.status = 'pending'
+                    AND NEW.eligible_at IS DISTINCT FROM OLD.eligible_at
+                )
+                EXECUTE FUNCTION pc_sync_job_notify();
+            """,
+            [NOTIFY_CHANNEL],
+        )
+
+    @api.model
+    def _get_origin_priority(self, batch_size=1):
+        """Lane of jobs queued now, from where the change comes from."""
+        if self.env.context.get("pc_priority"):
+            return self.env.context["pc_priority"]
+        if self.env.context.get("import_file") or batch_size > BULK_THRESHOLD:
+            return PRIORITY_BULK
+        if request:
+            # A user editing through the web client
+            return PRIORITY_INTERACTIVE
+        return PRIORITY_NORMAL
+
+    # ------------------ QUEUEING ------------------
+
+    @api.model
+    def _get_debounce(self, object_type):
+        """(quiet window, maximum delay) in seconds for pushes of ``object_type``."""
+        icp = self.env["ir.config_parameter"].sudo()
+        window = int(icp.get_param("prospectconnect_sync.debounce_%s" % object_type, 0) or 0)
+        max_delay = int(icp.get_param("prospectconnect_sync.debounce_max_delay", 300) or 0)
+        return max(window, 0), max(max_delay, 0)
+
+    @api.model
+    def _queue_push(self, object_type, records, priority):
+        """Queue the push of ``records``, merging bursts of edits.
+
+        A record that already has a pending push is not queued again; its
+        job is postponed instead, until the record has been quiet for the
+        debounce window of its type but never later than the maximum delay
+        after it was first queued. The push sends the record as it is then,
+        so a burst of edits becomes a single call.
+
+        A pending job locked by a worker pushing it right now may send the
+        record as it was before this edit: the record gets a new job instead,
+        without waiting for the worker.
+
+        :return: the jobs created
+        """
+        if not records:
+            return self.browse()
+        window, max_delay = self._get_debounce(object_type)
+        eligible_at = fields.Datetime.now() + timedelta(seconds=min(window, max_delay)) if window else False
+
+        pending = {}
+        for job in self.search([
+            ("direction", "=", "odoo_to_pc"),
+            ("status", "=", "pending"),
+            ("odoo_model", "=", records._name),
+            ("odoo_res_id", "in", records.ids),
+        ], order="id")._lock_free():
+            pending.setdefault(job.odoo_res_id, job)
+        # Jobs postponed to the same time in the same lane are written
+        # together, and only if that changes them
+        updates = defaultdict(list)
+        for job in pending.values():
+            job_eligible_at = eligible_at and min(eligible_at, job.create_date + timedelta(seconds=max_delay))
+            job_priority = min(job.priority, priority)
+            if (job.eligible_at or False, job.priority) != (job_eligible_at, job_priority):
+                updates[(job_eligible_at, job_priority)].append(job.id)
+        for (job_eligible_at, job_priority), ids in updates.items():
+            self.browse(ids).write({"eligible_at": job_eligible_at, "priority": job_priority})
+
+        new_records = records.filtered(lambda record: record.id not in pending)
+        jobs = self.create([
+            {
+                "direction": "odoo_to_pc",
+                "priority": priority,
+                "object_type": object_type,
+                "odoo_model": record._name,
+                "odoo_res_id": record.id,
+                "eligible_at": eligible_at,
+                "account_id": account.id,
+            }
+            for account, account_records in self.env["pc.account"]._split_by_account(new_records).items()
+            for record in account_records
+        ])
+        if eligible_at:
+            # Run the push shortly after the window rather than on the next
+            # scheduled run
+            cron = self.env.ref(SYNC_CRONS["push"], raise_if_not_found=False)
+            if cron and cron.active:
+                cron._trigger(at=eligible_at)
+        return jobs
+
     # ------------------ CRON PROCESSOR ------------------
 
     @api.model
     def process_pending_jobs(self, limit=100):
-        """Process queued jobs (called from cron & incremental sync)."""
-        domain = [("status", "in", ["pending", "failed"])]
-        jobs = self.search(domain, limit=limit)
+        """Process queued jobs (called from cron, incremental sync and the
+        sync worker).
+
+        Calls are spaced by the ``RateLimiter`` given as ``pc_rate_limiter``
+        in context, if any. A failed job is retried after ``RETRY_BACKOFF``
+        seconds, twice as long after every further failure.
+
+        :return: number of jobs pushed; failures are not progress
+        """
+        SyncRun = self.env["pc.sync.run"]
+        if SyncRun._profiling_requested():
+            return SyncRun._run_profiled(self, "process_pending_jobs")
+
+        now = fields.Datetime.now()
+        domain = [
+            ("direction", "=", "odoo_to_pc"),
+            ("status", "in", ["pending", "failed"]),
+            ("retry_count", "<", MAX_RETRIES),
+            "|", ("eligible_at", "=", False), ("eligible_at", "<=", now),
+            "|", ("next_retry_at", "=", False), ("next_retry_at", "<=", now),
+        ]
+        jobs = self._claim_jobs(domain, limit)
         if not jobs:
-            return
+            return 0
+
+        with profile_phase(self.env, "resolve"):
+            jobs._prefetch_records()
+            jobs, parents, queued, held = jobs._resolve_dependencies()
+        Breaker = self.env["pc.sync.breaker"]
+        limiter = self.env.context.get("pc_rate_limiter")
+        pushed = 0
+        with http_tape(self.env), Breaker._batch() as breakers:
+            for job in jobs:
+                waiting = [
+                    key for key in parents.get(job.id, ())
+                    if (key in queued or key in held)
+                    and not self.env[key[0]].browse(key[1])[PARENT_TYPES[key[0]][1]]
+                ]
+                if waiting:
+                    # The parent failed in this batch, or is pushed later or by
+                    # another worker: sending the child now would create it
+                    # without its link, wait for the next run.
+                    job.error_message = "Waiting for %s to be pushed first." % ", ".join(
+                        "%s %s" % key for key in waiting
+                    )
+                    continue
+                status = job.status
+                try:
+                    with profile_phase(self.env, "write_back"):
+                        job.status = "in_progress"
+                    if limiter:
+                        limiter.wait()
+                    # Each account has its own breakers
+                    breaker = Breaker.with_context(pc_account_id=job.account_id.id)
+                    with breaker._guard(job.object_type, breakers):
+                        job._run_single_job()
+                    with profile_phase(self.env, "write_back"):
+                        job.status = "done"
+                        job.error_message = False
+                    pushed += 1
+                except CircuitOpen as e:
+                    # Not attempted: keep the job as it was, retry count included
+                    job.status = status
+                    job.error_message = str(e)
+                except Exception as e:  # pragma: no cover
+                    _logger.exception("ProspectConnect sync job failed")
+                    job.status = "failed"
+                    job.retry_count += 1
+                    job.next_retry_at = self._get_retry_at(job.retry_count)
+                    job.error_message = str(e)
+                    # Failing jobs leave the lanes of fresh changes
+                    job.priority = max(job.priority, PRIORITY_RETRY)
+        return pushed
+
+    @api.model
+    def _get_retry_at(self, retry_count):
+        """When a push that failed ``retry_count`` times is tried again."""
+        return fields.Datetime.now() + timedelta(seconds=RETRY_BACKOFF * 2 ** (retry_count - 1))
+
+    @api.model
+    def _claim_jobs(self, domain, limit):
+        """Select the next batch, higher lanes first.
+
+        Every lower lane with work waiting is guaranteed a share of the batch
+        (``LOWER_LANE_SHARE``) so a steady flow of interactive edits cannot
+        starve imports and retries; the rest of the batch is filled from
+        the highest lane down.
+        """
+        waiting = dict(self._read_group(domain, ["priority"], ["__count"]))
+        lanes = [lane for lane, _label in PRIORITIES if waiting.get(lane)]
+        if not lanes:
+            return self.browse()
+        share = max(1, int(limit * LOWER_LANE_SHARE))
+        quota = dict.fromkeys(lanes, 0)
+        remaining = limit
+        for lane in lanes[1:]:
+            quota[lane] = min(waiting[lane], share, max(remaining - 1, 0))
+            remaining -= quota[lane]
+        for lane in lanes:
+            extra = min(waiting[lane] - quota[lane], remaining)
+            quota[lane] += extra
+            remaining -= extra
+
+        jobs = self.browse()
+        for lane in lanes:
+            if quota[lane]:
+                jobs |= self.search(domain + [("priority", "=", lane)], order="id", limit=quota[lane])
+        if not jobs:
+            return jobs
+        return jobs._lock_free()
+
+    def _lock_free(self):
+        """Lock the jobs of ``self`` for this transaction and return them,
+        except those locked by another worker (cron or sync worker), which
+        are left to it."""
+        if not self:
+            return self
+        self.env.cr.execute(
+            "SELECT id FROM pc_sync_job WHERE id IN %s FOR NO KEY UPDATE SKIP LOCKED",
+            [tuple(self.ids)],
+        )
+        locked = {row[0] for row in self.env.cr.fetchall()}
+        return self.filtered(lambda job: job.id in locked)
+
+    @api.model
+    def _next_eligible_at(self):
+        """When the next postponed push or retry becomes eligible (``None``
+        if none is)."""
+        self.flush_model(["status", "eligible_at", "next_retry_at", "retry_count"])
+        self.env.cr.execute(
+            """
+            SELECT min(GREATEST(eligible_at, next_retry_at)) FROM pc_sync_job
+             WHERE direction = 'odoo_to_pc' AND status IN ('pending', 'failed')
+               AND retry_count < %s
+               AND GREATEST(eligible_at, next_retry_at) > now() AT TIME ZONE 'UTC'
+            """,
+            [MAX_RETRIES],
+        )
+        return self.env.cr.fetchone()[0]
+
+    # ------------------ DEPENDENCIES ------------------
+
+    def _get_missing_parents(self):
+        """Contacts and deals the pushed records link to that have no
+        ProspectConnect id yet, as ``{job id: [(model, id)]}``.
+
+        Only creations are concerned: ids of existing remote records are
+        not sent again, so updates never wait for their links.
+        """
+        records = {}
+        for job in self:
+            if job.direction == "odoo_to_pc" and job.odoo_model and job.odoo_res_id:
+                records.setdefault(job.odoo_model, set()).add(job.odoo_res_id)
+        existing = {
+            model: set(self.env[model].browse(ids).exists().ids)
+            for model, ids in records.items()
+        }
+
+        targets = {}
+        for job in self:
+            if job.odoo_res_id not in existing.get(job.odoo_model, ()):
+                continue
+            record = self.env[job.odoo_model].browse(job.odoo_res_id)
+            if job.object_type == "deal" and not record.pc_deal_id:
+                targets[job.id] = [("res.partner", record.partner_id.id)]
+            elif job.object_type == "task" and not record.pc_task_id:
+                targets[job.id] = [(record.res_model, record.res_id)]
+            elif job.object_type == "note":
+                targets[job.id] = [(record.model, record.res_id)]
+
+        ids_by_model = {}
+        for keys in targets.values():
+            for model, res_id in keys:
+                if model in PARENT_TYPES and res_id:
+                    ids_by_model.setdefault(model, set()).add(res_id)
+        parents = {
+            model: self.env[model].browse(ids).exists()
+            for model, ids in ids_by_model.items()
+        }
+
+        missing = {}
+        for job in self:
+            result = []
+            for model, res_id in targets.get(job.id, ()):
+                if model not in parents or res_id not in parents[model].ids:
+                    continue
+                parent = self.env[model].browse(res_id)
+                if model == "crm.lead":
+                    # Tasks on a deal are linked to its contact as well
+                    if job.object_type == "task" and parent.partner_id and not parent.partner_id.pc_contact_id:
+                        result.append(("res.partner", parent.partner_id.id))
+                    if parent.type != "opportunity":
+                        continue
+                if not parent[PARENT_TYPES[model][1]]:
+                    result.append((model, res_id))
+            if result:
+                missing[job.id] = result
+        return missing
+
+    def _resolve_dependencies(self):
+        """Complete the batch with the jobs of missing parents and order it.
+
+        Parents without ProspectConnect id are pushed first so their children
+        carry the link on their first call. Their jobs are claimed like the
+        batch (eligible, not given up, not locked by another worker) and
+        pulled into it, and a job is queued for parents that have none.
+        Parents whose job is debounced or claimed by another worker are
+        returned as held: their children wait for them, as they do for a
+        parent waiting for its retry backoff. A parent that failed
+        ``MAX_RETRIES`` times is not waited for.
+
+        :return: (ordered jobs, {job id: [(model, id)]} parents per job,
+                  {(model, id): job} parents pushed in this batch,
+                  {(model, id)} parents held elsewhere)
+        """
+        config = self.env["ir.config_parameter"].sudo()
+        now = fields.Datetime.now()
+        jobs = self
+        parents = {}
+        queued = {}
+        held = set()
+        todo = self
+        while todo:
+            missing = todo._get_missing_parents()
+            parents.update(missing)
+            for job in jobs:
+                queued.setdefault((job.odoo_model, job.odoo_res_id), job)
+            needed = {key for keys in missing.values() for key in keys if key not in queued}
+            if not needed:
+                break
+            found = self.search([
+                ("direction", "=", "odoo_to_pc"),
+                ("status", "in", ["pending", "failed"]),
+                ("odoo_model", "in", list({model for model, _id in needed})),
+                ("odoo_res_id", "in", [res_id for _model, res_id in needed]),
+            ], order="id")
+            found = found.filtered(lambda j: (j.odoo_model, j.odoo_res_id) in needed) - jobs
+            retried = found.filtered(lambda j: j.retry_count < MAX_RETRIES)
+            todo = retried.filtered(
+                lambda j: (not j.eligible_at or j.eligible_at <= now)
+                and (not j.next_retry_at or j.next_retry_at <= now)
+            )._lock_free()
+            held.update((j.odoo_model, j.odoo_res_id) for j in retried - todo)
+            vals_list = []
+            unqueued = defaultdict(list)
+            for model, res_id in needed - {(j.odoo_model, j.odoo_res_id) for j in found}:
+                unqueued[model].append(res_id)
+            for model, res_ids in unqueued.items():
+                object_type = PARENT_TYPES[model][0]
+                default = "True" if object_type == "contact" else "False"
+                if config.get_param("prospectconnect_sync.sync_%ss" % object_type, default) != "True":
+                    continue
+                split = self.env["pc.account"]._split_by_account(self.env[model].browse(res_ids))
+                vals_list += [
+                    {
+                        "direction": "odoo_to_pc",
+                        "object_type": object_type,
+                        "odoo_model": model,
+                        "odoo_res_id": res_id,
+                        "priority": PRIORITY_NORMAL,
+                        "account_id": account.id,
+                    }
+                    for account, parents_of_account in split.items()
+                    for res_id in parents_of_account.ids
+                ]
+            if vals_list:
+                todo |= self.create(vals_list)
+            jobs |= todo
+
+        ordered = []
+        visited = set()
+
+        def visit(job):
+            if job.id in visited:
+                return
+            visited.add(job.id)
+            for key in parents.get(job.id, ()):
+                if key in queued:
+                    visit(queued[key])
+            ordered.append(job.id)
 
         for job in jobs:
+            visit(job)
+        return self.browse(ordered), parents, queued, held
+
+    @api.model
+    def process_inbound_jobs(self, limit=500):
+        """Apply ProspectConnect → Odoo jobs received through the webhook.
+
+        Jobs are applied per account, with the account in context and its
+        company as default company, in one batch per object type (contacts
+        first so deals, tasks and notes can link to them). If a batch fails
+        it is retried job by job so a single bad payload does not block the
+        others; a job that failed ``MAX_RETRIES`` times is left failed.
+        """
+        SyncRun = self.env["pc.sync.run"]
+        if SyncRun._profiling_requested():
+            return SyncRun._run_profiled(self, "process_inbound_jobs")
+
+        domain = [
+            ("direction", "=", "pc_to_odoo"),
+            ("status", "in", ["pending", "failed"]),
+            ("retry_count", "<", MAX_RETRIES),
+        ]
+        jobs = self.search(domain, limit=limit)
+        for account in [self.env["pc.account"]] + list(jobs.account_id):
+            account_jobs = jobs.filtered(lambda job: job.account_id == account)
+            if account_jobs:
+                account_jobs.with_context(**account._get_apply_context())._apply_inbound_jobs()
+
+    def _apply_inbound_jobs(self):
+        """Apply the inbound jobs of ``self``, all of the account in context."""
+        State = self.env["pc.sync.state"]
+        for object_type in ("contact", "deal", "task", "note"):
+            batch = self.filtered(lambda j: j.object_type == object_type)
+            if not batch:
+                continue
+            payloads = [json.loads(job.payload or "{}") for job in batch]
             try:
-                job.status = "in_progress"
-                job._run_single_job()
-                job.status = "done"
-                job.error_message = False
-            except Exception as e:  # pragma: no cover
-                _logger.exception("ProspectConnect sync job failed")
-                job.status = "failed"
-                job.retry_count += 1
-                job.error_message = str(e)
+                with self.env.cr.savepoint():
+                    State._apply_batch(object_type, payloads)
+                batch.write({"status": "done", "error_message": False})
+                continue
+            except Exception:
+                _logger.warning(
+                    "ProspectConnect inbound %s batch failed, retrying job by job", object_type
+                )
+            for job, payload in zip(batch, payloads):
+                try:
+                    with self.env.cr.savepoint():
+                        State._apply_batch(object_type, [payload])
+                    job.write({"status": "done", "error_message": False})
+                except Exception as e:
+                    _logger.exception("ProspectConnect inbound job %s failed", job.id)
+                    job.write({
+                        "status": "failed",
+                        "retry_count": job.retry_count + 1,
+                        "error_message": str(e),
+                    })
+
+    # ------------------ WEBHOOK INTAKE ------------------
+
+    @api.model
+    def _verify_webhook_signature(self, body, signature):
+        """Check the HMAC-SHA256 signature of a raw webhook body with the
+        secret of the account in context."""
+        secret = self.env["pc.account"]._from_context()._get_webhook_secret()
+        if not secret or not signature:
+            return False
+        if signature.startswith("sha256="):
+            signature = signature[len("sha256="):]
+        expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature.strip().lower())
+
+    @api.model
+    def _enqueue_webhook_events(self, events):
+        """Store webhook events of the account in context as pending
+        ``pc_to_odoo`` jobs.
+
+        Events already received (same event id) are dropped; a newer event for
+        a record that still has a pending inbound job replaces that job's
+        payload and event id, so bursts of updates are applied once. The ids
+        of replaced events stay in pc.sync.event, so a late redelivery of an
+        older event is dropped too instead of overwriting newer data. Event
+        ids and pending jobs are only matched within the account.
+
+        :return: tuple (accepted, duplicates)
+        """
+        parsed = []
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            event_type = event.get("type") or event.get("event") or ""
+            object_type = event_type.split(".", 1)[0]
+            data = event.get("data") or {}
+            pc_id = data.get("id") or data.get("taskId")
+            if object_type not in ("contact", "deal", "task", "note") or not pc_id:
+                _logger.debug("Ignoring ProspectConnect webhook event %s", event_type)
+                continue
+            if event_type.endswith(".deleted"):
+                _logger.debug("Ignoring ProspectConnect delete event for %s %s", object_type, pc_id)
+                continue
+            event_id = event.get("id") or event.get("eventId")
+            parsed.append((event_id and str(event_id), object_type, str(pc_id), data))
+        if not parsed:
+            return 0, 0
+
+        # One query for already received events, one for pending jobs to coalesce
+        account_id = self.env.context.get("pc_account_id") or False
+        event_ids = [event_id for event_id, *_rest in parsed if event_id]
+        seen = set(
+            self.env["pc.sync.event"].search([
+                ("event_id", "in", event_ids),
+                ("account_id", "=", account_id),
+            ]).mapped("event_id")
+        ) if event_ids else set()
+        pending = {
+            (job.object_type, job.pc_id): job
+            for job in self.search([
+                ("direction", "=", "pc_to_odoo"),
+                ("status", "=", "pending"),
+                ("account_id", "=", account_id),
+                ("pc_id", "in", [pc_id for _e, _o, pc_id, _d in parsed]),
+            ])
+        }
+
+        accepted = duplicates = 0
+        to_create = {}
+        received = defaultdict(list)
+        for event_id, object_type, pc_id, data in parsed:
+            if event_id and event_id in seen:
+                duplicates += 1
+                continue
+            key = (object_type, pc_id)
+            if event_id:
+                seen.add(event_id)
+                received[key].append(event_id)
+            if key in pending:
+                pending[key].write({"payload": json.dumps(data), "event_id": event_id or pending[key].event_id})
+            elif key in to_create:
+                to_create[key].update(payload=json.dumps(data), event_id=event_id or to_create[key]["event_id"])
+            else:
+                to_create[key] = {
+                    "direction": "pc_to_odoo",
+                    "object_type": object_type,
+                    "pc_id": pc_id,
+                    "account_id": account_id,
+                    "event_id": event_id or False,
+                    "payload": json.dumps(data),
+                }
+            accepted += 1
+        if to_create:
+            pending.update(zip(to_create, self.create(list(to_create.values()))))
+        if received:
+            self.env["pc.sync.event"].create([
+                {"event_id": event_id, "job_id": pending[key].id, "account_id": account_id}
+                for key, key_event_ids in received.items()
+                for event_id in key_event_ids
+            ])
+        return accepted, duplicates
+
+    def _prefetch_records(self):
+        """Load the Odoo records of a batch of push jobs in bulk.
+
+        Each job browses its own record; warming the cache here turns the
+        per-job reads (including partner tag names) into a few queries for
+        the whole batch.
+        """
+        ids_by_model = {}
+        for job in self:
+            if job.direction == "odoo_to_pc" and job.odoo_model and job.odoo_res_id:
+                ids_by_model.setdefault(job.odoo_model, set()).add(job.odoo_res_id)
+        partners = self.env["res.partner"].browse(ids_by_model.get("res.partner", ())).exists()
+        if partners:
+            partners.mapped("category_id.name")
+            partners.mapped("country_id.code")
+            partners.mapped("state_id.name")
+        leads = self.env["crm.lead"].browse(ids_by_model.get("crm.lead", ())).exists()
+        if leads:
+            leads.mapped("partner_id.pc_contact_id")
 
     # ------------------ JOB EXECUTION ------------------
 
@@ -87,59 +725,135 @@ class PcSyncJob(models.Model):
 
     # -------------- HELPER: AUTH + BASE URL ----------------
 
-    @api.model
+    def _get_account(self):
+        """Account of the job, or the account in context when called on the
+        model (empty for the default account)."""
+        return self[:1].account_id or self.env["pc.account"]._from_context()
+
     def _get_api_context(self):
+        """Base url and headers of the job's account, or of the account in
+        context when called on the model."""
         icp = self.env["ir.config_parameter"].sudo()
-        api_key = icp.get_param("prospectconnect_sync.api_key")
-        base_url = icp.get_param(
-            "prospectconnect_sync.base_url", "https://api.prospectconnect.ai"
-        )
+        account = self._get_account()
+        api_key, base_url = account._get_credentials()
         if not api_key or not base_url:
             raise ValueError("ProspectConnect API key or base URL not configured.")
         if not requests:
             raise ValueError("Python 'requests' library is not available.")
         headers = {
             "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Authorization": api_key,
             "Content-Type": "application/json",
         }
+        if icp.get_param("prospectconnect_sync.compress_requests") == "True":
+            headers["Content-Encoding"] = "gzip"
         return base_url.rstrip("/"), headers
 
+    @api.model
+    def _get_push_timeout(self):
+        """Seconds to wait for the answer of a push call."""
+        icp = self.env["ir.config_parameter"].sudo()
+        return max(int(icp.get_param("prospectconnect_sync.push_timeout", 20) or 0), 1)
+
+    @api.model
+    def _get_idempotency_key(self, record):
+        """Key of the creation of ``record`` on ProspectConnect.
+
+        It is the same for every attempt and every job of the record, so a
+        create that timed out after the server applied it is recognized
+        instead of applied twice.
+        """
+        dbuuid = self.env["ir.config_parameter"].sudo().get_param("database.uuid")
+        return "odoo-%s-%s-%s" % (dbuuid, record._name, record.id)
+
+    @api.model
+    def _parse_idempotency_key(self, key):
+        """``(model, id)`` of the record of this database created with ``key``,
+        ``(None, None)`` for keys of other databases or not sent by Odoo."""
+        prefix = "odoo-%s-" % self.env["ir.config_parameter"].sudo().get_param("database.uuid")
+        if not isinstance(key, str) or not key.startswith(prefix):
+            return None, None
+        model, _sep, res_id = key[len(prefix):].rpartition("-")
+        if model not in self.env or not res_id.isdigit():
+            return None, None
+        return model, int(res_id)
+
+    def _send(self, base_url, headers, path, payload):
+        """POST one push call and return the decoded answer.
+
+        Creates carry their idempotency key (``externalId`` of the payload)
+        as header. When the job was attempted before, its earlier create may
+        have been applied remotely without an answer: the record is looked
+        up by that key first and only created if it is not found.
+        """
+        key = payload.get("externalId") if path in CREATE_PATHS else None
+        if key:
+            if self.retry_count:
+                found = self._find_created(CREATE_PATHS[path], key, base_url, headers)
+                if found:
+                    _logger.info(
+                        "ProspectConnect %s %s was already created, linking it", CREATE_PATHS[path], found["id"]
+                    )
+                    return {"data": found}
+            headers = dict(headers, **{IDEMPOTENCY_HEADER: key})
+        stats = wire_stats(self.env)
+        resp = post_json(base_url + path, payload, headers, timeout=self._get_push_timeout(), stats=stats)
+        resp.raise_for_status()
+        return decode_response(resp, stats)
+
+    def _find_created(self, object_type, key, base_url, headers):
+        """Remote record created with idempotency key ``key``, if any.
+
+        Searches the records updated since the job was queued (with an hour
+        of leeway for clock skew), up to ``RECONCILE_MAX_PAGES`` pages.
+        """
+        path, list_key = PULL_ENDPOINTS[object_type]
+        since = (self.create_date or fields.Datetime.now()) - timedelta(hours=1)
+        for page in range(1, RECONCILE_MAX_PAGES + 1):
+            stats = wire_stats(self.env)
+            resp = post_json(
+                base_url + path,
+                {"updatedAfter": since.isoformat(), "limit": 100, "page": page},
+                headers,
+                timeout=self._get_push_timeout(),
+                stats=stats,
+            )
+            resp.raise_for_status()
+            data = decode_response(resp, stats)
+            for record in data.get("data", []) or data.get(list_key, []):
+                if record.get("externalId") == key and record.get("id"):
+                    return record
+            if not data.get("hasMore"):
+                break
+        return None
+
     def _get_assignee_id(self, odoo_user):
         """Map Odoo user to ProspectConnect user ID."""
         if not odoo_user:
             return None
-        mapping = self.env["pc.user.mapping"].search(
-            [("odoo_user_id", "=", odoo_user.id)], limit=1
-        )
-        return mapping.pc_user_id if mapping else None
+        account_id = self[:1].account_id.id or self.env.context.get("pc_account_id") or False
+        return self.env["pc.user.mapping"]._get_user_map(account_id)[1].get(odoo_user.id)
 
     def _get_stage_mapping(self, odoo_stage):
         """Map Odoo stage to ProspectConnect stage/pipeline IDs."""
         if not odoo_stage:
             return None, None
-        mapping = self.env["pc.pipeline.mapping"].search(
-            [("odoo_stage_id", "=", odoo_stage.id)], limit=1
+        account_id = self[:1].account_id.id or self.env.context.get("pc_account_id") or False
+        pipeline_id, stage_id = self.env["pc.pipeline.mapping"]._get_stage_map(account_id)[1].get(
+            odoo_stage.id, (None, None)
         )
-        if mapping:
-            return mapping.pc_pipeline_id, mapping.pc_stage_id
-        return None, None
+        return pipeline_id or None, stage_id or None
 
     # -------------- CONTACT SYNC ----------------
 
-    def _sync_contact_to_pc(self):
-        base_url, headers = self._get_api_context()
-        partner = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
-        if not partner:
-            return
-
-        url = base_url + "/contact/addOrUpdateContact"
-
+    def _prepare_contact_payload(self, partner):
+        """Build the ``/contact/addOrUpdateContact`` body for a partner."""
         country = partner.country_id
-        
+
         # Get assignee ID
         assignee_id = self._get_assignee_id(partner.pc_assigned_user_id)
-        
+
         payload = {
             "data": {
                 "email": partner.email or "",
@@ -160,37 +874,48 @@ class PcSyncJob(models.Model):
                 "forceCreate": True,
             }
         }
-        
+
         # Add assignee if mapped
         if assignee_id:
             payload["data"]["assignedTo"] = assignee_id
+        return "/contact/addOrUpdateContact", payload
 
-        resp = requests.post(url, json=payload, headers=headers, timeout=20)
-        resp.raise_for_status()
-        data = resp.json() if resp.content else {}
+    def _sync_contact_to_pc(self):
+        base_url, headers = self._get_api_context()
+        partner = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
+        if not partner:
+            return
+
+        with profile_phase(self.env, "resolve"):
+            path, payload = self._prepare_contact_payload(partner)
+
+        with profile_phase(self.env, "push"):
+            data = self._send(base_url, headers, path, payload)
+        with profile_phase(self.env, "write_back"):
+            self._write_back_contact(partner, payload, data)
+
+    def _write_back_contact(self, partner, payload, data):
+        """Store the ProspectConnect id returned for a pushed contact."""
         pc_id = data.get("data", {}).get("id") or data.get("id")
         if pc_id:
-            partner.write(
+            partner.with_context(pc_skip_sync=True).write(
                 {
                     "pc_contact_id": pc_id,
+                    "pc_account_id": self._get_account().id,
                     "pc_last_sync_at": fields.Datetime.now(),
                 }
             )
 
     # -------------- DEAL SYNC ----------------
 
-    def _sync_deal_to_pc(self):
-        base_url, headers = self._get_api_context()
-        lead = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
-        if not lead:
-            return
-
+    def _prepare_deal_payload(self, lead):
+        """Build the create or update call for an opportunity."""
         # Get pipeline and stage mapping
         pipeline_id, stage_id = self._get_stage_mapping(lead.stage_id)
-        
+
         # Get assignee ID
         assignee_id = self._get_assignee_id(lead.user_id)
-        
+
         # Get contact ID if linked
         contact_id = None
         if lead.partner_id and lead.partner_id.pc_contact_id:
@@ -199,7 +924,7 @@ class PcSyncJob(models.Model):
         # Determine if update or create
         if lead.pc_deal_id:
             # Update existing deal
-            url = base_url + "/deal/updateDeal"
+            path = "/deal/updateDeal"
             payload = {
                 "dealId": lead.pc_deal_id,
                 "name": lead.name or "",
@@ -208,13 +933,14 @@ class PcSyncJob(models.Model):
             }
         else:
             # Create new deal
-            url = base_url + "/deal/addDeal"
+            path = "/deal/addDeal"
             payload = {
                 "name": lead.name or "",
                 "value": float(lead.expected_revenue or 0.0),
                 "status": "open",
+                "externalId": self._get_idempotency_key(lead),
             }
-        
+
         # Add optional fields
         if pipeline_id:
             payload["pipelineId"] = pipeline_id
@@ -226,36 +952,47 @@ class PcSyncJob(models.Model):
             payload["contactId"] = contact_id
         if lead.description:
             payload["notes"] = lead.description
+        return path, payload
 
-        resp = requests.post(url, json=payload, headers=headers, timeout=20)
-        resp.raise_for_status()
-        data = resp.json() if resp.content else {}
+    def _sync_deal_to_pc(self):
+        base_url, headers = self._get_api_context()
+        lead = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
+        if not lead:
+            return
+
+        with profile_phase(self.env, "resolve"):
+            path, payload = self._prepare_deal_payload(lead)
+
+        with profile_phase(self.env, "push"):
+            data = self._send(base_url, headers, path, payload)
+        with profile_phase(self.env, "write_back"):
+            self._write_back_deal(lead, payload, data)
+
+    def _write_back_deal(self, lead, payload, data):
+        """Store the ProspectConnect id and stage of a pushed opportunity."""
         pc_id = data.get("data", {}).get("id") or data.get("id") or lead.pc_deal_id
         if pc_id:
-            lead.write(
+            lead.with_context(pc_skip_sync=True).write(
                 {
                     "pc_deal_id": pc_id,
+                    "pc_account_id": self._get_account().id,
                     "pc_last_sync_at": fields.Datetime.now(),
-                    "pc_remote_pipeline_id": pipeline_id,
-                    "pc_remote_stage_id": stage_id,
+                    "pc_remote_pipeline_id": payload.get("pipelineId"),
+                    "pc_remote_stage_id": payload.get("stageId"),
                 }
             )
 
     # -------------- TASK SYNC ----------------
 
-    def _sync_task_to_pc(self):
-        base_url, headers = self._get_api_context()
-        activity = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
-        if not activity:
-            return
-
+    def _prepare_task_payload(self, activity):
+        """Build the create or update call for an activity."""
         # Get assignee ID
         assignee_id = self._get_assignee_id(activity.user_id)
-        
+
         # Get related contact/deal IDs
         contact_ids = []
         deal_ids = []
-        
+
         if activity.res_model == "res.partner" and activity.res_id:
             partner = self.env["res.partner"].browse(activity.res_id).exists()
             if partner and partner.pc_contact_id:
@@ -271,7 +1008,7 @@ class PcSyncJob(models.Model):
 
         if task_id:
             # Update existing task
-            url = base_url + "/task/updateTask"
+            path = "/task/updateTask"
             payload = {
                 "taskId": task_id,
                 "name": activity.summary or "Task",
@@ -281,7 +1018,7 @@ class PcSyncJob(models.Model):
             }
         else:
             # Create new task
-            url = base_url + "/task/createTask"
+            path = "/task/createTask"
             payload = {
                 "name": activity.summary or "Task",
                 "priority": "medium",
@@ -289,41 +1026,54 @@ class PcSyncJob(models.Model):
                 "tags": [],
                 "contact_ids": contact_ids,
                 "deal_ids": deal_ids,
+                "externalId": self._get_idempotency_key(activity),
             }
-        
+
         # Add due date
         if activity.date_deadline:
             payload["due_date"] = activity.date_deadline.isoformat()
             payload["due_time"] = activity.date_deadline.isoformat()
-        
+
         # Add assignee
         if assignee_id:
             payload["assignedTo"] = assignee_id
+        return path, payload
 
-        resp = requests.post(url, json=payload, headers=headers, timeout=20)
-        resp.raise_for_status()
-        data = resp.json() if resp.content else {}
+    def _sync_task_to_pc(self):
+        base_url, headers = self._get_api_context()
+        activity = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
+        if not activity:
+            return
+
+        with profile_phase(self.env, "resolve"):
+            path, payload = self._prepare_task_payload(activity)
+
+        with profile_phase(self.env, "push"):
+            data = self._send(base_url, headers, path, payload)
+        with profile_phase(self.env, "write_back"):
+            self._write_back_task(activity, payload, data)
+
+    def _write_back_task(self, activity, payload, data):
+        """Store the ProspectConnect id returned for a newly pushed task."""
         new_id = data.get("taskId") or data.get("data", {}).get("id") or data.get("id")
-        if new_id and not task_id:
-            activity.write(
+        if new_id and not activity.pc_task_id:
+            activity.with_context(pc_skip_sync=True).write(
                 {
                     "pc_task_id": new_id,
+                    "pc_account_id": self._get_account().id,
                     "pc_last_sync_at": fields.Datetime.now(),
                 }
             )
 
     # -------------- NOTE SYNC ----------------
 
-    def _sync_note_to_pc(self):
-        base_url, headers = self._get_api_context()
-        message = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
-        if not message or not message.pc_sync_enabled:
-            return
-
+    def _prepare_note_payload(self, message):
+        """Build the ``/note/createNote`` call, or ``(None, None)`` if the
+        note's contact or deal has no ProspectConnect id yet."""
         # Get related contact/deal ID
         contact_id = None
         deal_id = None
-        
+
         if message.model == "res.partner" and message.res_id:
             partner = self.env["res.partner"].browse(message.res_id).exists()
             if partner and partner.pc_contact_id:
@@ -334,29 +1084,89 @@ class PcSyncJob(models.Model):
                 deal_id = lead.pc_deal_id
 
         if not contact_id and not deal_id:
-            _logger.warning("Cannot sync note %s: no linked contact or deal", message.id)
-            return
+            return None, None
 
         # Create note (assuming notes are always created, not updated)
-        url = base_url + "/note/createNote"
         payload = {
             "body": message.body or "",
             "userId": message.author_id.id if message.author_id else None,
+            "externalId": self._get_idempotency_key(message),
         }
-        
+
         if contact_id:
             payload["contactId"] = contact_id
         if deal_id:
             payload["dealId"] = deal_id
+        return "/note/createNote", payload
 
-        resp = requests.post(url, json=payload, headers=headers, timeout=20)
-        resp.raise_for_status()
-        data = resp.json() if resp.content else {}
+    def _sync_note_to_pc(self):
+        base_url, headers = self._get_api_context()
+        message = self.env[self.odoo_model].browse(self.odoo_res_id).exists()
+        if not message or not message.pc_sync_enabled:
+            return
+
+        with profile_phase(self.env, "resolve"):
+            path, payload = self._prepare_note_payload(message)
+        if not path:
+            _logger.warning("Cannot sync note %s: no linked contact or deal", message.id)
+            return
+
+        with profile_phase(self.env, "push"):
+            data = self._send(base_url, headers, path, payload)
+        with profile_phase(self.env, "write_back"):
+            self._write_back_note(message, payload, data)
+
+    def _write_back_note(self, message, payload, data):
+        """Store the ProspectConnect id returned for a pushed note."""
         pc_id = data.get("data", {}).get("id") or data.get("id")
         if pc_id:
-            message.write(
+            message.with_context(pc_skip_sync=True).write(
                 {
                     "pc_note_id": pc_id,
+                    "pc_account_id": self._get_account().id,
                     "pc_last_sync_at": fields.Datetime.now(),
                 }
             )
+
+
+class PcSyncEvent(models.Model):
+    """Webhook event received, kept to drop redeliveries.
+
+    Events coalesced into a newer one of the same record keep their row, so
+    their id is still known once the job carries the newer event. Event ids
+    are unique per account.
+    """
+
+    _name = "pc.sync.event"
+    _description = "ProspectConnect Webhook Event"
+    _order = "id"
+
+    event_id = fields.Char(string="Webhook Event ID", required=True)
+    job_id = fields.Many2one("pc.sync.job", string="Job", ondelete="set null", index=True)
+    account_id = fields.Many2one("pc.account", string="Account", ondelete="cascade")
+
+    def init(self):
+        self.env.cr.execute(
+            "ALTER TABLE pc_sync_event DROP CONSTRAINT IF EXISTS pc_sync_event_pc_event_unique"
+        )
+        create_unique_index(
+            self.env.cr, "pc_sync_event_account_event_uniq", self._table,
+            ["COALESCE(account_id, 0)", "event_id"],
+        )
+        # Event ids used to be unique on the jobs: keep the ones received then
+        self.env.cr.execute(
+            "SELECT 1 FROM pg_constraint WHERE conname = 'pc_sync_job_pc_job_event_unique'"
+        )
+        if self.env.cr.fetchone():
+            self.env.cr.execute(
+                """
+                INSERT INTO pc_sync_event
+                    (event_id, job_id, account_id, create_uid, create_date, write_uid, write_date)
+                SELECT event_id, id, account_id, create_uid, create_date, write_uid, write_date
+                FROM pc_sync_job WHERE event_id IS NOT NULL
+                ON CONFLICT DO NOTHING
+                """
+            )
+            self.env.cr.execute(
+                "ALTER TABLE pc_sync_job DROP CONSTRAINT pc_sync_job_pc_job_event_unique"
+            )
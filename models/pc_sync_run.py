@@ -0,0 +1,333 @@
+# prospectconnect_sync/models/pc_sync_run.py
+import base64
+import cProfile
+import io
+import json
+import logging
+import marshal
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from odoo import api, fields, models
+
+from ..tools import PcTape, current_tape, use_tape
+
+_logger = logging.getLogger(__name__)
+
+PHASES = ["fetch", "resolve", "apply", "push", "write_back"]
+
+
+class SyncProfiler:
+    """Accumulates wall time and SQL statistics per sync phase.
+
+    Phases may nest (e.g. a lookup inside an apply); time spent in a nested
+    phase is only counted for the innermost one, so the phase totals add up
+    to the profiled wall time.
+    """
+
+    def __init__(self, cr):
+        self.cr = cr
+        self.started = time.perf_counter()
+        self.phases = {}
+        # endpoint path -> [calls, bytes sent, bytes received, JSON decode time]
+        self.wire = {}
+        self._stack = []
+        thread = threading.current_thread()
+        # Odoo cursors bump these counters on every query when they exist
+        # (the HTTP layer sets them per request, cron threads do not).
+        if not hasattr(thread, "query_count"):
+            thread.query_count = 0
+            thread.query_time = 0.0
+        self.sql_count_start, self.sql_time_start = self._sql_counters()
+
+    def _sql_counters(self):
+        thread = threading.current_thread()
+        return (
+            getattr(thread, "query_count", self.cr.sql_log_count),
+            getattr(thread, "query_time", 0.0),
+        )
+
+    def _snapshot(self):
+        count, sql_time = self._sql_counters()
+        return time.perf_counter(), count, sql_time
+
+    @contextmanager
+    def phase(self, name):
+        start = self._snapshot()
+        self._stack.append([0.0, 0, 0.0])
+        try:
+            yield
+        finally:
+            child_wall, child_count, child_time = self._stack.pop()
+            end = self._snapshot()
+            wall = end[0] - start[0]
+            count = end[1] - start[1]
+            sql_time = end[2] - start[2]
+            stats = self.phases.setdefault(name, [0, 0.0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += wall - child_wall
+            stats[2] += count - child_count
+            stats[3] += sql_time - child_time
+            if self._stack:
+                parent = self._stack[-1]
+                parent[0] += wall
+                parent[1] += count
+                parent[2] += sql_time
+
+    def totals(self):
+        count, sql_time = self._sql_counters()
+        return (
+            time.perf_counter() - self.started,
+            count - self.sql_count_start,
+            sql_time - self.sql_time_start,
+        )
+
+
+def profile_phase(env, name):
+    """Context manager timing a sync phase when the run is being profiled."""
+    profiler = env.context.get("pc_profiler")
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
+
+
+def wire_stats(env):
+    """Dict collecting bytes on the wire per endpoint when the run is being
+    profiled, ``None`` otherwise (see ``tools.pc_codec.record_wire``)."""
+    profiler = env.context.get("pc_profiler")
+    return profiler.wire if profiler is not None else None
+
+
+@contextmanager
+def http_tape(env):
+    """Record or replay the API calls of a sync entry point.
+
+    Switched on with the ``prospectconnect_sync.tape_mode`` parameter
+    (``record`` or ``replay``) and ``prospectconnect_sync.tape_path``; a
+    no-op otherwise, and inside an entry point already using a tape.
+    """
+    if current_tape() is not None:
+        yield None
+        return
+    icp = env["ir.config_parameter"].sudo()
+    mode = icp.get_param("prospectconnect_sync.tape_mode")
+    if mode not in ("record", "replay"):
+        yield None
+        return
+    filename = icp.get_param("prospectconnect_sync.tape_path")
+    if not filename:
+        _logger.warning("ProspectConnect tape mode %s ignored: no tape file configured", mode)
+        yield None
+        return
+    timing = icp.get_param("prospectconnect_sync.tape_timing", "original")
+    with PcTape(filename, mode, timing) as tape, use_tape(tape):
+        _logger.info("ProspectConnect API calls %s %s", "replayed from" if tape.replaying else "recorded to", filename)
+        yield tape
+
+
+class PcSyncRun(models.Model):
+    _name = "pc.sync.run"
+    _description = "ProspectConnect Sync Run Log"
+    _order = "started_at desc, id desc"
+
+    name = fields.Char(required=True)
+    entrypoint = fields.Char(string="Entry Point")
+    profile_mode = fields.Selection(
+        [
+            ("timing", "Timing and SQL only"),
+            ("cprofile", "Timing + cProfile"),
+            ("odoo", "Timing + Odoo profiler"),
+        ],
+        default="timing",
+    )
+    started_at = fields.Datetime(string="Started At")
+    duration = fields.Float(string="Wall Time (s)", digits=(16, 3))
+    sql_count = fields.Integer(string="SQL Queries")
+    sql_time = fields.Float(string="SQL Time (s)", digits=(16, 3))
+    phase_ids = fields.One2many("pc.sync.run.phase", "run_id", string="Phases")
+    bytes_sent = fields.Integer(string="Bytes Sent")
+    bytes_received = fields.Integer(string="Bytes Received")
+    endpoint_ids = fields.One2many("pc.sync.run.endpoint", "run_id", string="Endpoints")
+    error_message = fields.Text()
+
+    report_file = fields.Binary(string="Report", attachment=True)
+    report_filename = fields.Char()
+    profile_file = fields.Binary(string="cProfile Stats", attachment=True)
+    profile_filename = fields.Char()
+    profile_text = fields.Text(string="cProfile Summary")
+    odoo_profile_id = fields.Many2one("ir.profile", string="Odoo Profile", ondelete="set null")
+
+    # ------------- ENTRYPOINT WRAPPER -------------
+
+    @api.model
+    def _profiling_requested(self):
+        """True when the current call should be profiled.
+
+        Profiling is requested either per call (``pc_profile`` in context, used
+        by the 'Sync Now (Profiled)' button) or for the next cron run through
+        the ``prospectconnect_sync.profile_next_run`` parameter, so it can be
+        switched on without restarting the server.
+        """
+        if "pc_profiler" in self.env.context:
+            return False
+        if self.env.context.get("pc_profile"):
+            return True
+        icp = self.env["ir.config_parameter"].sudo()
+        return icp.get_param("prospectconnect_sync.profile_next_run") == "True"
+
+    @api.model
+    def _run_profiled(self, records, method_name, *args):
+        """Call ``records.<method_name>(*args)`` under a profiler and log the run."""
+        icp = self.env["ir.config_parameter"].sudo()
+        mode = self.env.context.get("pc_profile")
+        if mode not in ("timing", "cprofile", "odoo"):
+            mode = icp.get_param("prospectconnect_sync.profile_mode", "timing")
+        # One-shot: consume the flag before running so a crash does not leave
+        # every subsequent cron run profiled.
+        if icp.get_param("prospectconnect_sync.profile_next_run") == "True":
+            icp.set_param("prospectconnect_sync.profile_next_run", "False")
+
+        profiler = SyncProfiler(self.env.cr)
+        started_at = fields.Datetime.now()
+        cprof = cProfile.Profile() if mode == "cprofile" else None
+        odoo_profiler = None
+        if mode == "odoo":
+            try:
+                from odoo.tools.profiler import Profiler
+
+                odoo_profiler = Profiler(
+                    db=self.env.cr.dbname,
+                    description="ProspectConnect %s" % method_name,
+                )
+            except Exception:  # pragma: no cover
+                _logger.warning("Odoo profiler unavailable, falling back to timing only")
+
+        error = False
+        result = None
+        profiled = records.with_context(pc_profiler=profiler)
+        try:
+            with odoo_profiler if odoo_profiler is not None else nullcontext():
+                if cprof:
+                    cprof.enable()
+                try:
+                    result = getattr(profiled, method_name)(*args)
+                finally:
+                    if cprof:
+                        cprof.disable()
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self._log_run(method_name, mode, started_at, profiler, cprof, odoo_profiler, error)
+        return result
+
+    @api.model
+    def _log_run(self, method_name, mode, started_at, profiler, cprof, odoo_profiler, error):
+        duration, sql_count, sql_time = profiler.totals()
+        phases = [
+            {
+                "name": name,
+                "calls": stats[0],
+                "duration": stats[1],
+                "sql_count": stats[2],
+                "sql_time": stats[3],
+            }
+            for name, stats in sorted(
+                profiler.phases.items(),
+                key=lambda item: PHASES.index(item[0]) if item[0] in PHASES else len(PHASES),
+            )
+        ]
+        other = {
+            "name": "other",
+            "calls": 1,
+            "duration": max(duration - sum(p["duration"] for p in phases), 0.0),
+            "sql_count": max(sql_count - sum(p["sql_count"] for p in phases), 0),
+            "sql_time": max(sql_time - sum(p["sql_time"] for p in phases), 0.0),
+        }
+        phases.append(other)
+
+        endpoints = [
+            {
+                "path": path,
+                "calls": stats[0],
+                "bytes_sent": stats[1],
+                "bytes_received": stats[2],
+                "decode_time": stats[3],
+            }
+            for path, stats in sorted(profiler.wire.items())
+        ]
+
+        stamp = fields.Datetime.to_string(started_at).replace(" ", "_").replace(":", "")
+        report = {
+            "entrypoint": method_name,
+            "started_at": fields.Datetime.to_string(started_at),
+            "duration": duration,
+            "sql_count": sql_count,
+            "sql_time": sql_time,
+            "phases": phases,
+            "wire": endpoints,
+            "error": error or None,
+        }
+        vals = {
+            "name": "%s @ %s" % (method_name, fields.Datetime.to_string(started_at)),
+            "entrypoint": method_name,
+            "profile_mode": mode,
+            "started_at": started_at,
+            "duration": duration,
+            "sql_count": sql_count,
+            "sql_time": sql_time,
+            "error_message": error,
+            "phase_ids": [(0, 0, phase) for phase in phases],
+            "bytes_sent": sum(e["bytes_sent"] for e in endpoints),
+            "bytes_received": sum(e["bytes_received"] for e in endpoints),
+            "endpoint_ids": [(0, 0, endpoint) for endpoint in endpoints],
+            "report_file": base64.b64encode(json.dumps(report, indent=2).encode()),
+            "report_filename": "pc_sync_run_%s.json" % stamp,
+        }
+        if cprof:
+            stream = io.StringIO()
+            pstats.Stats(cprof, stream=stream).sort_stats("cumulative").print_stats(60)
+            vals["profile_text"] = stream.getvalue()
+            # marshal'ed pstats, loadable with pstats/snakeviz once downloaded
+            cprof.create_stats()
+            vals["profile_file"] = base64.b64encode(marshal.dumps(cprof.stats))
+            vals["profile_filename"] = "pc_sync_run_%s.prof" % stamp
+        if odoo_profiler is not None and getattr(odoo_profiler, "profile_id", None):
+            vals["odoo_profile_id"] = odoo_profiler.profile_id
+        # Logged through its own cursor so the run log survives a rolled back sync.
+        with self.env.registry.cursor() as cr:
+            run = self.env(cr=cr)["pc.sync.run"].sudo().create(vals)
+            run_id = run.id
+        _logger.info(
+            "ProspectConnect profiled %s: %.2fs, %s queries (%.2fs SQL) -> run log %s",
+            method_name, duration, sql_count, sql_time, run_id,
+        )
+        return self.browse(run_id)
+
+
+class PcSyncRunPhase(models.Model):
+    _name = "pc.sync.run.phase"
+    _description = "ProspectConnect Sync Run Phase"
+    _order = "id"
+
+    run_id = fields.Many2one("pc.sync.run", required=True, ondelete="cascade")
+    name = fields.Char(string="Phase", required=True)
+    calls = fields.Integer()
+    duration = fields.Float(string="Wall Time (s)", digits=(16, 3))
+    sql_count = fields.Integer(string="SQL Queries")
+    sql_time = fields.Float(string="SQL Time (s)", digits=(16, 3))
+
+
+class PcSyncRunEndpoint(models.Model):
+    _name = "pc.sync.run.endpoint"
+    _description = "ProspectConnect Sync Run Endpoint Traffic"
+    _order = "bytes_received desc, id"
+
+    run_id = fields.Many2one("pc.sync.run", required=True, ondelete="cascade")
+    path = fields.Char(string="Endpoint", required=True)
+    calls = fields.Integer()
+    bytes_sent = fields.Integer(string="Bytes Sent")
+    bytes_received = fields.Integer(string="Bytes Received")
+    decode_time = fields.Float(string="JSON Decode (s)", digits=(16, 3))
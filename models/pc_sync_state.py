@@ -3,6 +3,12 @@ import logging
 from datetime import datetime, timedelta
 
 from odoo import api, fields, models
+from odoo.tools.sql import create_unique_index
+
+from ..tools import decode_response, post_json
+from .pc_sync_breaker import CircuitOpen
+from .pc_sync_run import http_tape, profile_phase, wire_stats
+from .res_partner import pc_email_key, pc_phone_key
 
 _logger = logging.getLogger(__name__)
 
@@ -12,6 +18,38 @@ except Exception:  # pragma: no cover
     requests = None
 
 
+# Transaction-level advisory lock serializing tag creation across workers
+TAG_LOCK_KEY = 0x50430001
+
+# Tag name -> id per database, shared across pages and runs. Ids are
+# re-validated on every use, so deleted tags are simply looked up again.
+_TAG_CACHE = {}
+_TAG_CACHE_MAX = 10000
+
+# object type -> (list endpoint, fallback key of the records in the response)
+PULL_ENDPOINTS = {
+    "contact": ("/contact/getPaginatedContacts", "contacts"),
+    "deal": ("/deal/getDealsByBusinessId", "deals"),
+    "task": ("/task/getTasksByBusinessId", "tasks"),
+    "note": ("/note/getAllNotes", "notes"),
+}
+
+# sync unit -> scheduled action running it; each unit has its own interval
+# so a slow pull never delays pushes or the pulls of other object types
+SYNC_CRONS = {
+    "push": "prospectconnect_sync.ir_cron_pc_push",
+    "contact": "prospectconnect_sync.ir_cron_pc_pull_contacts",
+    "deal": "prospectconnect_sync.ir_cron_pc_pull_deals",
+    "task": "prospectconnect_sync.ir_cron_pc_pull_tasks",
+    "note": "prospectconnect_sync.ir_cron_pc_pull_notes",
+    "mapping": "prospectconnect_sync.ir_cron_pc_refresh_mappings",
+}
+# Units not following the general polling interval by default, in minutes
+SYNC_DEFAULT_INTERVALS = {
+    "mapping": 60,
+}
+
+
 class PcSyncState(models.Model):
     _name = "pc.sync.state"
     _description = "ProspectConnect Sync State"
@@ -25,12 +63,19 @@ class PcSyncState(models.Model):
         ],
         required=True,
     )
+    account_id = fields.Many2one(
+        "pc.account", string="Account", ondelete="cascade", help="Empty for the default account (Settings)."
+    )
     last_pull_at = fields.Datetime(string="Last Pull At")
     last_push_at = fields.Datetime(string="Last Push At")
 
-    _sql_constraints = [
-        ("pc_state_unique", "unique(object_type)", "Only one state per object type."),
-    ]
+    def init(self):
+        # One state per object type and account, the default account included
+        self.env.cr.execute("ALTER TABLE pc_sync_state DROP CONSTRAINT IF EXISTS pc_sync_state_pc_state_unique")
+        create_unique_index(
+            self.env.cr, "pc_sync_state_account_type_uniq", self._table,
+            ["COALESCE(account_id, 0)", "object_type"],
+        )
 
     # ------------- CRON / SERVER ACTION ENTRYPOINTS -------------
 
@@ -39,28 +84,49 @@ class PcSyncState(models.Model):
         """Called by cron + 'Sync Now' button.
         
         Processes pending push jobs and pulls updates from ProspectConnect.
+        When profiling is requested the run is timed per phase and logged to
+        a ``pc.sync.run`` record.
         """
+        SyncRun = self.env["pc.sync.run"]
+        if SyncRun._profiling_requested():
+            return SyncRun._run_profiled(self, "run_incremental_sync")
+
         _logger.info("ProspectConnect incremental sync started.")
         
-        # Process pending push jobs first
-        self.env["pc.sync.job"].process_pending_jobs()
-        
-        # Pull updates from ProspectConnect
-        config = self.env["ir.config_parameter"].sudo()
-        direction = config.get_param("prospectconnect_sync.sync_direction", "bidirectional")
-        
-        if direction in ("pc_to_odoo", "bidirectional"):
-            if config.get_param("prospectconnect_sync.sync_contacts") == "True":
-                self._pull_contacts()
-            if config.get_param("prospectconnect_sync.sync_deals") == "True":
-                self._pull_deals()
-            if config.get_param("prospectconnect_sync.sync_tasks") == "True":
-                self._pull_tasks()
-            if config.get_param("prospectconnect_sync.sync_notes") == "True":
-                self._pull_notes()
+        with http_tape(self.env):
+            # Process pending push jobs first
+            self.env["pc.sync.job"].process_pending_jobs()
+
+            # Pull updates from ProspectConnect, accounts in parallel
+            pulled = False
+            for object_type in PULL_ENDPOINTS:
+                if self._pull_enabled(object_type):
+                    self.env["pc.account"]._run_per_account(self, "_pull_%ss" % object_type)
+                    pulled = True
+
+        if pulled:
+            # Apply what was fetched in a separate worker
+            self.env["pc.sync.inbound"]._trigger_apply()
         
         _logger.info("ProspectConnect incremental sync finished.")
 
+    @api.model
+    def run_pull(self, object_type):
+        """Called by the pull cron of one object type.
+
+        Each object type has its own scheduled action, so pulls of different
+        types (and pushes) run independently on the available cron workers.
+        """
+        SyncRun = self.env["pc.sync.run"]
+        if SyncRun._profiling_requested():
+            return SyncRun._run_profiled(self, "run_pull", object_type)
+
+        if not self._pull_enabled(object_type):
+            return
+        with http_tape(self.env):
+            self.env["pc.account"]._run_per_account(self, "_pull_%ss" % object_type)
+        self.env["pc.sync.inbound"]._trigger_apply()
+
     @api.model
     def run_nightly_reconciliation(self):
         """Nightly deeper reconciliation job (2 AM)."""
@@ -71,8 +137,7 @@ class PcSyncState(models.Model):
         
         # Temporarily override last_pull_at to get last 7 days
         for obj_type in ["contact", "deal", "task", "note"]:
-            state = self.search([("object_type", "=", obj_type)], limit=1)
-            if state:
+            for state in self.search([("object_type", "=", obj_type)]):
                 # Save current timestamp
                 original_timestamp = state.last_pull_at
                 # Set to 7 days ago
@@ -85,94 +150,358 @@ class PcSyncState(models.Model):
 
     # ------------- HELPER METHODS -------------
 
-    def _get_api_context(self):
-        """Get API configuration."""
-        icp = self.env["ir.config_parameter"].sudo()
-        api_key = icp.get_param("prospectconnect_sync.api_key")
-        base_url = icp.get_param(
-            "prospectconnect_sync.base_url", "https://api.prospectconnect.ai"
+    @api.model
+    def _pull_enabled(self, object_type):
+        config = self.env["ir.config_parameter"].sudo()
+        direction = config.get_param("prospectconnect_sync.sync_direction", "bidirectional")
+        return (
+            direction in ("pc_to_odoo", "bidirectional")
+            and config.get_param("prospectconnect_sync.sync_%ss" % object_type) == "True"
+        )
+
+    @api.model
+    def _get_sync_interval(self, unit):
+        """Minutes between two runs of a sync unit ("push" or an object type).
+
+        Falls back to the general polling interval when the unit has none.
+        """
+        config = self.env["ir.config_parameter"].sudo()
+        default = SYNC_DEFAULT_INTERVALS.get(unit) or int(
+            config.get_param("prospectconnect_sync.poll_interval_minutes", 5) or 5
         )
+        return max(1, int(config.get_param("prospectconnect_sync.poll_interval_%s" % unit, 0) or default))
+
+    @api.model
+    def _apply_sync_intervals(self):
+        """Reschedule the sync crons from the interval settings."""
+        for unit, xmlid in SYNC_CRONS.items():
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if not cron:
+                continue
+            minutes = self._get_sync_interval(unit)
+            if cron.interval_number != minutes or cron.interval_type != "minutes":
+                cron.sudo().write({"interval_number": minutes, "interval_type": "minutes"})
+
+    def _get_api_context(self):
+        """Get API configuration of the account in context."""
+        api_key, base_url = self.env["pc.account"]._from_context()._get_credentials()
         if not api_key or not base_url:
             _logger.warning("ProspectConnect API not configured, skipping pull")
             return None, None
         if not requests:
             _logger.error("Python 'requests' library is not available")
             return None, None
-        headers = {
-            "Accept": "application/json",
-            "Authorization": api_key,
-            "Content-Type": "application/json",
-        }
-        return base_url.rstrip("/"), headers
-
-    def _find_odoo_user_by_pc_id(self, pc_user_id):
-        """Find Odoo user by ProspectConnect user ID."""
-        if not pc_user_id:
-            return None
-        mapping = self.env["pc.user.mapping"].search(
-            [("pc_user_id", "=", pc_user_id)], limit=1
+        # Same headers as pushes (compression included)
+        return self.env["pc.sync.job"]._get_api_context()
+
+    def _account_id(self):
+        """Id of the account in context, ``False`` for the default one."""
+        return self.env.context.get("pc_account_id") or False
+
+    def _map_pc_ids(self, model, field_name, pc_ids):
+        """Map ProspectConnect ids of the account in context to Odoo ids of
+        ``model`` in one query."""
+        pc_ids = [pc_id for pc_id in pc_ids if pc_id]
+        if not pc_ids:
+            return {}
+        records = self.env[model].search_fetch(
+            [(field_name, "in", pc_ids), ("pc_account_id", "=", self._account_id())], [field_name]
         )
-        return mapping.odoo_user_id if mapping else None
-
-    def _find_odoo_stage_by_pc_ids(self, pc_pipeline_id, pc_stage_id):
-        """Find Odoo stage by ProspectConnect pipeline and stage IDs."""
-        if not pc_stage_id:
-            return None
-        mapping = self.env["pc.pipeline.mapping"].search(
-            [("pc_stage_id", "=", pc_stage_id)], limit=1
+        return {record[field_name]: record.id for record in records}
+
+    def _match_external_ids(self, model, field_name, payloads):
+        """Find the not yet linked records of ``model`` that created the
+        remote records in ``payloads``.
+
+        Records pushed by Odoo carry the idempotency key of their creation as
+        ``externalId``; when the answer of the create was lost, the pull links
+        the record instead of importing it a second time.
+
+        :return: dict pc id -> record
+        """
+        Job = self.env["pc.sync.job"]
+        res_ids = {}
+        for data in payloads:
+            pc_id = data.get("id") or data.get("taskId")
+            key_model, res_id = Job._parse_idempotency_key(data.get("externalId"))
+            if pc_id and key_model == model:
+                res_ids[pc_id] = res_id
+        if not res_ids:
+            return {}
+        records = self.env[model].with_context(active_test=False).search_fetch(
+            [("id", "in", list(res_ids.values())), (field_name, "=", False)], [field_name]
         )
-        return mapping.odoo_stage_id if mapping else None
+        by_id = {record.id: record for record in records}
+        return {pc_id: by_id[res_id] for pc_id, res_id in res_ids.items() if res_id in by_id}
+
+    def _map_pc_users(self, pc_user_ids):
+        """Map ProspectConnect user ids to Odoo user ids (cached)."""
+        user_map = self.env["pc.user.mapping"]._get_user_map(self._account_id())[0]
+        return {
+            pc_user_id: user_map[pc_user_id]
+            for pc_user_id in pc_user_ids
+            if pc_user_id in user_map
+        }
 
-    # ------------- PULL CONTACTS -------------
+    @api.model
+    def _apply_batch(self, object_type, payloads):
+        """Apply ProspectConnect payloads of one object type to Odoo.
 
-    def _pull_contacts(self):
-        """Pull updated contacts from ProspectConnect."""
+        Shared by the pull methods and the webhook jobs. Records written here
+        are not queued for push again.
+        """
+        records = self.with_context(pc_skip_sync=True)
+        batch_apply = getattr(records, "_apply_%s_batch" % object_type, None)
+        with profile_phase(self.env, "apply"):
+            if batch_apply:
+                batch_apply(payloads)
+                return
+            upsert = getattr(records, "_upsert_%s_from_pc" % object_type)
+            for payload in payloads:
+                upsert(payload)
+
+    def _resolve_tag_ids(self, names):
+        """Map tag names to ``res.partner.category`` ids, creating missing ones.
+
+        Cached and unknown names are checked in a single query; missing tags
+        are created in one batch while holding an advisory lock, after a
+        re-check, so concurrent pulls never create the same tag twice.
+
+        :return: dict name -> id
+        """
+        names = {name for name in names if name}
+        if not names:
+            return {}
+        Tag = self.env["res.partner.category"].with_context(active_test=False)
+        cache = _TAG_CACHE.setdefault(self.env.cr.dbname, {})
+        if len(cache) > _TAG_CACHE_MAX:
+            cache.clear()
+
+        with profile_phase(self.env, "resolve"):
+            cached_ids = {cache[name] for name in names if name in cache}
+            unknown = [name for name in names if name not in cache]
+            domain = [("name", "in", unknown)] if unknown else []
+            if cached_ids:
+                id_domain = [("id", "in", list(cached_ids))]
+                domain = ["|"] + id_domain + domain if domain else id_domain
+            found = Tag.search_fetch(domain, ["name"])
+            valid_ids = set(found.ids)
+            result = {}
+            for name in names:
+                if cache.get(name) in valid_ids:
+                    result[name] = cache[name]
+            for tag in found:
+                if tag.name in names:
+                    result.setdefault(tag.name, tag.id)
+
+            missing = names - result.keys()
+            if missing:
+                self.env.cr.execute("SELECT pg_advisory_xact_lock(%s)", (TAG_LOCK_KEY,))
+                # Tags committed by a concurrent pull while we waited
+                for tag in Tag.search_fetch([("name", "in", list(missing))], ["name"]):
+                    result.setdefault(tag.name, tag.id)
+                missing = sorted(names - result.keys())
+                if missing:
+                    for tag in Tag.create([{"name": name} for name in missing]):
+                        result[tag.name] = tag.id
+
+        cache.update(result)
+        return result
+
+    def _get_state(self, object_type):
+        """State of ``object_type`` for the account in context."""
+        account_id = self._account_id()
+        state = self.search([("object_type", "=", object_type), ("account_id", "=", account_id)], limit=1)
+        if not state:
+            state = self.create({"object_type": object_type, "account_id": account_id})
+        return state
+
+    # ------------- FETCH (PC → STAGING) -------------
+
+    def _pull_object(self, object_type):
+        """Fetch one window of updated records and stage them for apply.
+
+        Fetching only writes to ``pc.sync.inbound``; the records are applied
+        by the staging queue worker, so a slow or failing apply neither holds
+        the HTTP response nor loses the fetched page.
+
+        :return: number of records fetched
+        """
         base_url, headers = self._get_api_context()
         if not base_url:
-            return
+            return 0
 
-        state = self.search([("object_type", "=", "contact")], limit=1)
-        if not state:
-            state = self.create({"object_type": "contact"})
+        state = self._get_state(object_type)
 
         # Get timestamp for incremental pull
         since = state.last_pull_at or (datetime.now() - timedelta(days=30))
-        
-        url = base_url + "/contact/getPaginatedContacts"
+
+        path, key = PULL_ENDPOINTS[object_type]
         payload = {
             "updatedAfter": since.isoformat(),
             "limit": 100,
         }
 
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            contacts = data.get("data", []) or data.get("contacts", [])
-            
-            _logger.info(f"Pulled {len(contacts)} contacts from ProspectConnect")
-            
-            for contact_data in contacts:
-                self._upsert_contact_from_pc(contact_data)
-            
-            # Update last pull timestamp
-            state.last_pull_at = datetime.now()
-            
-        except Exception as e:
-            _logger.exception("Error pulling contacts from ProspectConnect")
+            with profile_phase(self.env, "fetch"), self.env["pc.sync.breaker"]._guard(object_type):
+                stats = wire_stats(self.env)
+                resp = post_json(base_url + path, payload, headers, timeout=30, stats=stats)
+                resp.raise_for_status()
+                data = decode_response(resp, stats)
+        except CircuitOpen as e:
+            _logger.info("%s", e)
+            return 0
+        except Exception:
+            _logger.exception("Error pulling %ss from ProspectConnect", object_type)
+            return 0
+
+        records = data.get("data", []) or data.get(key, [])
+        _logger.info("Pulled %s %ss from ProspectConnect", len(records), object_type)
+
+        with profile_phase(self.env, "fetch"):
+            self.env["pc.sync.inbound"]._stage(object_type, records)
+
+        # Update last pull timestamp
+        state.last_pull_at = datetime.now()
+        return len(records)
 
-    def _upsert_contact_from_pc(self, contact_data):
-        """Create or update Odoo contact from ProspectConnect data."""
-        pc_id = contact_data.get("id")
-        if not pc_id:
-            return
+    # ------------- PULL CONTACTS -------------
 
-        # Find existing contact
-        partner = self.env["res.partner"].search(
-            [("pc_contact_id", "=", pc_id)], limit=1
-        )
+    def _pull_contacts(self):
+        """Fetch updated contacts from ProspectConnect into the staging queue."""
+        return self._pull_object("contact")
 
-        # Prepare values
+    def _apply_contact_batch(self, payloads):
+        """Apply a page of contacts.
+
+        Partners, tags, countries and states of the whole page are resolved
+        at once and new partners are inserted with a single ``create``; only
+        existing partners are written one by one, each with its own values.
+        """
+        # A contact listed twice (e.g. two webhook events) is applied once,
+        # with its latest version
+        payloads = list({
+            contact_data["id"]: contact_data for contact_data in payloads if contact_data.get("id")
+        }.values())
+        if not payloads:
+            return
+        partners_by_pc_id = self._match_contact_partners(payloads)
+        tag_ids_by_name = self._resolve_tag_ids(
+            tag_name for contact_data in payloads for tag_name in contact_data.get("tags") or []
+        )
+        country_ids, state_ids = self._resolve_countries(payloads)
+        user_ids = self._map_pc_users({contact_data.get("assignedTo") for contact_data in payloads})
+
+        now = datetime.now()
+        vals_list = []
+        for contact_data in payloads:
+            vals = self._prepare_contact_vals(contact_data, tag_ids_by_name, country_ids, state_ids, user_ids)
+            vals["pc_last_remote_update"] = now
+            partner = partners_by_pc_id.get(contact_data["id"])
+            if partner:
+                # TODO: Add conflict resolution based on timestamps
+                partner.write(vals)
+                _logger.debug(f"Updated contact {partner.id} from ProspectConnect")
+            else:
+                vals_list.append(vals)
+        if vals_list:
+            partners = self.env["res.partner"].create(vals_list)
+            _logger.debug(f"Created contacts {partners.ids} from ProspectConnect")
+
+    def _get_country_code(self, contact_data):
+        """Country code of a ProspectConnect contact, ``None`` if it has none."""
+        country = contact_data.get("country")
+        return country.get("country_code") if isinstance(country, dict) else None
+
+    def _resolve_countries(self, payloads):
+        """Map the country codes and state names of a page of contacts to
+        Odoo ids, with one query each.
+
+        :return: tuple (dict country code -> id,
+                        dict (country id, lowercase state name) -> id)
+        """
+        codes = {self._get_country_code(contact_data) for contact_data in payloads} - {None}
+        if not codes:
+            return {}, {}
+        with profile_phase(self.env, "resolve"):
+            country_ids = {
+                country.code: country.id
+                for country in self.env["res.country"].search_fetch([("code", "in", list(codes))], ["code"])
+            }
+            state_ids = {}
+            if country_ids and any(contact_data.get("state") for contact_data in payloads):
+                for state in self.env["res.country.state"].search_fetch(
+                    [("country_id", "in", list(country_ids.values()))], ["name", "country_id"]
+                ):
+                    state_ids.setdefault((state.country_id.id, state.name.lower()), state.id)
+        return country_ids, state_ids
+
+    def _match_contact_partners(self, payloads):
+        """Find the Odoo partner of each contact in a page.
+
+        Partners already linked by ``pc_contact_id`` to the account in
+        context are found in one query.
+        Contacts without one are matched in a second query on the indexed
+        normalized email, then phone, against partners that are not linked to
+        ProspectConnect yet, so a first sync links existing partners instead
+        of duplicating them. Only partners of the account's company, or
+        without company, are candidates.
+
+        :return: dict pc id -> res.partner
+        """
+        Partner = self.env["res.partner"]
+        pc_ids = [contact_data["id"] for contact_data in payloads if contact_data.get("id")]
+        if not pc_ids:
+            return {}
+        with profile_phase(self.env, "resolve"):
+            linked = Partner.search_fetch(
+                [("pc_contact_id", "in", pc_ids), ("pc_account_id", "=", self._account_id())],
+                ["pc_contact_id"],
+            )
+            partners_by_pc_id = {partner.pc_contact_id: partner for partner in linked}
+
+            keys = {}
+            for contact_data in payloads:
+                pc_id = contact_data.get("id")
+                if not pc_id or pc_id in partners_by_pc_id:
+                    continue
+                keys[pc_id] = (
+                    pc_email_key(contact_data.get("email")),
+                    pc_phone_key(contact_data.get("phone"), self._get_country_code(contact_data)),
+                )
+            emails = {email for email, _phone in keys.values() if email}
+            phones = {phone for _email, phone in keys.values() if phone}
+            if not emails and not phones:
+                return partners_by_pc_id
+
+            domain = [("pc_email_key", "in", list(emails))] if emails else []
+            if phones:
+                domain = (["|"] + domain if domain else []) + [("pc_phone_key", "in", list(phones))]
+            account = self.env["pc.account"]._from_context()
+            candidates = Partner.search_fetch(
+                [("pc_contact_id", "=", False)] + account._company_domain(shared=True) + domain,
+                ["pc_email_key", "pc_phone_key"],
+                order="id",
+            )
+
+        by_email, by_phone = {}, {}
+        for partner in candidates:
+            if partner.pc_email_key:
+                by_email.setdefault(partner.pc_email_key, partner)
+            if partner.pc_phone_key:
+                by_phone.setdefault(partner.pc_phone_key, partner)
+        used = set()
+        for pc_id, (email, phone) in keys.items():
+            partner = by_email.get(email) or by_phone.get(phone)
+            # Link each partner to a single remote contact
+            if partner and partner.id not in used:
+                used.add(partner.id)
+                partners_by_pc_id[pc_id] = partner
+        return partners_by_pc_id
+
+    def _prepare_contact_vals(self, contact_data, tag_ids_by_name, country_ids, state_ids, user_ids):
+        """Odoo partner values of a ProspectConnect contact, from the ids
+        resolved for its page."""
         vals = {
             "name": contact_data.get("name") or contact_data.get("firstName", "") + " " + contact_data.get("lastName", ""),
             "email": contact_data.get("email"),
@@ -180,318 +509,352 @@ class PcSyncState(models.Model):
             "street": contact_data.get("address1"),
             "city": contact_data.get("city"),
             "zip": contact_data.get("postalCode"),
-            "pc_contact_id": pc_id,
-            "pc_last_remote_update": datetime.now(),
+            "pc_contact_id": contact_data["id"],
+            "pc_account_id": self._account_id(),
             "pc_lead_source": contact_data.get("source"),
         }
 
-        # Map country
-        country_code = contact_data.get("country", {}).get("country_code") if isinstance(contact_data.get("country"), dict) else None
-        if country_code:
-            country = self.env["res.country"].search([("code", "=", country_code)], limit=1)
-            if country:
-                vals["country_id"] = country.id
-
-        # Map state
-        state_name = contact_data.get("state")
-        if state_name and vals.get("country_id"):
-            state = self.env["res.country.state"].search([
-                ("name", "=ilike", state_name),
-                ("country_id", "=", vals["country_id"])
-            ], limit=1)
-            if state:
-                vals["state_id"] = state.id
+        # Map country and state
+        country_id = country_ids.get(self._get_country_code(contact_data))
+        if country_id:
+            vals["country_id"] = country_id
+            state_name = contact_data.get("state")
+            if state_name and state_ids.get((country_id, state_name.lower())):
+                vals["state_id"] = state_ids[(country_id, state_name.lower())]
 
         # Map assignee
         pc_assignee_id = contact_data.get("assignedTo")
         if pc_assignee_id:
             vals["pc_remote_assignee_id"] = pc_assignee_id
-            odoo_user = self._find_odoo_user_by_pc_id(pc_assignee_id)
-            if odoo_user:
-                vals["pc_assigned_user_id"] = odoo_user.id
+            if user_ids.get(pc_assignee_id):
+                vals["pc_assigned_user_id"] = user_ids[pc_assignee_id]
 
         # Map tags
-        tags = contact_data.get("tags", [])
+        tags = [tag_name for tag_name in contact_data.get("tags") or [] if tag_name]
         if tags:
-            tag_ids = []
-            for tag_name in tags:
-                tag = self.env["res.partner.category"].search([("name", "=", tag_name)], limit=1)
-                if not tag:
-                    tag = self.env["res.partner.category"].create({"name": tag_name})
-                tag_ids.append(tag.id)
+            tag_ids = list(dict.fromkeys(tag_ids_by_name[tag_name] for tag_name in tags))
             vals["category_id"] = [(6, 0, tag_ids)]
+        return vals
 
-        if partner:
-            # Update existing
-            # TODO: Add conflict resolution based on timestamps
-            partner.write(vals)
-            _logger.debug(f"Updated contact {partner.id} from ProspectConnect")
-        else:
-            # Create new
-            partner = self.env["res.partner"].create(vals)
-            _logger.debug(f"Created contact {partner.id} from ProspectConnect")
+    def _upsert_contact_from_pc(self, contact_data):
+        """Create or update Odoo contact from ProspectConnect data."""
+        self._apply_contact_batch([contact_data])
 
     # ------------- PULL DEALS -------------
 
     def _pull_deals(self):
-        """Pull updated deals from ProspectConnect."""
-        base_url, headers = self._get_api_context()
-        if not base_url:
-            return
+        """Fetch updated deals from ProspectConnect into the staging queue."""
+        return self._pull_object("deal")
 
-        state = self.search([("object_type", "=", "deal")], limit=1)
-        if not state:
-            state = self.create({"object_type": "deal"})
+    def _apply_deal_batch(self, payloads):
+        """Apply a page of deals as opportunities.
 
-        since = state.last_pull_at or (datetime.now() - timedelta(days=30))
-        
-        url = base_url + "/deal/getDealsByBusinessId"
-        payload = {
-            "updatedAfter": since.isoformat(),
-            "limit": 100,
-        }
+        Existing opportunities, linked partners and assignees are resolved
+        with one query each; stages come from the cached pipeline mappings.
+        New opportunities are inserted with a single ``create``; existing
+        ones are written one by one, each with its own values.
+        """
+        deals = {}
+        for deal_data in payloads:
+            if deal_data.get("id"):
+                deals[deal_data["id"]] = deal_data
+        if not deals:
+            return
 
-        try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            deals = data.get("data", []) or data.get("deals", [])
-            
-            _logger.info(f"Pulled {len(deals)} deals from ProspectConnect")
-            
-            for deal_data in deals:
-                self._upsert_deal_from_pc(deal_data)
-            
-            state.last_pull_at = datetime.now()
-            
-        except Exception as e:
-            _logger.exception("Error pulling deals from ProspectConnect")
+        Lead = self.env["crm.lead"]
+        stage_map = self.env["pc.pipeline.mapping"]._get_stage_map(self._account_id())[0]
+        with profile_phase(self.env, "resolve"):
+            leads = {
+                lead.pc_deal_id: lead
+                for lead in Lead.search_fetch(
+                    [("pc_deal_id", "in", list(deals)), ("pc_account_id", "=", self._account_id())],
+                    ["pc_deal_id"],
+                )
+            }
+            # Deals pushed from Odoo whose create answer was lost
+            leads.update(self._match_external_ids(
+                "crm.lead", "pc_deal_id", [data for pc_id, data in deals.items() if pc_id not in leads]
+            ))
+            partner_ids = self._map_pc_ids(
+                "res.partner", "pc_contact_id", {data.get("contactId") for data in deals.values()}
+            )
+            user_ids = self._map_pc_users({data.get("assignedTo") for data in deals.values()})
+
+        now = datetime.now()
+        vals_list = []
+        for pc_id, deal_data in deals.items():
+            vals = {
+                "name": deal_data.get("name") or "Deal",
+                "type": "opportunity",
+                "expected_revenue": float(deal_data.get("value", 0)),
+                "pc_deal_id": pc_id,
+                "pc_account_id": self._account_id(),
+                "pc_last_remote_update": now,
+                "active": deal_data.get("status") != "closed",
+            }
+
+            # Map contact
+            if partner_ids.get(deal_data.get("contactId")):
+                vals["partner_id"] = partner_ids[deal_data["contactId"]]
+
+            # Map stage
+            pc_stage_id = deal_data.get("stageId")
+            if pc_stage_id:
+                vals["pc_remote_pipeline_id"] = deal_data.get("pipelineId")
+                vals["pc_remote_stage_id"] = pc_stage_id
+                if stage_map.get(pc_stage_id):
+                    vals["stage_id"] = stage_map[pc_stage_id]
+
+            # Map assignee
+            pc_assignee_id = deal_data.get("assignedTo")
+            if pc_assignee_id:
+                vals["pc_remote_assignee_id"] = pc_assignee_id
+                if user_ids.get(pc_assignee_id):
+                    vals["user_id"] = user_ids[pc_assignee_id]
+
+            # Map notes
+            if deal_data.get("notes"):
+                vals["description"] = deal_data.get("notes")
+
+            lead = leads.get(pc_id)
+            if lead:
+                lead.write(vals)
+                _logger.debug(f"Updated opportunity {lead.id} from ProspectConnect")
+            else:
+                vals_list.append(vals)
+        if vals_list:
+            leads = Lead.create(vals_list)
+            _logger.debug(f"Created opportunities {leads.ids} from ProspectConnect")
 
     def _upsert_deal_from_pc(self, deal_data):
         """Create or update Odoo opportunity from ProspectConnect data."""
-        pc_id = deal_data.get("id")
-        if not pc_id:
-            return
-
-        lead = self.env["crm.lead"].search([("pc_deal_id", "=", pc_id)], limit=1)
-
-        vals = {
-            "name": deal_data.get("name") or "Deal",
-            "type": "opportunity",
-            "expected_revenue": float(deal_data.get("value", 0)),
-            "pc_deal_id": pc_id,
-            "pc_last_remote_update": datetime.now(),
-            "active": deal_data.get("status") != "closed",
-        }
-
-        # Map contact
-        contact_id = deal_data.get("contactId")
-        if contact_id:
-            partner = self.env["res.partner"].search([("pc_contact_id", "=", contact_id)], limit=1)
-            if partner:
-                vals["partner_id"] = partner.id
-
-        # Map stage
-        pc_pipeline_id = deal_data.get("pipelineId")
-        pc_stage_id = deal_data.get("stageId")
-        if pc_stage_id:
-            vals["pc_remote_pipeline_id"] = pc_pipeline_id
-            vals["pc_remote_stage_id"] = pc_stage_id
-            odoo_stage = self._find_odoo_stage_by_pc_ids(pc_pipeline_id, pc_stage_id)
-            if odoo_stage:
-                vals["stage_id"] = odoo_stage.id
-
-        # Map assignee
-        pc_assignee_id = deal_data.get("assignedTo")
-        if pc_assignee_id:
-            vals["pc_remote_assignee_id"] = pc_assignee_id
-            odoo_user = self._find_odoo_user_by_pc_id(pc_assignee_id)
-            if odoo_user:
-                vals["user_id"] = odoo_user.id
-
-        # Map notes
-        if deal_data.get("notes"):
-            vals["description"] = deal_data.get("notes")
-
-        if lead:
-            lead.write(vals)
-            _logger.debug(f"Updated opportunity {lead.id} from ProspectConnect")
-        else:
-            lead = self.env["crm.lead"].create(vals)
-            _logger.debug(f"Created opportunity {lead.id} from ProspectConnect")
+        self._apply_deal_batch([deal_data])
 
     # ------------- PULL TASKS -------------
 
     def _pull_tasks(self):
-        """Pull updated tasks from ProspectConnect."""
-        base_url, headers = self._get_api_context()
-        if not base_url:
+        """Fetch updated tasks from ProspectConnect into the staging queue."""
+        return self._pull_object("task")
+
+    def _apply_task_batch(self, payloads):
+        """Apply a page of tasks as activities.
+
+        Existing activities, linked partners or leads and assignees are
+        resolved with one query each; activity types and statuses come from
+        the cached task mappings. New activities are inserted with a single
+        ``create`` without notifying the assignee, and completed tasks are
+        archived in bulk instead of going through ``action_done``. Tasks
+        whose contact or deal is not in Odoo yet are deferred.
+        """
+        tasks = {}
+        for task_data in payloads:
+            pc_id = task_data.get("id") or task_data.get("taskId")
+            if pc_id:
+                tasks[pc_id] = task_data
+        if not tasks:
             return
 
-        state = self.search([("object_type", "=", "task")], limit=1)
-        if not state:
-            state = self.create({"object_type": "task"})
-
-        since = state.last_pull_at or (datetime.now() - timedelta(days=30))
-        
-        url = base_url + "/task/getTasksByBusinessId"
-        payload = {
-            "updatedAfter": since.isoformat(),
-            "limit": 100,
-        }
-
-        try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            tasks = data.get("data", []) or data.get("tasks", [])
-            
-            _logger.info(f"Pulled {len(tasks)} tasks from ProspectConnect")
-            
-            for task_data in tasks:
-                self._upsert_task_from_pc(task_data)
-            
-            state.last_pull_at = datetime.now()
-            
-        except Exception as e:
-            _logger.exception("Error pulling tasks from ProspectConnect")
+        Activity = self.env["mail.activity"].sudo().with_context(
+            active_test=False,
+            mail_activity_quick_update=True,
+            mail_create_nosubscribe=True,
+            tracking_disable=True,
+        )
+        type_map = self.env["pc.task.type.mapping"]._get_type_map(self._account_id())
+        status_map = self.env["pc.task.status.mapping"]._get_status_map(self._account_id())
+        targets = {pc_id: self._get_task_target(data) for pc_id, data in tasks.items()}
+
+        with profile_phase(self.env, "resolve"):
+            existing = {
+                activity.pc_task_id: activity
+                for activity in Activity.search_fetch(
+                    [("pc_task_id", "in", list(tasks)), ("pc_account_id", "=", self._account_id())],
+                    ["pc_task_id", "active"],
+                )
+            }
+            # Tasks pushed from Odoo whose create answer was lost
+            for pc_id, activity in self._match_external_ids(
+                "mail.activity", "pc_task_id", [data for pc_id, data in tasks.items() if pc_id not in existing]
+            ).items():
+                existing[pc_id] = Activity.browse(activity.id)
+            res_ids = {
+                "res.partner": self._map_pc_ids("res.partner", "pc_contact_id", {
+                    ref for model, ref in targets.values() if model == "res.partner"
+                }),
+                "crm.lead": self._map_pc_ids("crm.lead", "pc_deal_id", {
+                    ref for model, ref in targets.values() if model == "crm.lead"
+                }),
+            }
+            user_ids = self._map_pc_users({data.get("assignedTo") for data in tasks.values()})
+            default_type = self.env.ref("mail.mail_activity_data_todo", raise_if_not_found=False)
+            if not default_type:
+                default_type = self.env["mail.activity.type"].search([], limit=1)
+
+        today = fields.Date.context_today(self)
+        now = datetime.now()
+        vals_list, deferred = [], []
+        to_done = to_cancel = Activity.browse()
+        for pc_id, task_data in tasks.items():
+            status = status_map.get(task_data.get("statusId") or task_data.get("status"))
+            if not status:
+                status = "done" if task_data.get("completed") else "planned"
+
+            vals = {
+                "summary": task_data.get("name") or "Task",
+                "note": task_data.get("description"),
+                "pc_task_id": pc_id,
+                "pc_account_id": self._account_id(),
+                "pc_last_remote_update": now,
+            }
+            if task_data.get("due_date"):
+                vals["date_deadline"] = task_data["due_date"]
+            pc_assignee_id = task_data.get("assignedTo")
+            if pc_assignee_id:
+                vals["pc_remote_assignee_id"] = pc_assignee_id
+                if user_ids.get(pc_assignee_id):
+                    vals["user_id"] = user_ids[pc_assignee_id]
+            model, ref = targets[pc_id]
+            res_id = res_ids[model].get(ref) if model else None
+            if res_id:
+                vals["res_model_id"] = self.env["ir.model"]._get_id(model)
+                vals["res_id"] = res_id
+
+            activity = existing.get(pc_id)
+            if activity:
+                if status == "cancelled":
+                    to_cancel |= activity
+                    continue
+                if status == "planned" and not activity.active:
+                    vals.update(active=True, date_done=False)
+                activity.write(vals)
+                if status == "done" and activity.active:
+                    to_done |= activity
+                continue
+
+            if status == "cancelled":
+                continue
+            if not res_id:
+                deferred.append(task_data)
+                continue
+            vals["activity_type_id"] = (
+                type_map.get(task_data.get("typeId") or task_data.get("type")) or default_type.id
+            )
+            if not vals["activity_type_id"]:
+                _logger.warning("Cannot import task %s: no activity type configured", pc_id)
+                continue
+            if status == "done":
+                vals.update(active=False, date_done=today)
+            vals_list.append(vals)
+
+        if vals_list:
+            Activity.create(vals_list)
+        if to_done:
+            to_done.write({"active": False, "date_done": today})
+        if to_cancel:
+            to_cancel.unlink()
+        if deferred:
+            _logger.info(
+                "ProspectConnect deferred %s tasks until their contact or deal is synced",
+                len(deferred),
+            )
+            self.env["pc.sync.inbound"]._defer("task", deferred)
+
+    def _get_task_target(self, task_data):
+        """Return ``(model, pc id)`` of the record a task belongs to."""
+        contact_ids = task_data.get("contact_ids") or []
+        deal_ids = task_data.get("deal_ids") or []
+        if contact_ids and contact_ids[0]:
+            return "res.partner", contact_ids[0]
+        if deal_ids and deal_ids[0]:
+            return "crm.lead", deal_ids[0]
+        return None, None
 
     def _upsert_task_from_pc(self, task_data):
         """Create or update Odoo activity from ProspectConnect data."""
-        pc_id = task_data.get("id") or task_data.get("taskId")
-        if not pc_id:
-            return
-
-        activity = self.env["mail.activity"].search([("pc_task_id", "=", pc_id)], limit=1)
-
-        vals = {
-            "summary": task_data.get("name") or "Task",
-            "note": task_data.get("description"),
-            "pc_task_id": pc_id,
-            "pc_last_remote_update": datetime.now(),
-        }
-
-        # Map due date
-        due_date = task_data.get("due_date")
-        if due_date:
-            vals["date_deadline"] = due_date
-
-        # Map completion status
-        if task_data.get("completed"):
-            vals["state"] = "done"
-
-        # Map assignee
-        pc_assignee_id = task_data.get("assignedTo")
-        if pc_assignee_id:
-            vals["pc_remote_assignee_id"] = pc_assignee_id
-            odoo_user = self._find_odoo_user_by_pc_id(pc_assignee_id)
-            if odoo_user:
-                vals["user_id"] = odoo_user.id
-
-        # Map to contact or deal
-        contact_ids = task_data.get("contact_ids", [])
-        deal_ids = task_data.get("deal_ids", [])
-        
-        if contact_ids and contact_ids[0]:
-            partner = self.env["res.partner"].search([("pc_contact_id", "=", contact_ids[0])], limit=1)
-            if partner:
-                vals["res_model"] = "res.partner"
-                vals["res_id"] = partner.id
-        elif deal_ids and deal_ids[0]:
-            lead = self.env["crm.lead"].search([("pc_deal_id", "=", deal_ids[0])], limit=1)
-            if lead:
-                vals["res_model"] = "crm.lead"
-                vals["res_id"] = lead.id
-
-        if activity:
-            activity.write(vals)
-            _logger.debug(f"Updated activity {activity.id} from ProspectConnect")
-        else:
-            # Need activity type
-            activity_type = self.env["mail.activity.type"].search([], limit=1)
-            if activity_type:
-                vals["activity_type_id"] = activity_type.id
-                activity = self.env["mail.activity"].create(vals)
-                _logger.debug(f"Created activity {activity.id} from ProspectConnect")
+        self._apply_task_batch([task_data])
 
     # ------------- PULL NOTES -------------
 
     def _pull_notes(self):
-        """Pull updated notes from ProspectConnect."""
-        base_url, headers = self._get_api_context()
-        if not base_url:
-            return
+        """Fetch updated notes from ProspectConnect into the staging queue."""
+        return self._pull_object("note")
 
-        state = self.search([("object_type", "=", "note")], limit=1)
-        if not state:
-            state = self.create({"object_type": "note"})
+    def _apply_note_batch(self, payloads):
+        """Import a page of notes into the chatter.
 
-        since = state.last_pull_at or (datetime.now() - timedelta(days=30))
-        
-        url = base_url + "/note/getAllNotes"
-        payload = {
-            "updatedAfter": since.isoformat(),
-            "limit": 100,
-        }
+        Known notes and their target records are resolved with one query
+        each, and all messages are inserted with a single ``create`` that
+        bypasses tracking, subscription and notification. Notes whose contact
+        or deal is not in Odoo yet are kept in the inbound queue as deferred.
+        """
+        notes = {}
+        for note_data in payloads:
+            if note_data.get("id"):
+                notes[note_data["id"]] = note_data
+        if not notes:
+            return
 
-        try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            notes = data.get("data", []) or data.get("notes", [])
-            
-            _logger.info(f"Pulled {len(notes)} notes from ProspectConnect")
-            
-            for note_data in notes:
-                self._upsert_note_from_pc(note_data)
-            
-            state.last_pull_at = datetime.now()
-            
-        except Exception as e:
-            _logger.exception("Error pulling notes from ProspectConnect")
+        Message = self.env["mail.message"].sudo()
+        with profile_phase(self.env, "resolve"):
+            known = set(Message.search_fetch(
+                [("pc_note_id", "in", list(notes)), ("pc_account_id", "=", self._account_id())], ["pc_note_id"]
+            ).mapped("pc_note_id"))
+            # Notes pushed from Odoo whose create answer was lost
+            for pc_id, message in self._match_external_ids(
+                "mail.message", "pc_note_id", [data for pc_id, data in notes.items() if pc_id not in known]
+            ).items():
+                message.write({
+                    "pc_note_id": pc_id,
+                    "pc_account_id": self._account_id(),
+                    "pc_last_remote_update": datetime.now(),
+                })
+                known.add(pc_id)
+            notes = {pc_id: data for pc_id, data in notes.items() if pc_id not in known}
+
+            # The contact wins when a note references both, as before
+            contact_ids = {data["contactId"] for data in notes.values() if data.get("contactId")}
+            deal_ids = {
+                data["dealId"] for data in notes.values()
+                if data.get("dealId") and not data.get("contactId")
+            }
+            partners = self._map_pc_ids("res.partner", "pc_contact_id", contact_ids)
+            leads = self._map_pc_ids("crm.lead", "pc_deal_id", deal_ids)
+
+        now = datetime.now()
+        vals_list, deferred = [], []
+        for pc_id, note_data in notes.items():
+            if note_data.get("contactId"):
+                res_model, res_id = "res.partner", partners.get(note_data["contactId"])
+            else:
+                res_model, res_id = "crm.lead", leads.get(note_data.get("dealId"))
+            if not res_id:
+                deferred.append(note_data)
+                continue
+            vals_list.append({
+                "body": note_data.get("body") or "",
+                "message_type": "comment",
+                "model": res_model,
+                "res_id": res_id,
+                "pc_note_id": pc_id,
+                "pc_account_id": self._account_id(),
+                "pc_last_remote_update": now,
+                "pc_sync_enabled": False,  # Don't sync back
+            })
+
+        if vals_list:
+            Message.with_context(
+                tracking_disable=True,
+                mail_create_nosubscribe=True,
+                mail_notrack=True,
+                mail_notify_noemail=True,
+            ).create(vals_list)
+        if deferred:
+            _logger.info(
+                "ProspectConnect deferred %s notes until their contact or deal is synced",
+                len(deferred),
+            )
+            self.env["pc.sync.inbound"]._defer("note", deferred)
 
     def _upsert_note_from_pc(self, note_data):
         """Create Odoo message from ProspectConnect note."""
-        pc_id = note_data.get("id")
-        if not pc_id:
-            return
-
-        # Check if note already exists
-        message = self.env["mail.message"].search([("pc_note_id", "=", pc_id)], limit=1)
-        if message:
-            return  # Don't update existing notes
-
-        # Find the related record
-        contact_id = note_data.get("contactId")
-        deal_id = note_data.get("dealId")
-        
-        res_model = None
-        res_id = None
-        
-        if contact_id:
-            partner = self.env["res.partner"].search([("pc_contact_id", "=", contact_id)], limit=1)
-            if partner:
-                res_model = "res.partner"
-                res_id = partner.id
-        elif deal_id:
-            lead = self.env["crm.lead"].search([("pc_deal_id", "=", deal_id)], limit=1)
-            if lead:
-                res_model = "crm.lead"
-                res_id = lead.id
-
-        if not res_model or not res_id:
-            _logger.warning(f"Cannot import note {pc_id}: no linked contact or deal found")
-            return
-
-        vals = {
-            "body": note_data.get("body") or "",
-            "message_type": "comment",
-            "model": res_model,
-            "res_id": res_id,
-            "pc_note_id": pc_id,
-            "pc_last_remote_update": datetime.now(),
-            "pc_sync_enabled": False,  # Don't sync back
-        }
-
-        message = self.env["mail.message"].create(vals)
-        _logger.debug(f"Created note {message.id} from ProspectConnect")
+        self._apply_note_batch([note_data])
@@ -1,5 +1,5 @@
 # prospectconnect_sync/models/pc_task_mapping.py
-from odoo import fields, models
+from odoo import api, fields, models, tools
 
 
 class PcTaskTypeMapping(models.Model):
@@ -15,6 +15,40 @@ class PcTaskTypeMapping(models.Model):
     )
     pc_task_type_id = fields.Char(string="ProspectConnect Task Type ID", required=True)
     pc_task_type_name = fields.Char(string="ProspectConnect Task Type Name")
+    account_id = fields.Many2one(
+        "pc.account", string="Account", ondelete="cascade", help="Empty for the default account (Settings)."
+    )
+
+    # The registry cache is cleared after the change, and only for changes
+    # read by _get_type_map, so another read cannot re-cache the old map
+    @api.model_create_multi
+    def create(self, vals_list):
+        mappings = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return mappings
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"odoo_activity_type_id", "pc_task_type_id", "pc_task_type_name", "account_id"} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache("account_id")
+    def _get_type_map(self, account_id=False):
+        """Cached ``{pc task type id or name: mail.activity.type id}`` of an
+        account (``False`` for the default one)."""
+        type_map = {}
+        for mapping in self.sudo().search([("account_id", "=", account_id)]):
+            type_map[mapping.pc_task_type_id] = mapping.odoo_activity_type_id.id
+            if mapping.pc_task_type_name:
+                type_map.setdefault(mapping.pc_task_type_name, mapping.odoo_activity_type_id.id)
+        return type_map
 
 
 class PcTaskStatusMapping(models.Model):
@@ -36,3 +70,36 @@ class PcTaskStatusMapping(models.Model):
         string="ProspectConnect Task Status ID", required=True
     )
     pc_task_status_name = fields.Char(string="ProspectConnect Task Status Name")
+    account_id = fields.Many2one(
+        "pc.account", string="Account", ondelete="cascade", help="Empty for the default account (Settings)."
+    )
+
+    # Same cache clearing as the type mapping, for _get_status_map
+    @api.model_create_multi
+    def create(self, vals_list):
+        mappings = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return mappings
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"odoo_state", "pc_task_status_id", "pc_task_status_name", "account_id"} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache("account_id")
+    def _get_status_map(self, account_id=False):
+        """Cached ``{pc task status id or name: odoo state}`` of an account
+        (``False`` for the default one)."""
+        status_map = {}
+        for mapping in self.sudo().search([("account_id", "=", account_id)]):
+            status_map[mapping.pc_task_status_id] = mapping.odoo_state
+            if mapping.pc_task_status_name:
+                status_map.setdefault(mapping.pc_task_status_name, mapping.odoo_state)
+        return status_map
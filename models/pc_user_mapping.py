@@ -1,8 +1,10 @@
 # prospectconnect_sync/models/pc_user_mapping.py
 import logging
+from collections import defaultdict
 
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
+from odoo.tools.sql import create_unique_index
 
 _logger = logging.getLogger(__name__)
 
@@ -11,57 +13,104 @@ try:
 except Exception:  # pragma: no cover
     requests = None
 
+# model -> field receiving the Odoo user mapped from its pc_remote_assignee_id
+REMAP_USER_FIELDS = {
+    "res.partner": "pc_assigned_user_id",
+    "crm.lead": "user_id",
+    "mail.activity": "user_id",
+}
+
 
 class PcUserMapping(models.Model):
     _name = "pc.user.mapping"
     _description = "ProspectConnect User Mapping"
     _rec_name = "odoo_user_id"
 
-    odoo_user_id = fields.Many2one("res.users", string="Odoo User", required=True)
+    # Rows are created by the refresh from ProspectConnect and mapped by hand
+    odoo_user_id = fields.Many2one("res.users", string="Odoo User")
     pc_user_id = fields.Char(string="ProspectConnect User ID", required=True)
     pc_user_name = fields.Char(string="ProspectConnect User Name")
-
-    _sql_constraints = [
-        ("pc_user_unique", "unique(pc_user_id)", "ProspectConnect User ID must be unique."),
-    ]
+    active = fields.Boolean(default=True, help="Cleared when the user is no longer listed by ProspectConnect.")
+    account_id = fields.Many2one(
+        "pc.account", string="Account", ondelete="cascade", help="Empty for the default account (Settings)."
+    )
+
+    def init(self):
+        # Unique per account: each account lists its own users
+        self.env.cr.execute("ALTER TABLE pc_user_mapping DROP CONSTRAINT IF EXISTS pc_user_mapping_pc_user_unique")
+        create_unique_index(
+            self.env.cr, "pc_user_mapping_account_user_id_uniq", self._table,
+            ["COALESCE(account_id, 0)", "pc_user_id"],
+        )
+
+    # The registry cache is cleared after the change, and only when the
+    # cached map changes: rows the refresh adds or renames while they are
+    # not mapped yet leave it as it is
+    @api.model_create_multi
+    def create(self, vals_list):
+        mappings = super().create(vals_list)
+        if any(mappings.mapped("odoo_user_id")):
+            self.env.registry.clear_cache()
+        mappings._remap_records()
+        return mappings
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"odoo_user_id", "pc_user_id", "active", "account_id"} & set(vals):
+            self.env.registry.clear_cache()
+        if {"odoo_user_id", "pc_user_id", "active"} & set(vals):
+            self._remap_records()
+        return res
+
+    def unlink(self):
+        mapped = any(self.mapped("odoo_user_id"))
+        res = super().unlink()
+        if mapped:
+            self.env.registry.clear_cache()
+        return res
 
     @api.model
-    def fetch_from_api(self):
-        """Fetch users from ProspectConnect and update mapping.
-
-        NOTE: This is a stub. You will need to adjust the endpoint according
-        to the official docs when you know the exact path for listing users/team members.
+    @tools.ormcache("account_id")
+    def _get_user_map(self, account_id=False):
+        """Cached ``({pc user id: res.users id}, {res.users id: pc user id})``."""
+        to_odoo, to_pc = {}, {}
+        for mapping in self.sudo().search(
+            [("odoo_user_id", "!=", False), ("account_id", "=", account_id)], order="id"
+        ):
+            to_odoo.setdefault(mapping.pc_user_id, mapping.odoo_user_id.id)
+            to_pc.setdefault(mapping.odoo_user_id.id, mapping.pc_user_id)
+        return to_odoo, to_pc
+
+    def _remap_records(self):
+        """Assign the mapped Odoo users to records already pulled for these
+        ProspectConnect users.
+
+        Pulled records keep the remote assignee id, so a mapping added or
+        changed later is applied locally: one grouped write per model and
+        user, no API call and no push job. Only the records of the
+        mapping's account (see ``pc.account._records_domain``) are remapped.
         """
-        if not requests:
-            raise UserError(_("Python 'requests' library not available."))
-
-        icp = self.env["ir.config_parameter"].sudo()
-# prospectconnect_sync/models/pc_user_mapping.py
-import logging
-
-from odoo import api, fields, models, _
-from odoo.exceptions import UserError
-
-_logger = logging.getLogger(__name__)
-
-try:
-    import requests
-except Exception:  # pragma: no cover
-    requests = None
-
-
-class PcUserMapping(models.Model):
-    _name = "pc.user.mapping"
-    _description = "ProspectConnect User Mapping"
-    _rec_name = "odoo_user_id"
-
-    odoo_user_id = fields.Many2one("res.users", string="Odoo User", required=True)
-    pc_user_id = fields.Char(string="ProspectConnect User ID", required=True)
-    pc_user_name = fields.Char(string="ProspectConnect User Name")
-
-    _sql_constraints = [
-        ("pc_user_unique", "unique(pc_user_id)", "ProspectConnect User ID must be unique."),
-    ]
+        user_by_pc = defaultdict(dict)
+        for mapping in self:
+            if mapping.active and mapping.odoo_user_id:
+                user_by_pc[mapping.account_id][mapping.pc_user_id] = mapping.odoo_user_id.id
+        for account, users in user_by_pc.items():
+            for model, fname in REMAP_USER_FIELDS.items():
+                Model = self.env[model].sudo().with_context(
+                    pc_skip_sync=True, tracking_disable=True, mail_activity_quick_update=True
+                )
+                for pc_user_id, records in Model._read_group(
+                    [("pc_remote_assignee_id", "in", list(users))] + account._records_domain(model),
+                    ["pc_remote_assignee_id"],
+                    ["id:recordset"],
+                ):
+                    user_id = users[pc_user_id]
+                    records = records.filtered(lambda r: r[fname].id != user_id)
+                    if records:
+                        records.write({fname: user_id})
+                        _logger.info(
+                            "ProspectConnect: %s %s remapped to user %s", len(records), model, user_id
+                        )
 
     @api.model
     def fetch_from_api(self):
@@ -73,53 +122,50 @@ class PcUserMapping(models.Model):
         if not requests:
             raise UserError(_("Python 'requests' library not available."))
 
-        icp = self.env["ir.config_parameter"].sudo()
-        api_key = icp.get_param("prospectconnect_sync.api_key")
-        base_url = icp.get_param("prospectconnect_sync.base_url", "https://api.prospectconnect.ai")
-
-        if not api_key:
+        accounts = [
+            account for account in self.env["pc.account"]._get_accounts()
+            if account._get_credentials()[0]
+        ]
+        if not accounts:
             raise UserError(_("Please configure API key in settings first."))
 
+        try:
+            for account in accounts:
+                self.with_context(pc_account_id=account.id)._refresh_from_api(force=True)
+        except Exception as e:
+            _logger.warning("Error fetching ProspectConnect users: %s", e)
+
+    @api.model
+    def _refresh_from_api(self, force=False):
+        """Apply the changes of the remote user list, if any."""
+        Refresh = self.env["pc.mapping.refresh"]
         # Hypothesis based on pipeline pattern: GET /user/getUserList
         # and response structure from screenshot (users array, _id field)
-        url = base_url.rstrip("/") + "/user/getUserList"
-        headers = {
-            "Accept": "application/json",
-            "Authorization": api_key,
-        }
-
         try:
-            resp = requests.get(url, headers=headers, timeout=20)
-            if resp.status_code == 404:
-                # Fallback or just log warning
+            data, version = Refresh._conditional_get("users", "/user/getUserList", force=force)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
                 _logger.warning("ProspectConnect '/user/getUserList' not found (404).")
                 return
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            _logger.warning("Error fetching ProspectConnect users: %s", e)
+            raise
+        if data is None:
             return
 
         # Expected shape based on screenshot: {"users": [{"_id": "...", "first_name": "...", ...}]}
         # Or maybe {"data": ...} - we'll try both
         items = data.get("users") or data.get("data") or []
-        
+        remote = {}
         for item in items:
             pc_user_id = item.get("_id") or item.get("id")
             if not pc_user_id:
                 continue
-                
+
             # Construct name
             first = item.get("first_name") or ""
             last = item.get("last_name") or ""
             name = f"{first} {last}".strip() or item.get("name") or item.get("email") or pc_user_id
-            
-            mapping = self.search([("pc_user_id", "=", pc_user_id)], limit=1)
-            vals = {
-                "pc_user_id": pc_user_id,
-                "pc_user_name": name,
-            }
-            if mapping:
-                mapping.write(vals)
-            else:
-                self.create(vals)
+            remote[pc_user_id] = {"pc_user_name": name}
+
+        counts = Refresh._apply_diff(self._name, "pc_user_id", remote)
+        Refresh._mark_applied("users", version)
+        _logger.info("ProspectConnect users refreshed: %s new, %s updated, %s deactivated", *counts)
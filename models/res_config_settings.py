@@ -68,12 +68,150 @@ class ResConfigSettings(models.TransientModel):
         config_parameter="prospectconnect_sync.sync_notes",
     )
 
+    # Webhook (real-time PC → Odoo)
+    pc_webhook_secret = fields.Char(
+        string="Webhook Secret",
+        config_parameter="prospectconnect_sync.webhook_secret",
+        help="Shared secret used to verify the HMAC-SHA256 signature (X-PC-Signature) of webhook calls.",
+    )
+    pc_webhook_url = fields.Char(
+        string="Webhook URL", compute="_compute_pc_webhook_url", readonly=True
+    )
+
     # Polling interval (cron)
     pc_poll_interval_minutes = fields.Integer(
         string="Minutes between polls (cron)",
         default=5,
         config_parameter="prospectconnect_sync.poll_interval_minutes",
     )
+    # Per-unit intervals; empty means the polling interval above
+    pc_push_interval_minutes = fields.Integer(
+        string="Minutes between pushes",
+        config_parameter="prospectconnect_sync.poll_interval_push",
+    )
+    pc_poll_interval_contacts = fields.Integer(
+        string="Minutes between contact pulls",
+        config_parameter="prospectconnect_sync.poll_interval_contact",
+    )
+    pc_poll_interval_deals = fields.Integer(
+        string="Minutes between opportunity pulls",
+        config_parameter="prospectconnect_sync.poll_interval_deal",
+    )
+    pc_poll_interval_tasks = fields.Integer(
+        string="Minutes between task pulls",
+        config_parameter="prospectconnect_sync.poll_interval_task",
+    )
+    pc_poll_interval_notes = fields.Integer(
+        string="Minutes between note pulls",
+        config_parameter="prospectconnect_sync.poll_interval_note",
+    )
+    pc_mapping_refresh_minutes = fields.Integer(
+        string="Minutes between mapping refreshes",
+        default=60,
+        config_parameter="prospectconnect_sync.poll_interval_mapping",
+        help="How long fetched user and pipeline lists are considered fresh.",
+    )
+
+    # Debounced pushes: seconds a record must stay unchanged before it is pushed
+    pc_debounce_contacts = fields.Integer(
+        string="Contact debounce (s)",
+        config_parameter="prospectconnect_sync.debounce_contact",
+    )
+    pc_debounce_deals = fields.Integer(
+        string="Opportunity debounce (s)",
+        config_parameter="prospectconnect_sync.debounce_deal",
+    )
+    pc_debounce_tasks = fields.Integer(
+        string="Task debounce (s)",
+        config_parameter="prospectconnect_sync.debounce_task",
+    )
+    pc_debounce_notes = fields.Integer(
+        string="Note debounce (s)",
+        config_parameter="prospectconnect_sync.debounce_note",
+    )
+    pc_debounce_max_delay = fields.Integer(
+        string="Maximum push delay (s)",
+        default=300,
+        config_parameter="prospectconnect_sync.debounce_max_delay",
+        help="A record edited continuously is still pushed this long after its first queued change.",
+    )
+
+    pc_push_timeout = fields.Integer(
+        string="Push timeout (s)",
+        default=20,
+        config_parameter="prospectconnect_sync.push_timeout",
+        help="Seconds to wait for ProspectConnect to answer a push. Creates carry an idempotency key, "
+             "so a call that times out is retried without creating the record twice.",
+    )
+
+    pc_compress_requests = fields.Boolean(
+        string="Compress Request Bodies",
+        config_parameter="prospectconnect_sync.compress_requests",
+        help="Gzip request bodies larger than 1 KB. Only enable it if the ProspectConnect API accepts Content-Encoding: gzip.",
+    )
+
+    # Circuit breaker (per endpoint family, shared by all workers)
+    pc_breaker_threshold = fields.Integer(
+        string="Failures before opening",
+        default=5,
+        config_parameter="prospectconnect_sync.breaker_threshold",
+    )
+    pc_breaker_cooldown = fields.Integer(
+        string="Seconds before probing",
+        default=60,
+        config_parameter="prospectconnect_sync.breaker_cooldown",
+    )
+    pc_breaker_slow_seconds = fields.Integer(
+        string="Slow call (seconds)",
+        default=10,
+        config_parameter="prospectconnect_sync.breaker_slow_seconds",
+        help="Calls slower than this count as failures (0 to ignore latency).",
+    )
+    pc_breaker_status = fields.Text(
+        string="Circuit Status", compute="_compute_pc_breaker_status", readonly=True
+    )
+
+    # Profiling (one-shot, consumed by the next run)
+    pc_profile_next_run = fields.Boolean(
+        string="Profile Next Sync Run",
+        config_parameter="prospectconnect_sync.profile_next_run",
+        help="Record per-phase timings and SQL counts of the next sync run in the Sync Runs log.",
+    )
+    pc_profile_mode = fields.Selection(
+        [
+            ("timing", "Timing and SQL only"),
+            ("cprofile", "Timing + cProfile"),
+            ("odoo", "Timing + Odoo profiler"),
+        ],
+        string="Profiling Mode",
+        default="timing",
+        config_parameter="prospectconnect_sync.profile_mode",
+    )
+
+    # Record/replay of API traffic for offline profiling
+    pc_tape_mode = fields.Selection(
+        [
+            ("record", "Record"),
+            ("replay", "Replay"),
+        ],
+        string="API Tape",
+        config_parameter="prospectconnect_sync.tape_mode",
+        help="Record the API calls of pushes and pulls to the tape file, or answer them from it instead of calling ProspectConnect.",
+    )
+    pc_tape_path = fields.Char(
+        string="Tape File",
+        config_parameter="prospectconnect_sync.tape_path",
+        help="Path on the server of the gzipped recording, e.g. /var/tmp/prospectconnect.tape.gz. Recordings are appended.",
+    )
+    pc_tape_timing = fields.Selection(
+        [
+            ("original", "Recorded latency"),
+            ("instant", "No latency"),
+        ],
+        string="Replay Timing",
+        default="original",
+        config_parameter="prospectconnect_sync.tape_timing",
+    )
 
     # Read-only last sync timestamps (computed from pc.sync.state)
     pc_last_sync_contacts = fields.Datetime(
@@ -89,6 +227,16 @@ class ResConfigSettings(models.TransientModel):
         string="Notes Last Sync", readonly=True, compute="_compute_pc_last_sync"
     )
 
+    def _compute_pc_webhook_url(self):
+        base_url = self.env["ir.config_parameter"].sudo().get_param("web.base.url", "")
+        for rec in self:
+            rec.pc_webhook_url = base_url.rstrip("/") + "/prospectconnect/webhook"
+
+    def _compute_pc_breaker_status(self):
+        status = self.env["pc.sync.breaker"].sudo()._get_status()
+        for rec in self:
+            rec.pc_breaker_status = status
+
     def _compute_pc_last_sync(self):
         SyncState = self.env["pc.sync.state"].sudo()
         mapping = {
@@ -100,10 +248,15 @@ class ResConfigSettings(models.TransientModel):
         for rec in self:
             for obj_type, field_name in mapping.items():
                 state = SyncState.search(
-                    [("object_type", "=", obj_type)], limit=1
+                    [("object_type", "=", obj_type), ("account_id", "=", False)], limit=1
                 )
                 rec[field_name] = state.last_pull_at if state else False
 
+    def set_values(self):
+        super().set_values()
+        # Keep the sync crons on the configured intervals
+        self.env["pc.sync.state"].sudo()._apply_sync_intervals()
+
     # Buttons
 
     def action_pc_test_connection(self):
@@ -168,6 +321,28 @@ class ResConfigSettings(models.TransientModel):
             },
         }
 
+    def action_pc_sync_now_profiled(self):
+        """Run a profiled incremental sync and open its run log."""
+        self.ensure_one()
+        self.env["pc.sync.state"].sudo().with_context(
+            pc_profile=self.pc_profile_mode or "timing"
+        ).run_incremental_sync()
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Sync Runs"),
+            "res_model": "pc.sync.run",
+            "view_mode": "list,form",
+        }
+
+    def action_pc_reset_breakers(self):
+        """Close all circuit breakers so calls resume immediately."""
+        self.ensure_one()
+        self.env["pc.sync.breaker"].sudo().action_reset()
+        return {
+            "type": "ir.actions.client",
+            "tag": "reload",
+        }
+
     def action_pc_fetch_users(self):
         """Fetch users from ProspectConnect into mapping model."""
         self.ensure_one()
@@ -1,16 +1,64 @@
 # prospectconnect_sync/models/res_partner.py
 import logging
+import re
 
 from odoo import api, fields, models, _
-from odoo.tools import html_escape
+from odoo.tools import email_normalize
+from odoo.tools.sql import column_exists, create_column
+
+from ..tools import create_remote_id_index
 
 _logger = logging.getLogger(__name__)
 
+try:
+    import phonenumbers
+except Exception:  # pragma: no cover
+    phonenumbers = None
+
+
+def pc_email_key(email):
+    """Normalized email used to match contacts (lowercase bare address)."""
+    return email_normalize(email) or False if email else False
+
+
+def pc_phone_key(phone, country_code=None):
+    """E.164 phone number used to match contacts.
+
+    Uses ``phonenumbers`` when installed (national numbers are read in the
+    context of the partner's country); otherwise only numbers written in
+    international form (``+`` or ``00`` prefix) get a key.
+    """
+    if not phone:
+        return False
+    if phonenumbers:
+        try:
+            number = phonenumbers.parse(phone, (country_code or "").upper() or None)
+        except phonenumbers.NumberParseException:
+            return False
+        if not phonenumbers.is_valid_number(number):
+            return False
+        return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+    phone = phone.strip()
+    digits = re.sub(r"\D", "", phone)
+    if phone.startswith("00"):
+        digits = digits[2:]
+    elif not phone.startswith("+"):
+        return False
+    return "+" + digits if 8 <= len(digits) <= 15 else False
+
 
 class ResPartner(models.Model):
     _inherit = "res.partner"
 
-    pc_contact_id = fields.Char(string="ProspectConnect Contact ID", index=True)
+    # Unique per account where set, see init()
+    pc_contact_id = fields.Char(string="ProspectConnect Contact ID", copy=False)
+    pc_account_id = fields.Many2one(
+        "pc.account",
+        string="ProspectConnect Account",
+        copy=False,
+        ondelete="restrict",
+        help="Account the ProspectConnect ID belongs to (empty for the default account).",
+    )
     pc_last_sync_at = fields.Datetime(string="PC Last Sync At")
     pc_last_remote_update = fields.Datetime(
         string="PC Last Remote Update",
@@ -27,9 +75,60 @@ class ResPartner(models.Model):
     )
     pc_remote_assignee_id = fields.Char(
         string="PC Assignee ID",
-        help="ProspectConnect user ID of the assignee"
+        help="ProspectConnect user ID of the assignee",
+        index="btree_not_null",
+    )
+    pc_email_key = fields.Char(
+        string="PC Email Match Key",
+        compute="_compute_pc_match_keys",
+        store=True,
+        index="btree_not_null",
+        help="Normalized email used to link ProspectConnect contacts to existing partners",
+    )
+    pc_phone_key = fields.Char(
+        string="PC Phone Match Key",
+        compute="_compute_pc_match_keys",
+        store=True,
+        index="btree_not_null",
+        help="E.164 phone number used to link ProspectConnect contacts to existing partners",
     )
 
+    def _auto_init(self):
+        # Create and fill the match key columns in SQL so installing on a large
+        # res_partner table does not recompute every partner through the ORM.
+        # The fill covers plain addresses and international numbers; other
+        # values get their key the next time the partner is written.
+        cr = self.env.cr
+        if not column_exists(cr, "res_partner", "pc_email_key"):
+            create_column(cr, "res_partner", "pc_email_key", "varchar")
+            cr.execute(r"""
+                UPDATE res_partner
+                SET pc_email_key = lower(trim(email))
+                WHERE trim(email) ~ '^[^\s<>,;"]+@[^\s<>,;"]+$'
+            """)
+        if not column_exists(cr, "res_partner", "pc_phone_key"):
+            create_column(cr, "res_partner", "pc_phone_key", "varchar")
+            cr.execute(r"""
+                UPDATE res_partner
+                SET pc_phone_key = '+' || regexp_replace(trim(coalesce(phone, mobile)), '\D', '', 'g')
+                WHERE trim(coalesce(phone, mobile)) LIKE '+%%'
+                  AND length(regexp_replace(coalesce(phone, mobile), '\D', '', 'g')) BETWEEN 8 AND 15
+            """)
+        return super()._auto_init()
+
+    def init(self):
+        super().init()
+        # One partner per contact of a ProspectConnect account, whoever applies it first
+        create_remote_id_index(self.env.cr, self._table, "pc_contact_id")
+
+    @api.depends("email", "phone", "mobile", "country_id")
+    def _compute_pc_match_keys(self):
+        for partner in self:
+            partner.pc_email_key = pc_email_key(partner.email)
+            partner.pc_phone_key = pc_phone_key(
+                partner.phone or partner.mobile, partner.country_id.code
+            )
+
     @api.model_create_multi
     def create(self, vals_list):
         partners = super().create(vals_list)
@@ -45,6 +144,10 @@ class ResPartner(models.Model):
 
     def _pc_maybe_sync_to_pc(self, trigger):
         """Schedule sync jobs for records when config allows it."""
+        # Records written by the sync itself (pulls, id write-backs) must not
+        # be queued again, otherwise every push echoes back as a new job.
+        if self.env.context.get("pc_skip_sync"):
+            return
         config = self.env["ir.config_parameter"].sudo()
         if not config.get_param("prospectconnect_sync.sync_contacts", "True") == "True":
             return
@@ -63,18 +166,8 @@ class ResPartner(models.Model):
         if direction not in ("odoo_to_pc", "bidirectional"):
             return
 
-        for partner in self:
-            self.env["pc.sync.job"].sudo().create(
-                {
-                    "direction": "odoo_to_pc",
-                    "object_type": "contact",
-                    "odoo_model": partner._name,
-                    "odoo_res_id": partner.id,
-                }
-            )
-            _logger.debug(
-                "ProspectConnect: queued sync job for partner %s (%s)",
-                partner.id,
-                html_escape(partner.display_name),
-            )
+        priority = self.env["pc.sync.job"]._get_origin_priority(len(self))
+
+        self.env["pc.sync.job"].sudo()._queue_push("contact", self, priority)
+        _logger.debug("ProspectConnect: queued sync of partners %s", self.ids)
 
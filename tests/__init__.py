@@ -0,0 +1,22 @@
+# prospectconnect_sync/tests/__init__.py
+from . import test_pc_benchmark
+from . import test_pc_query_counts
+from . import test_pc_webhook
+from . import test_pc_inbound
+from . import test_pc_contact_matching
+from . import test_pc_bootstrap
+from . import test_pc_backfill
+from . import test_pc_job_priority
+from . import test_pc_sync_crons
+from . import test_pc_push_dependencies
+from . import test_pc_breaker
+from . import test_pc_mapping_refresh
+from . import test_pc_remap
+from . import test_pc_codec
+from . import test_pc_tape
+from . import test_pc_debounce
+from . import test_pc_sync_worker
+from . import test_pc_accounts
+from . import test_pc_upsert
+from . import test_pc_idempotency
+from . import test_pc_sync_run
@@ -0,0 +1,138 @@
+# prospectconnect_sync/tests/common.py
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import patch
+
+from odoo.sql_db import Cursor
+from odoo.tests.common import TransactionCase
+
+from .pc_mock_server import MockProspectConnect
+
+
+class PcSyncCase(TransactionCase):
+    """Base case wiring the module to a local mock ProspectConnect server."""
+
+    mock_options = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.mock = MockProspectConnect(**cls.mock_options)
+        cls.mock.start()
+        cls.addClassCleanup(cls.mock.stop)
+        cls._set_params({
+            "prospectconnect_sync.api_key": "test-key",
+            "prospectconnect_sync.base_url": cls.mock.base_url,
+            "prospectconnect_sync.sync_direction": "bidirectional",
+            "prospectconnect_sync.trigger_mode": "on_create_update",
+            "prospectconnect_sync.sync_contacts": "True",
+            "prospectconnect_sync.sync_deals": "True",
+            "prospectconnect_sync.sync_tasks": "True",
+            "prospectconnect_sync.sync_notes": "True",
+        })
+
+    @classmethod
+    def _set_params(cls, params):
+        icp = cls.env["ir.config_parameter"].sudo()
+        for key, value in params.items():
+            icp.set_param(key, value)
+
+    def setUp(self):
+        super().setUp()
+        self.mock.reset_stats()
+
+    def _state(self, object_type):
+        State = self.env["pc.sync.state"]
+        return State.search([("object_type", "=", object_type), ("account_id", "=", False)], limit=1) or State.create(
+            {"object_type": object_type}
+        )
+
+    def _drain_pull(self, object_type, pull):
+        """Call ``pull`` until the mock has served every record once.
+
+        The pull cursor is advanced to the last record served so each cycle
+        fetches the next window, whatever page size the pull uses.
+        """
+        state = self._state(object_type)
+        state.last_pull_at = False
+        total = 0
+        while True:
+            served = self.mock.served_records
+            pull()
+            self.env["pc.sync.inbound"].process_staged()
+            fetched = self.mock.served_records - served
+            if not fetched:
+                return total
+            total += fetched
+            state.last_pull_at = datetime.fromisoformat(self.mock.last_served_at)
+
+    def _drain_jobs(self, limit=100):
+        """Process pending push jobs until the queue is empty."""
+        Job = self.env["pc.sync.job"]
+        processed = 0
+        while True:
+            pending = Job.search_count([("status", "=", "pending")])
+            if not pending:
+                return processed
+            Job.process_pending_jobs(limit=limit)
+            remaining = Job.search_count([("status", "=", "pending")])
+            if remaining >= pending:
+                return processed
+            processed += pending - remaining
+
+    # ------------- QUERY COUNTING -------------
+
+    @contextmanager
+    def _capture_queries(self):
+        """Collect the leading SQL keyword of every query run inside the block."""
+        keywords = []
+        execute = Cursor.execute
+
+        def _execute(cr, query, params=None, log_exceptions=True):
+            code = str(getattr(query, "code", query)).lstrip()
+            keywords.append(code.split(None, 1)[0].upper() if code else "")
+            return execute(cr, query, params, log_exceptions)
+
+        with patch.object(Cursor, "execute", _execute):
+            yield keywords
+
+    def assertQueryScaling(self, sizes, prepare, run, selects_per_record=0, writes_per_record=0, slack=2):
+        """Assert how SELECTs and writes grow with the batch size.
+
+        ``prepare(size)`` builds the fixture outside of the measurement and
+        ``run(fixture)`` executes the hot path. Going from the smallest to a
+        larger batch may add at most ``selects_per_record`` SELECTs (and
+        ``writes_per_record`` INSERT/UPDATE/DELETEs) per extra record, so a
+        ``selects_per_record`` of 0 asserts the lookups are constant in the
+        batch size.
+        """
+        counts = {}
+        for size in sizes:
+            fixture = prepare(size)
+            self.env.flush_all()
+            self.env.invalidate_all()
+            with self._capture_queries() as keywords:
+                run(fixture)
+                self.env.flush_all()
+            counts[size] = (
+                sum(1 for k in keywords if k in ("SELECT", "WITH")),
+                sum(1 for k in keywords if k in ("INSERT", "UPDATE", "DELETE")),
+            )
+        base = min(sizes)
+        for size in sizes:
+            extra = size - base
+            selects = counts[size][0] - counts[base][0]
+            writes = counts[size][1] - counts[base][1]
+            self.assertLessEqual(
+                selects, selects_per_record * extra + slack,
+                "%s SELECTs for %s extra records (counts by size: %s)" % (selects, extra, counts),
+            )
+            self.assertLessEqual(
+                writes, writes_per_record * extra + slack,
+                "%s writes for %s extra records (counts by size: %s)" % (writes, extra, counts),
+            )
+        return counts
+
+    def _apply(self, object_type, payloads):
+        """Apply pulled payloads the way the pull methods do."""
+        self.env["pc.sync.state"]._apply_batch(object_type, payloads)
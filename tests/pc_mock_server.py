@@ -0,0 +1,368 @@
+# prospectconnect_sync/tests/pc_mock_server.py
+"""Self-contained local stand-in for the ProspectConnect API.
+
+Only depends on the standard library so it can be used from the Odoo test
+suite (see ``common.py``) or started by hand against a development database::
+
+    python tests/pc_mock_server.py --port 8089 --contacts 10000 --latency 0.02
+
+then point ``prospectconnect_sync.base_url`` at ``http://127.0.0.1:8089``.
+"""
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# list endpoint -> in-memory collection it pages through
+LIST_ENDPOINTS = {
+    "/contact/getPaginatedContacts": "contacts",
+    "/deal/getDealsByBusinessId": "deals",
+    "/task/getTasksByBusinessId": "tasks",
+    "/note/getAllNotes": "notes",
+}
+
+
+class MockProspectConnect:
+    """In-memory ProspectConnect with configurable latency and failures.
+
+    :param latency: seconds slept before answering each request
+    :param error_rate: probability (0-1) of answering with HTTP 500
+    :param rate_limit: max requests per second before answering 429, or None
+    :param max_page_size: upper bound applied to the ``limit`` of list calls
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, rate_limit=None, max_page_size=100, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.max_page_size = max_page_size
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.store = {name: OrderedDict() for name in LIST_ENDPOINTS.values()}
+        self.users = []
+        self.pipelines = []
+        self.requests = Counter()
+        self.bytes_in = Counter()
+        self.bytes_out = Counter()
+        self.status_codes = Counter()
+        self._ids = itertools.count(1)
+        # Idempotency-Key -> id of the record it created
+        self.idempotency_keys = {}
+        self.honor_idempotency_keys = True
+        # Creates applied but answered with a gateway timeout, to simulate
+        # answers lost on the way back
+        self.lose_create_answers = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.served_records = 0
+        self.last_served_at = None
+        self.server = None
+        self.thread = None
+
+    # ------------- LIFECYCLE -------------
+
+    def start(self, host="127.0.0.1", port=0):
+        mock = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.mock = mock
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return "http://%s:%s" % (host, port)
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.bytes_in.clear()
+            self.bytes_out.clear()
+            self.status_codes.clear()
+            self.served_records = 0
+            self.last_served_at = None
+
+    # ------------- DATA -------------
+
+    def new_id(self, prefix):
+        return "%s%08d" % (prefix, next(self._ids))
+
+    def seed(self, contacts=0, deals=0, tasks=0, notes=0, users=5, stages=5, tags=20, start=None):
+        """Generate synthetic records, spaced one second apart by update time."""
+        # Whole seconds, like Odoo Datetime fields, so a stored pull cursor
+        # round-trips exactly.
+        start = (start or (datetime.utcnow() - timedelta(days=1))).replace(microsecond=0)
+        stamp = itertools.count()
+
+        def updated_at():
+            return (start + timedelta(seconds=next(stamp))).isoformat()
+
+        with self.lock:
+            self.users = [
+                {"_id": self.new_id("u"), "first_name": "User", "last_name": str(i), "email": "user%s@example.com" % i}
+                for i in range(users)
+            ]
+            pipeline_id = self.new_id("p")
+            self.pipelines = [{
+                "id": pipeline_id,
+                "name": "Sales",
+                "stages": [{"id": self.new_id("s"), "name": "Stage %s" % i} for i in range(stages)],
+            }]
+            tag_names = ["tag-%s" % i for i in range(tags)]
+            contact_ids = []
+            for i in range(contacts):
+                rec_id = self.new_id("c")
+                contact_ids.append(rec_id)
+                self.store["contacts"][rec_id] = {
+                    "id": rec_id,
+                    "firstName": "First%s" % i,
+                    "lastName": "Last%s" % i,
+                    "email": "contact%s@example.com" % i,
+                    "phone": "+1555%07d" % i,
+                    "address1": "%s Main Street" % i,
+                    "city": "Springfield",
+                    "postalCode": "12345",
+                    "state": "Illinois",
+                    "country": {"country_code": "US", "name": "United States"},
+                    "source": "benchmark",
+                    "tags": self.random.sample(tag_names, min(len(tag_names), 3)),
+                    "assignedTo": self.random.choice(self.users)["_id"] if self.users else None,
+                    "updatedAt": updated_at(),
+                }
+            deal_ids = []
+            stage_list = self.pipelines[0]["stages"]
+            for i in range(deals):
+                rec_id = self.new_id("d")
+                deal_ids.append(rec_id)
+                self.store["deals"][rec_id] = {
+                    "id": rec_id,
+                    "name": "Deal %s" % i,
+                    "value": 1000 + i,
+                    "status": "open",
+                    "contactId": self.random.choice(contact_ids) if contact_ids else None,
+                    "pipelineId": pipeline_id,
+                    "stageId": self.random.choice(stage_list)["id"] if stage_list else None,
+                    "assignedTo": self.random.choice(self.users)["_id"] if self.users else None,
+                    "updatedAt": updated_at(),
+                }
+            for i in range(tasks):
+                rec_id = self.new_id("t")
+                self.store["tasks"][rec_id] = {
+                    "id": rec_id,
+                    "name": "Task %s" % i,
+                    "description": "Follow up %s" % i,
+                    "due_date": (start + timedelta(days=7)).date().isoformat(),
+                    "completed": i % 4 == 0,
+                    "contact_ids": [self.random.choice(contact_ids)] if contact_ids else [],
+                    "deal_ids": [],
+                    "assignedTo": self.random.choice(self.users)["_id"] if self.users else None,
+                    "updatedAt": updated_at(),
+                }
+            for i in range(notes):
+                rec_id = self.new_id("n")
+                self.store["notes"][rec_id] = {
+                    "id": rec_id,
+                    "body": "<p>Note %s</p>" % i,
+                    "contactId": self.random.choice(contact_ids) if contact_ids else None,
+                    "updatedAt": updated_at(),
+                }
+
+    # ------------- REQUEST HANDLING -------------
+
+    def _throttled(self):
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count > self.rate_limit
+
+    def handle(self, method, path, body, headers=None):
+        """Return ``(status, payload, extra_headers)`` for one request."""
+        key = (headers or {}).get("Idempotency-Key")
+        with self.lock:
+            self.requests[path] += 1
+            throttled = self._throttled()
+            failed = self.error_rate and self.random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            return 429, {"message": "Too Many Requests"}, {"Retry-After": "1"}
+        if failed:
+            return 500, {"message": "Injected failure"}, {}
+
+        if path in LIST_ENDPOINTS:
+            return 200, self._list(LIST_ENDPOINTS[path], body), {}
+        handler = {
+            "/contact/addOrUpdateContact": self._upsert_contact,
+            "/contact/upsert": self._upsert_contact,
+            "/deal/addDeal": lambda b: self._create("deals", "d", b, key),
+            "/deal/updateDeal": lambda b: self._update("deals", b.get("dealId"), b),
+            "/task/createTask": lambda b: self._create("tasks", "t", b, key),
+            "/task/updateTask": lambda b: self._update("tasks", b.get("taskId"), b),
+            "/note/createNote": lambda b: self._create("notes", "n", b, key),
+            "/user/getUserList": lambda b: (200, {"users": self.users}),
+            "/deal/getPipelineList": lambda b: (200, {"data": self.pipelines}),
+        }.get(path)
+        if not handler:
+            return 404, {"message": "Unknown endpoint %s" % path}, {}
+        status, payload = handler(body)
+        return status, payload, {}
+
+    def _list(self, collection, body):
+        limit = min(int(body.get("limit") or self.max_page_size), self.max_page_size)
+        page = max(int(body.get("page") or 1), 1)
+        since = body.get("updatedAfter") or ""
+        with self.lock:
+            # Collections are kept in update order (see _touch) and isoformat
+            # strings of the same shape compare chronologically.
+            matching = [r for r in self.store[collection].values() if r["updatedAt"] > since]
+        offset = (page - 1) * limit
+        chunk = matching[offset:offset + limit]
+        with self.lock:
+            self.served_records += len(chunk)
+            if chunk:
+                self.last_served_at = chunk[-1]["updatedAt"]
+        return {
+            "data": chunk,
+            "page": page,
+            "limit": limit,
+            "total": len(matching),
+            "hasMore": offset + limit < len(matching),
+        }
+
+    def _upsert_contact(self, body):
+        data = body.get("data") or body
+        with self.lock:
+            existing = None
+            if data.get("email"):
+                existing = next(
+                    (c for c in self.store["contacts"].values() if c.get("email") == data["email"]), None
+                )
+            rec_id = existing["id"] if existing else self.new_id("c")
+            record = dict(existing or {}, **data, id=rec_id)
+            self._touch("contacts", rec_id, record)
+        return 200, {"data": {"id": rec_id}}
+
+    def _create(self, collection, prefix, body, key=None):
+        with self.lock:
+            if key and self.honor_idempotency_keys and key in self.idempotency_keys:
+                return 200, {"data": {"id": self.idempotency_keys[key]}}
+            rec_id = self.new_id(prefix)
+            self._touch(collection, rec_id, dict(body, id=rec_id))
+            if key:
+                self.idempotency_keys[key] = rec_id
+            if self.lose_create_answers:
+                self.lose_create_answers -= 1
+                return 504, {"message": "Gateway Timeout"}
+        return 200, {"data": {"id": rec_id}}
+
+    def _update(self, collection, rec_id, body):
+        with self.lock:
+            if rec_id not in self.store[collection]:
+                return 404, {"message": "Not found"}
+            self._touch(collection, rec_id, dict(self.store[collection][rec_id], **body))
+        return 200, {"data": {"id": rec_id}}
+
+
+    def _touch(self, collection, rec_id, record):
+        record["updatedAt"] = datetime.utcnow().isoformat()
+        self.store[collection][rec_id] = record
+        self.store[collection].move_to_end(rec_id)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            decoded = gzip.decompress(raw) if self.headers.get("Content-Encoding") == "gzip" else raw
+            body = json.loads(decoded) if decoded else {}
+        except ValueError:
+            body = {}
+        path = urlparse(self.path).path
+        status, payload, headers = self.mock.handle(method, path, body, headers=self.headers)
+        out = json.dumps(payload).encode()
+        if method == "GET" and status == 200:
+            # Conditional GET, as for the user and pipeline lists
+            etag = '"%s"' % hashlib.sha1(out).hexdigest()
+            headers = dict(headers, ETag=etag)
+            if self.headers.get("If-None-Match") == etag:
+                status, out = 304, b""
+        if out and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            out = gzip.compress(out)
+            headers = dict(headers, **{"Content-Encoding": "gzip"})
+        with self.mock.lock:
+            self.mock.bytes_in[path] += len(raw)
+            self.mock.bytes_out[path] += len(out)
+            self.mock.status_codes[status] += 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(out)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--contacts", type=int, default=1000)
+    parser.add_argument("--deals", type=int, default=0)
+    parser.add_argument("--tasks", type=int, default=0)
+    parser.add_argument("--notes", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    args = parser.parse_args()
+
+    mock = MockProspectConnect(
+        latency=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit
+    )
+    mock.seed(contacts=args.contacts, deals=args.deals, tasks=args.tasks, notes=args.notes)
+    print("Mock ProspectConnect listening on %s" % mock.start(args.host, args.port))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# prospectconnect_sync/tests/test_pc_accounts.py
+import hashlib
+import hmac
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from ..tools import PcTransport
+from .common import PcSyncCase
+from .pc_mock_server import MockProspectConnect
+
+
+@tagged("post_install", "-at_install")
+class TestPcAccounts(PcSyncCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.other_mock = MockProspectConnect()
+        cls.other_mock.start()
+        cls.addClassCleanup(cls.other_mock.stop)
+        cls.company = cls.env["res.company"].create({"name": "Second Company"})
+        cls.account = cls.env["pc.account"].create({
+            "name": "Second Account",
+            "company_id": cls.company.id,
+            "api_key": "other-key",
+            "base_url": cls.other_mock.base_url,
+        })
+
+    def setUp(self):
+        super().setUp()
+        self.other_mock.reset_stats()
+        self.Job = self.env["pc.sync.job"]
+        self.Job.search([]).unlink()
+
+    def test_jobs_are_routed_by_company(self):
+        shared = self.env["res.partner"].create({"name": "Shared Contact"})
+        own = self.env["res.partner"].create({"name": "Own Contact", "company_id": self.company.id})
+        jobs = self.Job.search([("odoo_model", "=", "res.partner")])
+        self.assertEqual(
+            {job.odoo_res_id: job.account_id for job in jobs},
+            {shared.id: self.env["pc.account"], own.id: self.account},
+        )
+
+        self.Job.process_pending_jobs()
+
+        def names(mock):
+            return {contact.get("name") for contact in mock.store["contacts"].values()}
+
+        self.assertIn("Own Contact", names(self.other_mock))
+        self.assertNotIn("Own Contact", names(self.mock))
+        self.assertIn("Shared Contact", names(self.mock))
+        self.assertNotIn("Shared Contact", names(self.other_mock))
+        self.assertEqual(own.pc_account_id, self.account, "the id is stored with the account it belongs to")
+        self.assertFalse(shared.pc_account_id)
+
+    def test_notes_follow_the_company_of_their_record(self):
+        lead = self.env["crm.lead"].create({
+            "name": "Own Deal", "type": "opportunity", "company_id": self.company.id,
+        })
+        lead.message_post(body="Call back next week", message_type="comment")
+        jobs = self.Job.search([("odoo_model", "in", ["crm.lead", "mail.message"])])
+        self.assertEqual(set(jobs.mapped("object_type")), {"deal", "note"})
+        self.assertEqual(jobs.account_id, self.account)
+
+    def test_pull_is_partitioned_per_account(self):
+        self.other_mock.seed(contacts=3)
+        self.addCleanup(self.other_mock.store["contacts"].clear)
+        State = self.env["pc.sync.state"]
+        State.run_pull("contact")
+        self.env["pc.sync.inbound"].process_staged()
+
+        state = State.search([("object_type", "=", "contact"), ("account_id", "=", self.account.id)])
+        self.assertTrue(state.last_pull_at)
+        self.assertNotEqual(state, self._state("contact"), "the default account keeps its own cursor")
+        partners = self.env["res.partner"].search([
+            ("pc_contact_id", "in", list(self.other_mock.store["contacts"])),
+            ("pc_account_id", "=", self.account.id),
+        ])
+        self.assertEqual(len(partners), 3)
+        self.assertEqual(partners.company_id, self.company)
+        self.assertFalse(self.Job.search([]), "pulled records are not pushed back")
+
+    def test_same_remote_id_in_two_accounts(self):
+        # Both accounts hand out the same ids for different records
+        for mock, name in ((self.mock, "Default Side"), (self.other_mock, "Second Side")):
+            mock._touch("contacts", "dup-1", {"id": "dup-1", "name": name})
+            mock._touch("deals", "dup-d-1", {"id": "dup-d-1", "name": name, "contactId": "dup-1"})
+            self.addCleanup(mock.store["contacts"].pop, "dup-1", None)
+            self.addCleanup(mock.store["deals"].pop, "dup-d-1", None)
+        State = self.env["pc.sync.state"]
+        for object_type in ("contact", "deal"):
+            State.run_pull(object_type)
+            self.env["pc.sync.inbound"].process_staged()
+
+        Account = self.env["pc.account"]
+        partners = self.env["res.partner"].search([("pc_contact_id", "=", "dup-1")])
+        self.assertEqual(
+            {(partner.pc_account_id, partner.name) for partner in partners},
+            {(Account, "Default Side"), (self.account, "Second Side")},
+        )
+        own = partners.filtered("pc_account_id")
+        self.assertEqual(own.company_id, self.company)
+        leads = self.env["crm.lead"].search([("pc_deal_id", "=", "dup-d-1")])
+        self.assertEqual(
+            {(lead.pc_account_id, lead.partner_id) for lead in leads},
+            {(Account, partners - own), (self.account, own)},
+            "each deal is linked to the contact of its own account",
+        )
+
+        State.with_context(pc_account_id=self.account.id)._apply_batch(
+            "contact", [{"id": "dup-1", "name": "Second Side Renamed"}]
+        )
+        self.assertEqual(own.name, "Second Side Renamed")
+        self.assertEqual((partners - own).name, "Default Side", "the other account's record is left alone")
+
+    def test_initial_export_per_account(self):
+        Partner = self.env["res.partner"].with_context(pc_skip_sync=True)
+        shared = Partner.create({"name": "Shared Export"})
+        own = Partner.create({"name": "Own Export", "company_id": self.company.id})
+        run = self.env["pc.sync.backfill"].create({
+            "include_deals": False, "include_tasks": False, "rate_limit": 0,
+        })
+        run.action_start()
+        # The second account is down: its contact is handed to the job queue
+        self.other_mock.error_rate = 1.0
+        self.addCleanup(setattr, self.other_mock, "error_rate", 0.0)
+        with patch.object(PcTransport, "_retry_delay", return_value=0):
+            run._process()
+
+        self.assertEqual(run.state, "done")
+        self.assertIn(shared.pc_contact_id, self.mock.store["contacts"])
+        self.assertFalse(shared.pc_account_id)
+        job = self.Job.search([("odoo_model", "=", "res.partner")])
+        self.assertEqual((job.odoo_res_id, job.status, job.account_id), (own.id, "failed", self.account))
+
+        self.other_mock.error_rate = 0.0
+        job.next_retry_at = False
+        self.Job.process_pending_jobs()
+        self.assertIn(own.pc_contact_id, self.other_mock.store["contacts"])
+        self.assertEqual(own.pc_account_id, self.account)
+
+    def test_bootstrap_imports_its_account(self):
+        self.other_mock.seed(contacts=3, deals=2)
+        self.addCleanup(self.other_mock.store["contacts"].clear)
+        self.addCleanup(self.other_mock.store["deals"].clear)
+        run = self.env["pc.sync.bootstrap"].create({
+            "account_id": self.account.id, "include_tasks": False, "include_notes": False, "workers": 1,
+        })
+        default_cursor = self._state("contact").last_pull_at
+        run.action_start()
+        run._process()
+
+        self.assertEqual(run.state, "done")
+        partners = self.env["res.partner"].search([("pc_contact_id", "in", list(self.other_mock.store["contacts"]))])
+        self.assertEqual(len(partners), 3)
+        self.assertEqual(partners.pc_account_id, self.account)
+        self.assertEqual(partners.company_id, self.company)
+        leads = self.env["crm.lead"].with_context(active_test=False).search([
+            ("pc_deal_id", "in", list(self.other_mock.store["deals"])),
+        ])
+        self.assertEqual(leads.pc_account_id, self.account)
+        state = self.env["pc.sync.state"].search([("object_type", "=", "contact"), ("account_id", "=", self.account.id)])
+        self.assertEqual(state.last_pull_at, run.started_at)
+        self.assertEqual(self._state("contact").last_pull_at, default_cursor, "the default account's cursor is left alone")
+
+    def test_webhooks_per_account(self):
+        self._set_params({"prospectconnect_sync.webhook_secret": "default-secret"})
+        self.account.webhook_secret = "other-secret"
+        body = b'{"id": "e1"}'
+        signature = hmac.new(b"other-secret", body, hashlib.sha256).hexdigest()
+        Job = self.Job.with_context(pc_account_id=self.account.id)
+        self.assertTrue(Job._verify_webhook_signature(body, signature))
+        self.assertFalse(self.Job._verify_webhook_signature(body, signature), "each account has its own secret")
+
+        def event(name):
+            return {"id": "acc-e-1", "type": "contact.updated", "data": {"id": "acc-wh-1", "name": name}}
+
+        # Same event and record ids in both accounts
+        self.assertEqual(self.Job._enqueue_webhook_events([event("Default Hook")]), (1, 0))
+        self.assertEqual(Job._enqueue_webhook_events([event("Own Hook")]), (1, 0))
+        jobs = self.Job.search([("direction", "=", "pc_to_odoo")])
+        self.assertEqual(len(jobs), 2, "jobs of different accounts are not coalesced")
+
+        self.Job.process_inbound_jobs()
+        partners = self.env["res.partner"].search([("pc_contact_id", "=", "acc-wh-1")])
+        self.assertEqual(
+            {(partner.pc_account_id, partner.company_id, partner.name) for partner in partners},
+            {
+                (self.env["pc.account"], self.env["res.company"], "Default Hook"),
+                (self.account, self.company, "Own Hook"),
+            },
+        )
+
+    def test_deferred_rows_are_requeued_per_account(self):
+        Inbound = self.env["pc.sync.inbound"]
+        note = {"id": "acc-n-1", "body": "<p>Later</p>", "contactId": "acc-c-missing"}
+        Inbound._defer("note", [note])
+        Inbound.with_context(pc_account_id=self.account.id)._defer("note", [note])
+
+        self.assertEqual(Inbound.with_context(pc_account_id=self.account.id)._requeue_deferred("note"), 1)
+        rows = Inbound.search([("remote_id", "=", "acc-n-1")])
+        self.assertEqual(
+            {(row.account_id, row.state) for row in rows},
+            {(self.env["pc.account"], "deferred"), (self.account, "pending")},
+        )
+
+    def test_contacts_match_partners_of_their_company(self):
+        Partner = self.env["res.partner"].with_context(pc_skip_sync=True)
+        other = Partner.create({"name": "Other Company", "email": "same@example.com", "company_id": self.company.id})
+        shared = Partner.create({"name": "No Company", "email": "shared@example.com"})
+        State = self.env["pc.sync.state"]
+
+        State._apply_batch("contact", [{"id": "cm-1", "name": "Default", "email": "same@example.com"}])
+        self.assertFalse(other.pc_contact_id, "partners of another account's company are not matched")
+        State.with_context(pc_account_id=self.account.id)._apply_batch(
+            "contact", [
+                {"id": "cm-2", "name": "Second", "email": "same@example.com"},
+                {"id": "cm-3", "name": "Second Shared", "email": "shared@example.com"},
+            ]
+        )
+        self.assertEqual(other.pc_contact_id, "cm-2")
+        self.assertEqual(shared.pc_contact_id, "cm-3", "partners without company are matched by every account")
+
+    def test_mappings_remap_records_of_their_account(self):
+        user = self.env.ref("base.user_admin")
+        user.company_ids |= self.company
+        Lead = self.env["crm.lead"].with_context(pc_skip_sync=True)
+        vals = {"type": "opportunity", "user_id": False, "pc_remote_assignee_id": "u-same"}
+        default_lead = Lead.create(dict(vals, name="Default Deal"))
+        own_lead = Lead.create(dict(vals, name="Own Deal", company_id=self.company.id))
+
+        self.env["pc.user.mapping"].create({
+            "pc_user_id": "u-same", "odoo_user_id": user.id, "account_id": self.account.id,
+        })
+        self.assertEqual(own_lead.user_id, user)
+        self.assertFalse(default_lead.user_id, "the same remote user id of another account is left alone")
+
+    def test_breakers_are_per_account(self):
+        # The default account's contacts endpoints are down
+        self.env.cr.execute("""
+            INSERT INTO pc_sync_breaker (family, state, failure_count, opened_at)
+            VALUES ('contact', 'open', 5, now() AT TIME ZONE 'UTC')
+        """)
+        shared = self.env["res.partner"].create({"name": "Shared Contact"})
+        own = self.env["res.partner"].create({"name": "Own Contact", "company_id": self.company.id})
+        self.Job.process_pending_jobs()
+        self.assertFalse(shared.pc_contact_id)
+        self.assertTrue(own.pc_contact_id, "an outage of one account does not stop the others")
+
+    def test_task_mappings_are_per_account(self):
+        call = self.env.ref("mail.mail_activity_data_call")
+        Mapping = self.env["pc.task.type.mapping"]
+        Mapping.create({"odoo_activity_type_id": call.id, "pc_task_type_id": "t-call", "account_id": self.account.id})
+        self.assertEqual(Mapping._get_type_map(self.account.id), {"t-call": call.id})
+        self.assertNotIn("t-call", Mapping._get_type_map())
+
+    def test_credentials_per_account(self):
+        Account = self.env["pc.account"]
+        self.assertEqual(Account._get_credentials(), ("test-key", self.mock.base_url))
+        self.assertEqual(self.account._get_credentials(), ("other-key", self.other_mock.base_url))
+        base_url, headers = self.Job.with_context(pc_account_id=self.account.id)._get_api_context()
+        self.assertEqual(base_url, self.other_mock.base_url.rstrip("/"))
+        self.assertEqual(headers["Authorization"], "other-key")
+        self.assertEqual(Account._param_key("mapping_users_etag"), "prospectconnect_sync.mapping_users_etag")
@@ -0,0 +1,46 @@
+# prospectconnect_sync/tests/test_pc_backfill.py
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcBackfill(PcSyncCase):
+
+    def test_export_without_jobs(self):
+        Partner = self.env["res.partner"].with_context(pc_skip_sync=True)
+        partners = Partner.create([
+            {"name": "Backfill %s" % i, "email": "backfill%s@example.com" % i} for i in range(12)
+        ])
+        lead = self.env["crm.lead"].with_context(pc_skip_sync=True).create(
+            {"name": "Backfill Deal", "type": "opportunity", "partner_id": partners[0].id}
+        )
+        run = self.env["pc.sync.backfill"].create({"chunk_size": 5, "concurrency": 4, "rate_limit": 0})
+        run.action_start()
+        run._process()
+
+        self.assertEqual(run.state, "done")
+        self.assertTrue(all(partners.mapped("pc_contact_id")))
+        self.assertTrue(lead.pc_deal_id)
+        self.assertEqual(
+            self.mock.store["deals"][lead.pc_deal_id]["contactId"], partners[0].pc_contact_id,
+            "contacts are exported before the deals referencing them",
+        )
+        self.assertEqual(run.pushed_count, run.total_count)
+        self.assertFalse(self.env["pc.sync.job"].search_count([]), "no job is queued per record")
+
+    def test_resume_from_checkpoint(self):
+        Partner = self.env["res.partner"].with_context(pc_skip_sync=True)
+        partners = Partner.create([{"name": "Resume %s" % i} for i in range(6)])
+        run = self.env["pc.sync.backfill"].create({
+            "include_deals": False,
+            "include_tasks": False,
+            "rate_limit": 0,
+        })
+        run.action_start()
+        # As if interrupted after the first three partners
+        run.write({"last_object_type": "contact", "last_id": partners[2].id})
+        run._process()
+
+        self.assertFalse(any(partners[:3].mapped("pc_contact_id")))
+        self.assertTrue(all(partners[3:].mapped("pc_contact_id")))
@@ -0,0 +1,134 @@
+# prospectconnect_sync/tests/test_pc_benchmark.py
+"""End-to-end throughput benchmarks against the local mock server.
+
+Not part of the standard run; select them explicitly::
+
+    odoo-bin -d bench -i prospectconnect_sync --test-tags /prospectconnect_sync:pc_benchmark
+
+``PC_BENCH_SIZES`` (comma separated, default ``10000``) controls how many
+remote records are seeded, ``PC_BENCH_LATENCY`` adds per-request latency to
+the mock and ``PC_BENCH_OUTPUT`` writes the results as JSON so two releases
+can be compared.
+"""
+import gc
+import json
+import logging
+import os
+import resource
+import time
+import tracemalloc
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+_logger = logging.getLogger(__name__)
+
+
+def _bench_sizes():
+    raw = os.environ.get("PC_BENCH_SIZES", "10000")
+    return [int(size) for size in raw.split(",") if size.strip()]
+
+
+@tagged("post_install", "-at_install", "-standard", "pc_benchmark")
+class TestPcBenchmark(PcSyncCase):
+    mock_options = {"latency": float(os.environ.get("PC_BENCH_LATENCY", "0"))}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        output = os.environ.get("PC_BENCH_OUTPUT")
+        if output and cls.results:
+            with open(output, "w") as fh:
+                json.dump(cls.results, fh, indent=2)
+        super().tearDownClass()
+
+    def _measure(self, name, size, func, trace=False):
+        """Run ``func`` (returning the number of records handled) and record stats."""
+        gc.collect()
+        trace = trace or os.environ.get("PC_BENCH_TRACEMALLOC") == "1"
+        if trace:
+            tracemalloc.start()
+        self.env.flush_all()
+        queries_before = self.env.cr.sql_log_count
+        started = time.perf_counter()
+        count = func()
+        self.env.flush_all()
+        elapsed = time.perf_counter() - started
+        queries = self.env.cr.sql_log_count - queries_before
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+        if trace:
+            tracemalloc.stop()
+        result = {
+            "benchmark": name,
+            "size": size,
+            "records": count,
+            "seconds": round(elapsed, 3),
+            "records_per_sec": round(count / elapsed, 1) if elapsed else None,
+            "queries": queries,
+            "queries_per_record": round(queries / count, 2) if count else None,
+            "peak_python_bytes": peak,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "http_requests": sum(self.mock.requests.values()),
+            "http_bytes_out": sum(self.mock.bytes_out.values()),
+        }
+        self.results.append(result)
+        _logger.info("ProspectConnect benchmark %s", json.dumps(result))
+        return result
+
+    def test_pull_contacts(self):
+        for size in _bench_sizes():
+            with self.subTest(size=size):
+                self.mock.store["contacts"].clear()
+                self.mock.seed(contacts=size)
+                self.mock.reset_stats()
+                State = self.env["pc.sync.state"]
+                result = self._measure(
+                    "pull_contacts", size, lambda: self._drain_pull("contact", State._pull_contacts)
+                )
+                self.assertEqual(result["records"], size)
+
+    def test_pull_deals(self):
+        for size in _bench_sizes():
+            with self.subTest(size=size):
+                self.mock.store["deals"].clear()
+                self.mock.seed(deals=size)
+                self.mock.reset_stats()
+                State = self.env["pc.sync.state"]
+                result = self._measure(
+                    "pull_deals", size, lambda: self._drain_pull("deal", State._pull_deals)
+                )
+                self.assertEqual(result["records"], size)
+
+    def test_push_contacts(self):
+        for size in _bench_sizes():
+            with self.subTest(size=size):
+                self.env["res.partner"].create([
+                    {"name": "Bench %s" % i, "email": "bench%s-%s@example.com" % (size, i)}
+                    for i in range(size)
+                ])
+                self.mock.reset_stats()
+                result = self._measure("push_contacts", size, self._drain_jobs)
+                self.assertEqual(result["records"], size)
+
+    def test_apply_memory(self):
+        """Peak Python memory of applying staged contacts does not grow
+        with the number of records."""
+        sizes = sorted(set(_bench_sizes()) | {1000})
+        Inbound = self.env["pc.sync.inbound"]
+        peaks = {}
+        for size in sizes:
+            with self.subTest(size=size):
+                self.mock.store["contacts"].clear()
+                self.mock.seed(contacts=size)
+                Inbound._stage("contact", list(self.mock.store["contacts"].values()))
+                result = self._measure("apply_contacts", size, Inbound.process_staged, trace=True)
+                self.assertEqual(result["records"], size)
+                peaks[size] = result["peak_python_bytes"]
+        # Leeway for allocator noise: without chunking the peak grows with
+        # every record applied
+        self.assertLess(peaks[sizes[-1]], peaks[sizes[0]] * 2 + 8 * 1024 * 1024)
@@ -0,0 +1,96 @@
+# prospectconnect_sync/tests/test_pc_bootstrap.py
+from unittest.mock import patch
+
+from psycopg2.errors import SerializationFailure
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcBootstrap(PcSyncCase):
+
+    def test_full_load(self):
+        self.mock.seed(contacts=25, deals=15, tasks=8, notes=8)
+        Partner = self.env["res.partner"]
+        known = Partner.with_context(pc_skip_sync=True).create(
+            {"name": "Known", "email": "contact0@example.com"}
+        )
+        run = self.env["pc.sync.bootstrap"].create({"page_size": 10, "chunk_size": 7, "workers": 1})
+        run.action_start()
+        run._process()
+
+        self.assertEqual(run.state, "done")
+        self.assertEqual((run.total_count, run.staged_count, run.merged_count), (56, 56, 56))
+        self.assertEqual(run.progress, 100)
+        self.assertFalse(self.env["pc.sync.bootstrap.line"].search_count([]))
+
+        partners = Partner.search([("pc_contact_id", "!=", False)])
+        self.assertEqual(len(partners), 25)
+        self.assertIn(known, partners, "existing partners are linked, not duplicated")
+        self.assertEqual(known.name, "First0 Last0")
+        for partner in partners:
+            # Stored computed fields are filled as by a regular create
+            self.assertEqual(partner.commercial_partner_id, partner)
+            self.assertEqual(partner.complete_name, partner.name)
+            self.assertTrue(partner.pc_email_key)
+            self.assertEqual(partner.country_id.code, "US")
+            self.assertEqual(len(partner.category_id), 3)
+
+        leads = self.env["crm.lead"].with_context(active_test=False).search([("pc_deal_id", "!=", False)])
+        self.assertEqual(len(leads), 15)
+        self.assertTrue(all(lead.partner_id in partners for lead in leads))
+        self.assertTrue(all(lead.stage_id for lead in leads))
+        self.assertEqual(
+            self.env["mail.activity"].with_context(active_test=False).search_count([("pc_task_id", "!=", False)]), 8
+        )
+        self.assertEqual(self.env["mail.message"].search_count([("pc_note_id", "!=", False)]), 8)
+        self.assertEqual(self._state("contact").last_pull_at, run.started_at)
+        self.assertFalse(self.env["pc.sync.job"].search_count([]), "merged records are not pushed back")
+
+    def test_colliding_chunk_is_merged_again(self):
+        self.mock.seed(contacts=6)
+        self.addCleanup(self.mock.store["contacts"].clear)
+        Bootstrap = type(self.env["pc.sync.bootstrap"])
+        merge_contact_chunk = Bootstrap._merge_contact_chunk
+        calls = []
+
+        def collide_once(self, line_ids):
+            calls.append(len(line_ids))
+            merge_contact_chunk(self, line_ids)
+            if len(calls) == 1:
+                raise SerializationFailure("could not serialize access due to concurrent update")
+
+        run = self.env["pc.sync.bootstrap"].create({
+            "page_size": 10, "chunk_size": 4, "workers": 1,
+            "include_deals": False, "include_tasks": False, "include_notes": False,
+        })
+        run.action_start()
+        with patch.object(Bootstrap, "_merge_contact_chunk", collide_once):
+            run._process()
+        self.assertEqual(run.state, "done")
+        self.assertEqual(calls, [4, 4, 2], "the rolled back chunk is merged again")
+        self.assertEqual(run.merged_count, 6)
+        self.assertEqual(self.env["res.partner"].search_count([("pc_contact_id", "!=", False)]), 6)
+
+    def test_mappings_of_other_accounts_are_ignored(self):
+        self.mock.seed(contacts=2, users=1)
+        self.addCleanup(self.mock.store["contacts"].clear)
+        pc_user_id = self.mock.users[0]["_id"]
+        company = self.env["res.company"].create({"name": "Bootstrap Other Company"})
+        account = self.env["pc.account"].create({
+            "name": "Other Account", "company_id": company.id, "api_key": "other-key",
+        })
+        self.env["pc.user.mapping"].create({
+            "pc_user_id": pc_user_id, "odoo_user_id": self.env.ref("base.user_admin").id, "account_id": account.id,
+        })
+        run = self.env["pc.sync.bootstrap"].create({
+            "include_deals": False, "include_tasks": False, "include_notes": False, "workers": 1,
+        })
+        run.action_start()
+        run._process()
+
+        partners = self.env["res.partner"].search([("pc_remote_assignee_id", "=", pc_user_id)])
+        self.assertEqual(len(partners), 2)
+        self.assertFalse(partners.pc_assigned_user_id, "the same remote user of another account is not mapped")
@@ -0,0 +1,80 @@
+# prospectconnect_sync/tests/test_pc_breaker.py
+from unittest.mock import patch
+
+import requests
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcBreaker(PcSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self._set_params({
+            "prospectconnect_sync.breaker_threshold": "2",
+            "prospectconnect_sync.breaker_cooldown": "60",
+        })
+        self.Job = self.env["pc.sync.job"]
+        self.Job.search([]).unlink()
+        partners = self.env["res.partner"].with_context(pc_skip_sync=True).create(
+            [{"name": "Outage %s" % i} for i in range(5)]
+        )
+        self.jobs = self.Job.create([
+            {
+                "direction": "odoo_to_pc",
+                "object_type": "contact",
+                "odoo_model": "res.partner",
+                "odoo_res_id": partner.id,
+            }
+            for partner in partners
+        ])
+
+    def _breaker(self):
+        self.env["pc.sync.breaker"].invalidate_model()
+        return self.env["pc.sync.breaker"].search([("family", "=", "contact")])
+
+    def test_open_skips_calls(self):
+        down = requests.ConnectionError("connection refused")
+        with patch.object(type(self.Job), "_run_single_job", side_effect=down) as run:
+            self.Job.process_pending_jobs()
+        self.assertEqual(run.call_count, 2, "calls stop once the breaker opens")
+        self.assertEqual(self._breaker().state, "open")
+        self.assertEqual(self.jobs.mapped("retry_count"), [1, 1, 0, 0, 0])
+        self.assertEqual(self.jobs[2:].mapped("status"), ["pending"] * 3)
+
+    def test_half_open_probe_closes(self):
+        down = requests.ConnectionError("connection refused")
+        with patch.object(type(self.Job), "_run_single_job", side_effect=down):
+            self.Job.process_pending_jobs()
+        # As if the cool-down and the retry backoff had elapsed
+        self.env.cr.execute(
+            "UPDATE pc_sync_breaker SET opened_at = opened_at - interval '5 minutes' WHERE family = 'contact'"
+        )
+        self.jobs.next_retry_at = False
+        self.Job.process_pending_jobs()
+        self.assertEqual(self._breaker().state, "closed")
+        self.assertEqual(set(self.jobs.mapped("status")), {"done"})
+
+    def test_rejected_request_does_not_trip(self):
+        with patch.object(type(self.Job), "_run_single_job", side_effect=ValueError("bad payload")) as run:
+            self.Job.process_pending_jobs()
+        self.assertEqual(run.call_count, 5)
+        self.assertFalse(self._breaker().filtered(lambda b: b.state != "closed"))
+
+    def test_batch_reads_state_once(self):
+        Breaker = type(self.env["pc.sync.breaker"])
+        with patch.object(Breaker, "_cursor", autospec=True, side_effect=Breaker._cursor) as cursor:
+            self.Job.process_pending_jobs()
+        self.assertEqual(set(self.jobs.mapped("status")), {"done"})
+        self.assertEqual(cursor.call_count, 1, "a healthy batch reads the breakers once and writes nothing")
+
+        down = requests.ConnectionError("connection refused")
+        self.jobs.write({"status": "pending"})
+        with patch.object(type(self.Job), "_run_single_job", side_effect=down), \
+                patch.object(Breaker, "_cursor", autospec=True, side_effect=Breaker._cursor) as cursor:
+            self.Job.process_pending_jobs()
+        self.assertEqual(cursor.call_count, 2, "one read, one write when the breaker opens")
+        self.assertEqual(self._breaker().failure_count, 2)
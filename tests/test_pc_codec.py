@@ -0,0 +1,35 @@
+# prospectconnect_sync/tests/test_pc_codec.py
+from odoo.tests import tagged
+
+from ..tools import json_dumps, json_loads
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcCodec(PcSyncCase):
+
+    def test_roundtrip(self):
+        payload = {"body": "<p>Café ✓</p>", "value": 12.5, "tags": ["a", "b"], "empty": None}
+        self.assertEqual(json_loads(json_dumps(payload)), payload)
+
+    def test_compressed_request_bodies(self):
+        self._set_params({"prospectconnect_sync.compress_requests": "True"})
+        partner = self.env["res.partner"].create({
+            "name": "Gzip Contact",
+            "email": "gzip@example.com",
+            "street": "x" * 2000,
+        })
+        self.env["pc.sync.job"].process_pending_jobs()
+        self.assertTrue(partner.pc_contact_id)
+        self.assertEqual(self.mock.store["contacts"][partner.pc_contact_id]["address1"], "x" * 2000)
+
+    def test_profiled_run_reports_wire_bytes(self):
+        self.env["res.partner"].create({"name": "Wire Contact", "email": "wire@example.com"})
+        Job = self.env["pc.sync.job"].with_context(pc_profile="timing")
+        Job.process_pending_jobs()
+        run = self.env["pc.sync.run"].search([], order="id desc", limit=1)
+        endpoint = run.endpoint_ids.filtered(lambda e: e.path == "/contact/addOrUpdateContact")
+        self.assertEqual(endpoint.calls, 1)
+        self.assertGreater(endpoint.bytes_sent, 0)
+        self.assertGreater(endpoint.bytes_received, 0)
+        self.assertEqual(run.bytes_received, sum(run.endpoint_ids.mapped("bytes_received")))
@@ -0,0 +1,37 @@
+# prospectconnect_sync/tests/test_pc_contact_matching.py
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcContactMatching(PcSyncCase):
+
+    def test_match_keys_normalized(self):
+        partner = self.env["res.partner"].create({
+            "name": "Key Test",
+            "email": "Key Test <Key.Test@Example.COM>",
+            "phone": "+1 (650) 253-0000",
+        })
+        self.assertEqual(partner.pc_email_key, "key.test@example.com")
+        self.assertEqual(partner.pc_phone_key, "+16502530000")
+
+    def test_existing_partners_linked_before_create(self):
+        Partner = self.env["res.partner"].with_context(pc_skip_sync=True)
+        by_email = Partner.create({"name": "By Email", "email": "match@example.com"})
+        by_phone = Partner.create({"name": "By Phone", "phone": "+1 650 253 0001"})
+        linked = Partner.create({"name": "Linked", "email": "taken@example.com", "pc_contact_id": "other"})
+
+        self._apply("contact", [
+            {"id": "m-1", "firstName": "A", "lastName": "B", "email": "MATCH@example.com"},
+            {"id": "m-2", "firstName": "C", "lastName": "D", "phone": "+16502530001"},
+            {"id": "m-3", "firstName": "E", "lastName": "F", "email": "match@example.com"},
+            {"id": "m-4", "firstName": "G", "lastName": "H", "email": "taken@example.com"},
+        ])
+
+        self.assertEqual(by_email.pc_contact_id, "m-1")
+        self.assertEqual(by_phone.pc_contact_id, "m-2")
+        self.assertEqual(linked.pc_contact_id, "other", "linked partners are never re-linked")
+        created = Partner.search([("pc_contact_id", "in", ["m-3", "m-4"])])
+        self.assertEqual(len(created), 2, "a partner is linked to a single contact")
+        self.assertNotIn(by_email, created)
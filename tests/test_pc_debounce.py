@@ -0,0 +1,87 @@
+# prospectconnect_sync/tests/test_pc_debounce.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcDebounce(PcSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Job = self.env["pc.sync.job"]
+        self.Job.search([]).unlink()
+
+    def _release(self, jobs):
+        """Pretend the debounce window of ``jobs`` has elapsed."""
+        jobs.eligible_at = fields.Datetime.now() - timedelta(seconds=1)
+
+    def test_burst_of_edits_is_pushed_once(self):
+        self._set_params({"prospectconnect_sync.debounce_deal": "30"})
+        lead = self.env["crm.lead"].create({"name": "Burst Deal", "type": "opportunity"})
+        lead.expected_revenue = 1000
+        lead.stage_id = self.env["crm.stage"].search([], limit=1, order="sequence desc")
+        lead.name = "Burst Deal (renamed)"
+
+        job = self.Job.search([("odoo_model", "=", "crm.lead"), ("odoo_res_id", "=", lead.id)])
+        self.assertEqual(len(job), 1, "the edits share one job")
+        self.assertGreater(job.eligible_at, fields.Datetime.now())
+
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "pending", "the record is not quiet yet")
+        self.assertFalse(sum(self.mock.requests.values()))
+
+        self._release(job)
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(sum(self.mock.requests.values()), 1)
+        self.assertEqual(self.mock.store["deals"][lead.pc_deal_id]["name"], "Burst Deal (renamed)")
+
+    def test_max_delay_caps_the_window(self):
+        self._set_params({
+            "prospectconnect_sync.debounce_contact": "60",
+            "prospectconnect_sync.debounce_max_delay": "5",
+        })
+        partner = self.env["res.partner"].create({"name": "Busy Contact"})
+        job = self.Job.search([("odoo_model", "=", "res.partner"), ("odoo_res_id", "=", partner.id)])
+        self.assertLessEqual(job.eligible_at, fields.Datetime.now() + timedelta(seconds=5))
+
+        # Queued long ago and edited ever since: the next edit does not
+        # postpone it any further
+        self.env.cr.execute(
+            "UPDATE pc_sync_job SET create_date = create_date - interval '10 minutes' WHERE id = %s",
+            [job.id],
+        )
+        job.invalidate_recordset(["create_date"])
+        partner.phone = "+15550003333"
+        self.assertLessEqual(job.eligible_at, fields.Datetime.now())
+
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "done")
+        self.assertTrue(partner.pc_contact_id)
+
+    def test_no_window_pushes_on_next_run(self):
+        partner = self.env["res.partner"].create({"name": "Plain Contact"})
+        partner.phone = "+15550004444"
+        job = self.Job.search([("odoo_model", "=", "res.partner"), ("odoo_res_id", "=", partner.id)])
+        self.assertEqual(len(job), 1)
+        self.assertFalse(job.eligible_at)
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "done")
+
+    def test_edit_during_push_queues_a_new_job(self):
+        self._set_params({"prospectconnect_sync.debounce_contact": "30"})
+        partner = self.env["res.partner"].create({"name": "Pushed Contact"})
+        job = self.Job.search([("odoo_model", "=", "res.partner"), ("odoo_res_id", "=", partner.id)])
+        eligible_at = job.eligible_at
+
+        # A worker is pushing the job: it is neither waited for nor postponed
+        with patch.object(type(self.Job), "_lock_free", lambda jobs: jobs.browse()):
+            partner.phone = "+15550005555"
+        jobs = self.Job.search([("odoo_model", "=", "res.partner"), ("odoo_res_id", "=", partner.id)])
+        self.assertEqual(len(jobs), 2, "the edit gets a job of its own")
+        self.assertEqual(job.eligible_at, eligible_at)
@@ -0,0 +1,62 @@
+# prospectconnect_sync/tests/test_pc_idempotency.py
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcIdempotency(PcSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Job = self.env["pc.sync.job"]
+        self.Job.search([]).unlink()
+        self.addCleanup(setattr, self.mock, "honor_idempotency_keys", True)
+        self.addCleanup(setattr, self.mock, "lose_create_answers", 0)
+
+    def _create_deal_losing_answer(self, name):
+        """Create an opportunity whose first push is applied remotely but
+        answered with a timeout."""
+        self.mock.lose_create_answers = 1
+        lead = self.env["crm.lead"].create({"name": name, "type": "opportunity"})
+        job = self.Job.search([("odoo_model", "=", "crm.lead"), ("odoo_res_id", "=", lead.id)])
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "failed")
+        self.assertFalse(lead.pc_deal_id)
+        # As if the retry backoff had elapsed
+        job.next_retry_at = False
+        key = self.Job._get_idempotency_key(lead)
+        remote = [deal for deal in self.mock.store["deals"].values() if deal.get("externalId") == key]
+        self.assertEqual(len(remote), 1, "the create was applied remotely")
+        return lead, job, remote[0]["id"]
+
+    def test_retry_finds_the_created_record(self):
+        self.mock.honor_idempotency_keys = False
+        lead, job, pc_id = self._create_deal_losing_answer("Lost Answer Deal")
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(lead.pc_deal_id, pc_id)
+        self.assertEqual(self.mock.requests["/deal/addDeal"], 1, "not created a second time")
+
+    def test_resent_create_is_deduplicated_by_key(self):
+        lead, job, pc_id = self._create_deal_losing_answer("Resent Deal")
+        # The worker died before recording the failure: nothing tells the
+        # job it was attempted, the key alone prevents the duplicate
+        job.write({"status": "pending", "retry_count": 0})
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(lead.pc_deal_id, pc_id)
+        self.assertEqual(self.mock.requests["/deal/addDeal"], 2)
+        self.assertEqual(len(self.mock.store["deals"]), 1)
+
+    def test_pull_links_the_record_it_came_from(self):
+        self.mock.honor_idempotency_keys = False
+        lead, job, pc_id = self._create_deal_losing_answer("Pulled Back Deal")
+        self._drain_pull("deal", self.env["pc.sync.state"]._pull_deals)
+        self.assertEqual(lead.pc_deal_id, pc_id)
+        self.assertEqual(
+            self.env["crm.lead"].with_context(active_test=False).search_count([("pc_deal_id", "=", pc_id)]), 1
+        )
+        self.Job.process_pending_jobs()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(self.mock.requests["/deal/addDeal"], 1)
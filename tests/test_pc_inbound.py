@@ -0,0 +1,90 @@
+# prospectconnect_sync/tests/test_pc_inbound.py
+from odoo.tests import tagged
+
+from ..models.pc_sync_inbound import MAX_ATTEMPTS
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcInbound(PcSyncCase):
+
+    def test_latest_version_applied_once(self):
+        Inbound = self.env["pc.sync.inbound"]
+        Inbound._stage("contact", [{"id": "in-1", "name": "Old", "city": "A"}])
+        Inbound._stage("contact", [{"id": "in-1", "name": "New", "city": "B"}])
+        self.assertEqual(Inbound.search_count([("remote_id", "=", "in-1")]), 1)
+
+        self.assertEqual(Inbound.process_staged(), 1)
+        partner = self.env["res.partner"].search([("pc_contact_id", "=", "in-1")])
+        self.assertEqual((partner.name, partner.city), ("New", "B"))
+        self.assertFalse(Inbound.search_count([]), "applied rows leave the queue")
+
+    def test_failed_rows_kept_for_retry(self):
+        Inbound = self.env["pc.sync.inbound"]
+        Inbound._stage("deal", [
+            {"id": "in-d-1", "name": "Good", "value": 10},
+            {"id": "in-d-2", "name": "Bad", "value": "not a number"},
+        ])
+        Inbound.process_staged()
+        self.assertTrue(self.env["crm.lead"].search([("pc_deal_id", "=", "in-d-1")]))
+        failed = Inbound.search([])
+        self.assertEqual(failed.remote_id, "in-d-2")
+        self.assertEqual((failed.state, failed.attempts), ("failed", 1))
+
+    def test_pull_stages_then_applies(self):
+        self.mock.seed(contacts=5)
+        self.env["pc.sync.state"]._pull_contacts()
+        self.assertEqual(self.env["pc.sync.inbound"].search_count([("object_type", "=", "contact")]), 5)
+        self.env["pc.sync.inbound"].process_staged()
+        self.assertEqual(self.env["res.partner"].search_count([("pc_contact_id", "!=", False)]), 5)
+
+    def test_unresolved_notes_deferred(self):
+        Inbound = self.env["pc.sync.inbound"]
+        Inbound._stage("note", [{"id": "in-n-1", "body": "<p>Later</p>", "contactId": "in-c-9"}])
+        Inbound.process_staged()
+        deferred = Inbound.search([("remote_id", "=", "in-n-1")])
+        self.assertEqual(deferred.state, "deferred", "notes without a target are kept")
+
+        Inbound._stage("contact", [{"id": "in-c-9", "name": "Late Contact"}])
+        Inbound.process_staged()
+        partner = self.env["res.partner"].search([("pc_contact_id", "=", "in-c-9")])
+        note = self.env["mail.message"].search([("pc_note_id", "=", "in-n-1")])
+        self.assertEqual((note.model, note.res_id), ("res.partner", partner.id))
+        self.assertFalse(Inbound.search_count([]))
+
+    def test_deferred_rows_are_given_up_on(self):
+        Inbound = self.env["pc.sync.inbound"]
+        Inbound._stage("note", [{"id": "in-n-2", "body": "<p>Never</p>", "contactId": "in-c-gone"}])
+        Inbound.process_staged()
+        row = Inbound.search([("remote_id", "=", "in-n-2")])
+        for _attempt in range(MAX_ATTEMPTS - 1):
+            self.assertEqual(Inbound._requeue_deferred("note"), 1)
+            Inbound.process_staged()
+            self.assertEqual(row.state, "deferred", "deferring again keeps the row")
+        self.assertEqual(Inbound._requeue_deferred("note"), 0)
+        row.invalidate_recordset()
+        self.assertEqual((row.state, row.attempts), ("failed", MAX_ATTEMPTS))
+        self.assertFalse(Inbound._claim("note", 10), "rows given up on are not applied again")
+
+    def test_tasks_use_mappings_and_archive_done(self):
+        call = self.env.ref("mail.mail_activity_data_call")
+        self.env["pc.task.type.mapping"].create({"odoo_activity_type_id": call.id, "pc_task_type_id": "tt-call"})
+        self.env["pc.task.status.mapping"].create({"odoo_state": "done", "pc_task_status_id": "ts-closed"})
+        partner = self.env["res.partner"].create({"name": "Task Target", "pc_contact_id": "in-c-t"})
+        self._apply("task", [
+            {"id": "in-t-1", "name": "Call", "type": "tt-call", "contact_ids": ["in-c-t"]},
+            {"id": "in-t-2", "name": "Closed", "status": "ts-closed", "contact_ids": ["in-c-t"]},
+            {"id": "in-t-3", "name": "Orphan", "contact_ids": ["in-c-missing"]},
+        ])
+        Activity = self.env["mail.activity"].with_context(active_test=False)
+        open_task = Activity.search([("pc_task_id", "=", "in-t-1")])
+        self.assertEqual((open_task.activity_type_id, open_task.res_id), (call, partner.id))
+        done_task = Activity.search([("pc_task_id", "=", "in-t-2")])
+        self.assertFalse(done_task.active)
+        self.assertTrue(done_task.date_done)
+        self.assertEqual(
+            self.env["pc.sync.inbound"].search([("remote_id", "=", "in-t-3")]).state, "deferred"
+        )
+
+        self._apply("task", [{"id": "in-t-1", "name": "Call", "completed": True, "contact_ids": ["in-c-t"]}])
+        self.assertFalse(open_task.active, "completed tasks are archived in bulk")
@@ -0,0 +1,59 @@
+# prospectconnect_sync/tests/test_pc_job_priority.py
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcJobPriority(PcSyncCase):
+
+    def _queue(self, priority, count):
+        partners = self.env["res.partner"].with_context(pc_skip_sync=True).create(
+            [{"name": "Lane %s-%s" % (priority, i)} for i in range(count)]
+        )
+        return self.env["pc.sync.job"].create([
+            {
+                "direction": "odoo_to_pc",
+                "object_type": "contact",
+                "odoo_model": "res.partner",
+                "odoo_res_id": partner.id,
+                "priority": priority,
+            }
+            for partner in partners
+        ])
+
+    def test_origin_priority(self):
+        Partner = self.env["res.partner"]
+        Job = self.env["pc.sync.job"]
+        Partner.create({"name": "Single"})
+        self.assertEqual(Job.search([], order="id desc", limit=1).priority, "1")
+        Partner.with_context(import_file=True).create({"name": "Imported"})
+        self.assertEqual(Job.search([], order="id desc", limit=1).priority, "3")
+        Partner.create([{"name": "Mass %s" % i} for i in range(60)])
+        self.assertEqual(set(Job.search([], order="id desc", limit=60).mapped("priority")), {"3"})
+
+    def test_higher_lanes_first_with_share(self):
+        interactive = self._queue("0", 30)
+        bulk = self._queue("3", 30)
+        claimed = self.env["pc.sync.job"]._claim_jobs(
+            [("direction", "=", "odoo_to_pc"), ("status", "in", ["pending", "failed"])], 20
+        )
+        self.assertEqual(len(claimed), 20)
+        self.assertEqual(len(claimed & bulk), 2, "the bulk lane keeps its guaranteed share")
+        self.assertEqual(claimed & interactive, interactive[:18], "interactive jobs are claimed oldest first")
+
+    def test_lower_lane_fills_spare_capacity(self):
+        interactive = self._queue("0", 3)
+        bulk = self._queue("3", 30)
+        claimed = self.env["pc.sync.job"]._claim_jobs([("status", "=", "pending")], 20)
+        self.assertEqual(claimed & interactive, interactive)
+        self.assertEqual(len(claimed & bulk), 17)
+
+    def test_failed_job_moves_to_retry_lane(self):
+        job = self._queue("0", 1)
+        with patch.object(type(job), "_run_single_job", side_effect=ValueError("boom")):
+            job.process_pending_jobs()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.priority, "2")
@@ -0,0 +1,54 @@
+# prospectconnect_sync/tests/test_pc_mapping_refresh.py
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcMappingRefresh(PcSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Mapping = self.env["pc.user.mapping"].with_context(active_test=False)
+        self.Mapping.search([]).unlink()
+        self.mock.users = [
+            {"_id": "u-1", "first_name": "Ada", "last_name": "Lovelace"},
+            {"_id": "u-2", "first_name": "Alan", "last_name": "Turing"},
+        ]
+
+    def test_diff_applied_in_bulk(self):
+        self.Mapping._refresh_from_api()
+        self.assertEqual(
+            sorted(self.Mapping.search([]).mapped("pc_user_name")), ["Ada Lovelace", "Alan Turing"]
+        )
+
+        self.mock.users = [
+            {"_id": "u-1", "first_name": "Ada", "last_name": "King"},
+            {"_id": "u-3", "first_name": "Grace", "last_name": "Hopper"},
+        ]
+        self.Mapping._refresh_from_api()
+        by_id = {m.pc_user_id: m for m in self.Mapping.search([])}
+        self.assertEqual(by_id["u-1"].pc_user_name, "Ada King")
+        self.assertFalse(by_id["u-2"].active, "users no longer listed are deactivated")
+        self.assertTrue(by_id["u-3"].active)
+
+    def test_unchanged_list_not_rewritten(self):
+        self.Mapping._refresh_from_api()
+        mapping = self.Mapping.search([("pc_user_id", "=", "u-1")])
+        mapping.odoo_user_id = self.env.ref("base.user_admin")
+        self.assertEqual(self.env["pc.user.mapping"]._get_user_map()[0]["u-1"], mapping.odoo_user_id.id)
+
+        not_modified = self.mock.status_codes[304]
+        with patch.object(type(self.Mapping), "write") as write, \
+                patch.object(type(self.Mapping), "create") as create:
+            self.Mapping._refresh_from_api()
+        self.assertEqual(self.mock.status_codes[304], not_modified + 1, "the ETag is sent back")
+        self.assertFalse(write.called or create.called)
+
+    def test_cron_refreshes_stages(self):
+        self.mock.pipelines = [{"id": "p-1", "stages": [{"id": "s-1", "name": "Won"}]}]
+        self.env["pc.mapping.refresh"]._cron_refresh()
+        stage = self.env["pc.pipeline.mapping"].search([("pc_stage_id", "=", "s-1")])
+        self.assertEqual((stage.pc_stage_name, stage.pc_pipeline_id), ("Won", "p-1"))
@@ -0,0 +1,96 @@
+# prospectconnect_sync/tests/test_pc_push_dependencies.py
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from ..models.pc_sync_job import MAX_RETRIES
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcPushDependencies(PcSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.partner = self.env["res.partner"].with_context(pc_skip_sync=True).create(
+            {"name": "Parent Contact", "email": "parent@example.com"}
+        )
+        self.lead = self.env["crm.lead"].with_context(pc_skip_sync=True).create(
+            {"name": "Child Deal", "type": "opportunity", "partner_id": self.partner.id}
+        )
+        self.Job = self.env["pc.sync.job"]
+        self.Job.search([]).unlink()
+
+    def _job(self, object_type, record):
+        return self.Job.create({
+            "direction": "odoo_to_pc",
+            "object_type": object_type,
+            "odoo_model": record._name,
+            "odoo_res_id": record.id,
+        })
+
+    def test_parents_pushed_first(self):
+        # The deal is queued before its contact and the batch only fits one job
+        deal_job = self._job("deal", self.lead)
+        contact_job = self._job("contact", self.partner)
+        self.Job.process_pending_jobs(limit=1)
+
+        self.assertEqual((deal_job | contact_job).mapped("status"), ["done", "done"])
+        self.assertEqual(
+            self.mock.store["deals"][self.lead.pc_deal_id]["contactId"], self.partner.pc_contact_id,
+            "the deal is created with its contact on the first call",
+        )
+
+    def test_parent_job_queued_when_missing(self):
+        deal_job = self._job("deal", self.lead)
+        self.Job.process_pending_jobs()
+
+        self.assertEqual(deal_job.status, "done")
+        self.assertTrue(self.partner.pc_contact_id)
+        self.assertEqual(self.mock.store["deals"][self.lead.pc_deal_id]["contactId"], self.partner.pc_contact_id)
+
+    def test_child_waits_for_failed_parent(self):
+        deal_job = self._job("deal", self.lead)
+        contact_job = self._job("contact", self.partner)
+        with patch.object(type(self.Job), "_sync_contact_to_pc", side_effect=ValueError("boom")):
+            self.Job.process_pending_jobs()
+
+        self.assertEqual(contact_job.status, "failed")
+        self.assertEqual(deal_job.status, "pending")
+        self.assertFalse(self.lead.pc_deal_id, "the deal is not sent without its contact")
+
+    def test_child_waits_for_debounced_parent(self):
+        deal_job = self._job("deal", self.lead)
+        contact_job = self._job("contact", self.partner)
+        contact_job.eligible_at = fields.Datetime.add(fields.Datetime.now(), hours=1)
+        self.Job.process_pending_jobs()
+
+        self.assertEqual(contact_job.status, "pending", "the debounced parent is not pulled into the batch")
+        self.assertFalse(self.partner.pc_contact_id)
+        self.assertEqual(deal_job.status, "pending")
+        self.assertEqual(self.Job.search_count([("object_type", "=", "contact")]), 1, "no second job is queued")
+
+    def test_parent_held_by_another_worker(self):
+        deal_job = self._job("deal", self.lead)
+        contact_job = self._job("contact", self.partner)
+        lock_free = type(self.Job)._lock_free
+
+        def locked_elsewhere(jobs):
+            return lock_free(jobs - contact_job)
+
+        with patch.object(type(self.Job), "_lock_free", locked_elsewhere):
+            ordered, _parents, _queued, held = deal_job._resolve_dependencies()
+
+        self.assertEqual(ordered, deal_job, "the locked parent job is left to its worker")
+        self.assertIn(("res.partner", self.partner.id), held)
+
+    def test_parent_given_up_is_not_waited_for(self):
+        deal_job = self._job("deal", self.lead)
+        contact_job = self._job("contact", self.partner)
+        contact_job.write({"status": "failed", "retry_count": MAX_RETRIES})
+        self.Job.process_pending_jobs()
+
+        self.assertEqual(contact_job.status, "failed")
+        self.assertEqual(self.Job.search_count([("object_type", "=", "contact")]), 1)
+        self.assertEqual(deal_job.status, "done", "the deal is not held back forever")
@@ -0,0 +1,248 @@
+# prospectconnect_sync/tests/test_pc_query_counts.py
+import itertools
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+SIZES = (1, 10, 40)
+
+# Extra queries allowed per additional record in a batch, as
+# (SELECTs, INSERT/UPDATE/DELETEs). A SELECT budget of 0 means lookups must be
+# resolved once per batch. Lookups are resolved per batch on every path; the
+# budgets left are the cost the ORM or the API adds per record:
+# - pull creates: res.partner and crm.lead create their records in one call
+#   but still sync commercial fields, subscribe the salesperson and log the
+#   creation message record by record;
+# - pull updates: every partner gets its own values, so one write (and its
+#   tracking) per partner;
+# - process_jobs: the API creates one record per call, so each job checks its
+#   record, sends it and writes the returned id back on its own.
+BUDGETS = {
+    "pull_contact_create": (6, 3),
+    "pull_contact_update": (10, 6),
+    "pull_deal_create": (10, 7),
+    "pull_task_create": (1, 1),
+    "pull_note_create": (1, 1),
+    "write_override": (0, 1),
+    "process_jobs": (12, 6),
+    "payload_contact": (2, 0),
+    "payload_deal": (4, 0),
+}
+
+_ids = itertools.count(1)
+
+
+@tagged("post_install", "-at_install")
+class TestPcQueryCounts(PcSyncCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = cls.env.ref("base.user_admin")
+        cls.env["pc.user.mapping"].create({
+            "odoo_user_id": cls.user.id,
+            "pc_user_id": "u-admin",
+            "pc_user_name": "Admin",
+        })
+        cls.stage = cls.env["crm.stage"].search([], limit=1)
+        cls.env["pc.pipeline.mapping"].create({
+            "odoo_stage_id": cls.stage.id,
+            "pc_stage_id": "s-1",
+            "pc_pipeline_id": "p-1",
+        })
+        cls.tag_names = ["qc-tag-a", "qc-tag-b", "qc-tag-c"]
+        cls.env["res.partner.category"].create([{"name": name} for name in cls.tag_names])
+
+    # ------------- FIXTURES -------------
+
+    def _contact_payloads(self, size):
+        return [
+            {
+                "id": "qc-c-%s" % n,
+                "firstName": "First",
+                "lastName": str(n),
+                "email": "qc%s@example.com" % n,
+                "phone": "+15550000%s" % n,
+                "city": "Springfield",
+                "state": "Illinois",
+                "country": {"country_code": "US"},
+                "tags": self.tag_names,
+                "assignedTo": "u-admin",
+            }
+            for n in (next(_ids) for _ in range(size))
+        ]
+
+    def _partners(self, size, **vals):
+        return self.env["res.partner"].with_context(pc_skip_sync=True).create([
+            dict({
+                "name": "QC Partner %s" % n,
+                "email": "qcp%s@example.com" % n,
+                "pc_contact_id": "qc-p-%s" % n,
+                "pc_assigned_user_id": self.user.id,
+                "country_id": self.env.ref("base.us").id,
+                "category_id": [(6, 0, self.env["res.partner.category"].search(
+                    [("name", "in", self.tag_names)]).ids)],
+            }, **vals)
+            for n in (next(_ids) for _ in range(size))
+        ])
+
+    # ------------- PULL UPSERTS -------------
+
+    def test_pull_contact_create(self):
+        self.assertQueryScaling(
+            SIZES,
+            self._contact_payloads,
+            lambda payloads: self._apply("contact", payloads),
+            *BUDGETS["pull_contact_create"],
+        )
+
+    def test_pull_contact_update(self):
+        def prepare(size):
+            payloads = self._contact_payloads(size)
+            self._apply("contact", payloads)
+            for payload in payloads:
+                payload["city"] = "Shelbyville"
+            return payloads
+
+        self.assertQueryScaling(
+            SIZES, prepare, lambda payloads: self._apply("contact", payloads),
+            *BUDGETS["pull_contact_update"],
+        )
+        self.assertEqual(
+            self.env["res.partner"].search_count([("city", "=", "Shelbyville")]), sum(SIZES)
+        )
+
+    def test_tag_resolution_is_per_page(self):
+        State = self.env["pc.sync.state"]
+        names = ["qc-bulk-%s" % i for i in range(15)]
+        with self._capture_queries() as keywords:
+            first = State._resolve_tag_ids(names)
+        self.assertEqual(len(first), 15)
+        self.assertLessEqual(keywords.count("INSERT"), 1, "missing tags are created in one batch")
+        with self._capture_queries() as keywords:
+            second = State._resolve_tag_ids(names + self.tag_names)
+        self.assertEqual({name: second[name] for name in names}, first)
+        self.assertLessEqual(keywords.count("SELECT"), 1)
+        self.assertFalse(keywords.count("INSERT"))
+
+    def test_pull_deal_create(self):
+        def prepare(size):
+            partners = self._partners(size)
+            return [
+                {
+                    "id": "qc-d-%s" % next(_ids),
+                    "name": "Deal",
+                    "value": 100,
+                    "contactId": partner.pc_contact_id,
+                    "pipelineId": "p-1",
+                    "stageId": "s-1",
+                    "assignedTo": "u-admin",
+                }
+                for partner in partners
+            ]
+
+        self.assertQueryScaling(
+            SIZES, prepare, lambda payloads: self._apply("deal", payloads),
+            *BUDGETS["pull_deal_create"],
+        )
+
+    def test_pull_task_create(self):
+        def prepare(size):
+            partners = self._partners(size)
+            return [
+                {
+                    "id": "qc-t-%s" % next(_ids),
+                    "name": "Call back",
+                    "due_date": "2030-01-01",
+                    "contact_ids": [partner.pc_contact_id],
+                    "assignedTo": "u-admin",
+                }
+                for partner in partners
+            ]
+
+        self.assertQueryScaling(
+            SIZES, prepare, lambda payloads: self._apply("task", payloads),
+            *BUDGETS["pull_task_create"],
+        )
+
+    def test_pull_note_create(self):
+        def prepare(size):
+            partners = self._partners(size)
+            return [
+                {"id": "qc-n-%s" % next(_ids), "body": "<p>Hi</p>", "contactId": partner.pc_contact_id}
+                for partner in partners
+            ]
+
+        self.assertQueryScaling(
+            SIZES, prepare, lambda payloads: self._apply("note", payloads),
+            *BUDGETS["pull_note_create"],
+        )
+
+    # ------------- WRITE OVERRIDES -------------
+
+    def test_write_override_queues_jobs(self):
+        def prepare(size):
+            return self._partners(size)
+
+        self.assertQueryScaling(
+            SIZES, prepare, lambda partners: partners.write({"comment": "touched"}),
+            *BUDGETS["write_override"],
+        )
+        self.assertEqual(
+            self.env["pc.sync.job"].search_count([("object_type", "=", "contact")]), sum(SIZES)
+        )
+
+    # ------------- PUSH -------------
+
+    def test_process_pending_jobs(self):
+        Job = self.env["pc.sync.job"]
+
+        def prepare(size):
+            Job.search([]).unlink()
+            partners = self._partners(size, pc_contact_id=False)
+            Job.create([
+                {
+                    "direction": "odoo_to_pc",
+                    "object_type": "contact",
+                    "odoo_model": "res.partner",
+                    "odoo_res_id": partner.id,
+                }
+                for partner in partners
+            ])
+            return size
+
+        self.assertQueryScaling(
+            SIZES, prepare, lambda size: Job.process_pending_jobs(limit=size),
+            *BUDGETS["process_jobs"],
+        )
+        self.assertFalse(Job.search_count([("status", "!=", "done")]))
+
+    def test_payload_building(self):
+        Job = self.env["pc.sync.job"]
+        self.assertQueryScaling(
+            SIZES,
+            self._partners,
+            lambda partners: [Job._prepare_contact_payload(p) for p in partners],
+            *BUDGETS["payload_contact"],
+        )
+
+        def prepare_leads(size):
+            partners = self._partners(size)
+            return self.env["crm.lead"].with_context(pc_skip_sync=True).create([
+                {
+                    "name": "QC Lead",
+                    "type": "opportunity",
+                    "partner_id": partner.id,
+                    "user_id": self.user.id,
+                    "stage_id": self.stage.id,
+                }
+                for partner in partners
+            ])
+
+        self.assertQueryScaling(
+            SIZES,
+            prepare_leads,
+            lambda leads: [Job._prepare_deal_payload(lead) for lead in leads],
+            *BUDGETS["payload_deal"],
+        )
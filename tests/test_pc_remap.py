@@ -0,0 +1,43 @@
+# prospectconnect_sync/tests/test_pc_remap.py
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcRemap(PcSyncCase):
+
+    def test_new_mappings_applied_locally(self):
+        user = self.env.ref("base.user_admin")
+        stage = self.env["crm.stage"].search([], order="sequence desc", limit=1)
+        partner = self.env["res.partner"].with_context(pc_skip_sync=True).create(
+            {"name": "Remap Contact", "pc_remote_assignee_id": "u-late"}
+        )
+        lead = self.env["crm.lead"].with_context(pc_skip_sync=True).create({
+            "name": "Remap Deal",
+            "type": "opportunity",
+            "user_id": False,
+            "pc_remote_assignee_id": "u-late",
+            "pc_remote_stage_id": "s-late",
+        })
+        self.env["pc.sync.job"].search([]).unlink()
+        requests_before = sum(self.mock.requests.values())
+
+        self.env["pc.user.mapping"].create({"pc_user_id": "u-late", "odoo_user_id": user.id})
+        self.env["pc.pipeline.mapping"].create({"pc_stage_id": "s-late", "odoo_stage_id": stage.id})
+
+        self.assertEqual(partner.pc_assigned_user_id, user)
+        self.assertEqual(lead.user_id, user)
+        self.assertEqual(lead.stage_id, stage)
+        self.assertEqual(sum(self.mock.requests.values()), requests_before, "no API call")
+        self.assertFalse(self.env["pc.sync.job"].search_count([]), "remapped records are not pushed back")
+
+    def test_mapping_without_odoo_side_is_ignored(self):
+        lead = self.env["crm.lead"].with_context(pc_skip_sync=True).create({
+            "name": "Unmapped Deal",
+            "type": "opportunity",
+            "pc_remote_stage_id": "s-none",
+        })
+        stage = lead.stage_id
+        self.env["pc.pipeline.mapping"].create({"pc_stage_id": "s-none"})
+        self.assertEqual(lead.stage_id, stage)
@@ -0,0 +1,34 @@
+# prospectconnect_sync/tests/test_pc_sync_crons.py
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcSyncCrons(PcSyncCase):
+
+    def test_intervals_from_settings(self):
+        self.env["res.config.settings"].create({
+            "pc_poll_interval_minutes": 15,
+            "pc_poll_interval_contacts": 2,
+            "pc_push_interval_minutes": 1,
+        }).execute()
+
+        self.assertEqual(self.env.ref("prospectconnect_sync.ir_cron_pc_push").interval_number, 1)
+        self.assertEqual(self.env.ref("prospectconnect_sync.ir_cron_pc_pull_contacts").interval_number, 2)
+        for xmlid in ("ir_cron_pc_pull_deals", "ir_cron_pc_pull_tasks", "ir_cron_pc_pull_notes"):
+            cron = self.env.ref("prospectconnect_sync.%s" % xmlid)
+            self.assertEqual((cron.interval_number, cron.interval_type), (15, "minutes"))
+
+    def test_pull_only_its_type(self):
+        State = self.env["pc.sync.state"]
+        with patch.object(type(State), "_pull_object", autospec=True, return_value=0) as pull:
+            State.run_pull("deal")
+        self.assertEqual([call.args[1] for call in pull.call_args_list], ["deal"])
+
+        self._set_params({"prospectconnect_sync.sync_deals": "False"})
+        with patch.object(type(State), "_pull_object", autospec=True, return_value=0) as pull:
+            State.run_pull("deal")
+        self.assertFalse(pull.called, "disabled object types are not pulled")
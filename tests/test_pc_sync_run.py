@@ -0,0 +1,74 @@
+# prospectconnect_sync/tests/test_pc_sync_run.py
+from odoo.tests import tagged
+
+from ..models.pc_sync_run import SyncProfiler
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcSyncRun(PcSyncCase):
+
+    def _last_run(self, entrypoint):
+        return self.env["pc.sync.run"].search([("entrypoint", "=", entrypoint)], order="id desc", limit=1)
+
+    def assertRunAddsUp(self, run):
+        """Phase totals add up to the run's, nested phases counted once."""
+        self.assertGreater(run.sql_count, 0)
+        self.assertEqual(sum(run.phase_ids.mapped("sql_count")), run.sql_count)
+        self.assertAlmostEqual(sum(run.phase_ids.mapped("duration")), run.duration, delta=0.01)
+        self.assertTrue(all(duration >= 0 for duration in run.phase_ids.mapped("duration")))
+
+    def test_profiled_sync_records_phases(self):
+        self.mock.seed(contacts=3)
+        self.addCleanup(self.mock.store["contacts"].clear)
+        self.env["pc.sync.job"].search([]).unlink()
+        self.env["res.partner"].create({"name": "Profiled Contact", "email": "profiled@example.com"})
+
+        self.env["pc.sync.state"].with_context(pc_profile="timing").run_incremental_sync()
+        run = self._last_run("run_incremental_sync")
+        self.assertEqual(run.profile_mode, "timing")
+        self.assertFalse(run.error_message)
+        phases = {phase.name: phase for phase in run.phase_ids}
+        self.assertLessEqual({"fetch", "resolve", "push", "write_back", "other"}, set(phases))
+        self.assertEqual(phases["push"].calls, 1, "one contact pushed")
+        self.assertGreater(phases["push"].duration, 0)
+        self.assertGreater(phases["write_back"].sql_count, 0, "the returned id is written back")
+        self.assertGreater(phases["fetch"].calls, 0)
+        self.assertRunAddsUp(run)
+        self.assertIn("/contact/getPaginatedContacts", run.endpoint_ids.mapped("path"))
+
+        self.env["pc.sync.inbound"].with_context(pc_profile="timing").process_staged()
+        run = self._last_run("process_staged")
+        phases = {phase.name: phase for phase in run.phase_ids}
+        self.assertIn("apply", phases)
+        self.assertGreater(phases["apply"].sql_count, 0)
+        self.assertGreater(phases["apply"].duration, 0)
+        self.assertRunAddsUp(run)
+
+    def test_next_run_is_profiled_once(self):
+        self._set_params({"prospectconnect_sync.profile_next_run": "True"})
+        runs = self.env["pc.sync.run"].search_count([])
+        self.env["pc.sync.state"].run_pull("contact")
+        self.env["pc.sync.state"].run_pull("contact")
+        self.assertEqual(self.env["pc.sync.run"].search_count([]), runs + 1)
+        self.assertEqual(
+            self.env["ir.config_parameter"].sudo().get_param("prospectconnect_sync.profile_next_run"), "False"
+        )
+
+    def test_nested_phase_counted_once(self):
+        profiler = SyncProfiler(self.env.cr)
+        with profiler.phase("apply"):
+            self.env.cr.execute("SELECT 1")
+            with profiler.phase("resolve"):
+                self.env.cr.execute("SELECT 1")
+                self.env.cr.execute("SELECT 1")
+        with profiler.phase("resolve"):
+            self.env.cr.execute("SELECT 1")
+
+        calls, apply_time, apply_sql, _apply_sql_time = profiler.phases["apply"]
+        self.assertEqual((calls, apply_sql), (1, 1))
+        calls, resolve_time, resolve_sql, _resolve_sql_time = profiler.phases["resolve"]
+        self.assertEqual((calls, resolve_sql), (2, 3))
+        duration, sql_count, _sql_time = profiler.totals()
+        self.assertEqual(sql_count, 4)
+        self.assertLessEqual(apply_time + resolve_time, duration)
@@ -0,0 +1,76 @@
+# prospectconnect_sync/tests/test_pc_sync_worker.py
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from ..tools import RateLimiter
+from .common import PcSyncCase
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.calls = 0
+
+    def wait(self):
+        self.calls += 1
+
+
+@tagged("post_install", "-at_install")
+class TestPcSyncWorker(PcSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Job = self.env["pc.sync.job"]
+        self.Job.search([]).unlink()
+
+    def test_queued_jobs_notify_the_worker(self):
+        self.env.cr.execute(
+            "SELECT tgname FROM pg_trigger WHERE tgrelid = 'pc_sync_job'::regclass AND NOT tgisinternal"
+        )
+        self.assertEqual(
+            {row[0] for row in self.env.cr.fetchall()},
+            {"pc_sync_job_notify_insert", "pc_sync_job_notify_update"},
+        )
+
+    def test_batch_is_rate_limited_and_counted(self):
+        self.env["res.partner"].create([
+            {"name": "Worker Contact %s" % n, "email": "worker%s@example.com" % n} for n in range(3)
+        ])
+        limiter = CountingLimiter()
+        handled = self.Job.with_context(pc_rate_limiter=limiter).process_pending_jobs()
+        self.assertEqual(handled, 3)
+        self.assertEqual(limiter.calls, 3)
+        self.assertEqual(self.Job.process_pending_jobs(), 0, "nothing left to push")
+
+    def test_next_eligible_at(self):
+        self.assertIsNone(self.Job._next_eligible_at())
+        self._set_params({"prospectconnect_sync.debounce_contact": "30"})
+        self.env["res.partner"].create({"name": "Later Contact"})
+        due = self.Job._next_eligible_at()
+        self.assertTrue(due)
+        self.assertLessEqual(due, fields.Datetime.now() + timedelta(seconds=30))
+
+    def test_failed_job_waits_for_backoff(self):
+        partner = self.env["res.partner"].create({"name": "Flaky Contact"})
+        job = self.Job.search([("odoo_model", "=", "res.partner"), ("odoo_res_id", "=", partner.id)])
+        with patch.object(type(self.Job), "_run_single_job", side_effect=ValueError("boom")) as run:
+            self.assertEqual(self.Job.process_pending_jobs(), 0, "a failure is not progress")
+            self.assertEqual(self.Job.process_pending_jobs(), 0)
+            self.assertEqual(run.call_count, 1, "the job is not retried right away")
+            first_delay = job.next_retry_at - fields.Datetime.now()
+            self.assertEqual(self.Job._next_eligible_at(), job.next_retry_at, "the worker wakes up for it")
+
+            job.next_retry_at = fields.Datetime.now() - timedelta(seconds=1)
+            self.Job.process_pending_jobs()
+        self.assertEqual(job.retry_count, 2)
+        self.assertGreater(job.next_retry_at - fields.Datetime.now(), first_delay, "the backoff grows")
+
+    def test_rate_limiter_spaces_calls(self):
+        limiter = RateLimiter(20)
+        started = time.monotonic()
+        for _n in range(3):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
@@ -0,0 +1,76 @@
+# prospectconnect_sync/tests/test_pc_tape.py
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from odoo.tests import tagged
+
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcTape(PcSyncCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp(prefix="pc_tape_")
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.tape = os.path.join(directory, "sync.tape.gz")
+
+    def _tape_mode(self, mode):
+        self._set_params({
+            "prospectconnect_sync.tape_mode": mode,
+            "prospectconnect_sync.tape_path": self.tape,
+            "prospectconnect_sync.tape_timing": "instant",
+        })
+
+    def test_replay_pull_without_network(self):
+        self.mock.seed(contacts=5)
+        emails = {c["id"]: c.get("email") for c in self.mock.store["contacts"].values()}
+        State = self.env["pc.sync.state"]
+
+        self._tape_mode("record")
+        self._state("contact").last_pull_at = False
+        State.run_pull("contact")
+        with gzip.open(self.tape, "rt") as fh:
+            raw = fh.read()
+        calls = [json.loads(line) for line in raw.splitlines()]
+        self.assertEqual([c["path"] for c in calls], ["/contact/getPaginatedContacts"])
+        self.assertNotIn("test-key", raw)
+        for email in filter(None, emails.values()):
+            self.assertNotIn(email, raw)
+
+        self._tape_mode("replay")
+        self.mock.reset_stats()
+        self._state("contact").last_pull_at = False
+        State.run_pull("contact")
+        self.env["pc.sync.inbound"].process_staged()
+        self.assertFalse(sum(self.mock.requests.values()))
+        partners = self.env["res.partner"].search([("pc_contact_id", "in", list(emails))])
+        self.assertEqual(len(partners), len(calls[0]["body"]["data"]))
+        for partner in partners:
+            self.assertNotEqual(partner.email, emails[partner.pc_contact_id])
+
+    def test_replay_push_without_network(self):
+        Job = self.env["pc.sync.job"]
+        self._tape_mode("record")
+        partner = self.env["res.partner"].create({"name": "Taped Contact", "email": "taped@example.com"})
+        Job.process_pending_jobs()
+        recorded_id = partner.pc_contact_id
+        self.assertTrue(recorded_id)
+
+        self._tape_mode("replay")
+        self.mock.reset_stats()
+        partner.with_context(pc_skip_sync=True).pc_contact_id = False
+        partner.phone = "+15550001111"
+        Job.process_pending_jobs()
+        self.assertFalse(sum(self.mock.requests.values()))
+        self.assertEqual(partner.pc_contact_id, recorded_id)
+
+        # Nothing left to answer with: the job fails instead of going online
+        partner.phone = "+15550002222"
+        Job.process_pending_jobs()
+        self.assertFalse(sum(self.mock.requests.values()))
+        self.assertEqual(Job.search([], order="id desc", limit=1).status, "failed")
@@ -0,0 +1,92 @@
+# prospectconnect_sync/tests/test_pc_upsert.py
+from unittest.mock import patch
+
+from psycopg2.errors import SerializationFailure, UniqueViolation
+
+from odoo.tests import tagged
+from odoo.tools import mute_logger
+
+from ..models.pc_sync_state import _TAG_CACHE
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcUpsert(PcSyncCase):
+
+    def test_remote_ids_are_unique(self):
+        self.env.cr.execute(
+            "SELECT indexname FROM pg_indexes WHERE indexname IN %s",
+            [("res_partner_pc_contact_id_account_uniq", "crm_lead_pc_deal_id_account_uniq",
+              "mail_activity_pc_task_id_account_uniq", "mail_message_pc_note_id_account_uniq")],
+        )
+        self.assertEqual(len(self.env.cr.fetchall()), 4)
+
+        Partner = self.env["res.partner"].with_context(pc_skip_sync=True)
+        partner = Partner.create({"name": "Linked", "pc_contact_id": "uq-1"})
+        self.assertFalse(partner.copy().pc_contact_id, "copies are not linked")
+        Partner.create([{"name": "Unlinked %s" % n} for n in range(2)])
+        with self.assertRaises(UniqueViolation), mute_logger("odoo.sql_db"), self.env.cr.savepoint():
+            Partner.create({"name": "Duplicate", "pc_contact_id": "uq-1"})
+
+    def test_contact_listed_twice_is_created_once(self):
+        self.env["pc.sync.state"]._apply_batch("contact", [
+            {"id": "uq-2", "name": "First Version"},
+            {"id": "uq-2", "name": "Second Version"},
+        ])
+        partner = self.env["res.partner"].search([("pc_contact_id", "=", "uq-2")])
+        self.assertEqual(partner.name, "Second Version")
+
+    def test_colliding_batch_is_started_over(self):
+        Inbound = self.env["pc.sync.inbound"]
+        Inbound._stage("contact", [{"id": "uq-3", "name": "Raced"}, {"id": "uq-4", "name": "Raced Too"}])
+        State = type(self.env["pc.sync.state"])
+        apply_batch = State._apply_batch
+        calls = []
+
+        def collide_once(self, object_type, payloads):
+            calls.append(len(payloads))
+            if len(calls) == 1:
+                raise SerializationFailure("could not serialize access due to concurrent update")
+            return apply_batch(self, object_type, payloads)
+
+        with patch.object(State, "_apply_batch", collide_once):
+            self.assertEqual(Inbound.process_staged(), 2)
+        self.assertEqual(calls, [2, 2], "the batch is applied again as a whole")
+        self.assertEqual(self.env["res.partner"].search_count([("pc_contact_id", "in", ["uq-3", "uq-4"])]), 2)
+        self.assertFalse(Inbound.search([]))
+
+    def test_new_tags_are_created_once(self):
+        names = ["uq-tag-a", "uq-tag-b"]
+        State = self.env["pc.sync.state"]
+        State._apply_batch("contact", [{"id": "uq-5", "name": "Tagged", "tags": names}])
+        # The next batch may run in another worker, without the tags cached
+        _TAG_CACHE.pop(self.env.cr.dbname, None)
+        State._apply_batch("contact", [
+            {"id": "uq-6", "name": "Tagged Too", "tags": names},
+            {"id": "uq-7", "name": "Tagged Again", "tags": names[:1]},
+        ])
+
+        tags = self.env["res.partner.category"].search([("name", "in", names)])
+        self.assertEqual(sorted(tags.mapped("name")), names, "one tag per name")
+        partners = self.env["res.partner"].search([("pc_contact_id", "in", ["uq-5", "uq-6"])])
+        self.assertEqual(len(partners), 2)
+        for partner in partners:
+            self.assertEqual(partner.category_id, tags)
+
+    def test_tag_created_meanwhile_is_reused(self):
+        Category = type(self.env["res.partner.category"])
+        search_fetch = Category.search_fetch
+        created = []
+
+        def create_meanwhile(self, domain, *args, **kwargs):
+            records = search_fetch(self, domain, *args, **kwargs)
+            if not created:
+                # Another pull commits the tag between the lookup and the lock
+                created.append(True)
+                created[0] = self.create({"name": "uq-tag-race"})
+            return records
+
+        with patch.object(Category, "search_fetch", create_meanwhile):
+            result = self.env["pc.sync.state"]._resolve_tag_ids(["uq-tag-race"])
+        self.assertEqual(result, {"uq-tag-race": created[0].id})
+        self.assertEqual(self.env["res.partner.category"].search_count([("name", "=", "uq-tag-race")]), 1)
@@ -0,0 +1,85 @@
+# prospectconnect_sync/tests/test_pc_webhook.py
+import hashlib
+import hmac
+import json
+
+from odoo.tests import tagged
+
+from ..models.pc_sync_job import MAX_RETRIES
+from .common import PcSyncCase
+
+
+@tagged("post_install", "-at_install")
+class TestPcWebhook(PcSyncCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._set_params({"prospectconnect_sync.webhook_secret": "s3cret"})
+        cls.Job = cls.env["pc.sync.job"]
+
+    def _event(self, event_id, pc_id, **data):
+        return {"id": event_id, "type": "contact.updated", "data": dict({"id": pc_id, "name": "Hook"}, **data)}
+
+    def test_signature(self):
+        body = json.dumps({"id": "e1"}).encode()
+        good = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        self.assertTrue(self.Job._verify_webhook_signature(body, good))
+        self.assertTrue(self.Job._verify_webhook_signature(body, "sha256=" + good))
+        self.assertFalse(self.Job._verify_webhook_signature(body, "0" * 64))
+        self.assertFalse(self.Job._verify_webhook_signature(body, None))
+
+    def test_dedup_and_coalesce(self):
+        accepted, duplicates = self.Job._enqueue_webhook_events([
+            self._event("e1", "wh-1", city="A"),
+            self._event("e2", "wh-1", city="B"),
+            self._event("e3", "wh-2"),
+        ])
+        self.assertEqual((accepted, duplicates), (3, 0))
+        jobs = self.Job.search([("direction", "=", "pc_to_odoo")])
+        self.assertEqual(len(jobs), 2, "updates of one record collapse into one job")
+        self.assertEqual(json.loads(jobs.filtered(lambda j: j.pc_id == "wh-1").payload)["city"], "B")
+        coalesced = jobs.filtered(lambda j: j.pc_id == "wh-1")
+        self.assertEqual(coalesced.event_id, "e2")
+        self.assertEqual(sorted(coalesced.event_ids.mapped("event_id")), ["e1", "e2"])
+
+        accepted, duplicates = self.Job._enqueue_webhook_events([self._event("e3", "wh-2")])
+        self.assertEqual((accepted, duplicates), (0, 1))
+
+    def test_redelivered_coalesced_event_is_dropped(self):
+        self.Job._enqueue_webhook_events([
+            self._event("e30", "wh-30", city="Old"),
+            self._event("e31", "wh-30", city="New"),
+        ])
+        self.Job.process_inbound_jobs()
+        accepted, duplicates = self.Job._enqueue_webhook_events([self._event("e30", "wh-30", city="Old")])
+        self.assertEqual((accepted, duplicates), (0, 1))
+        self.Job.process_inbound_jobs()
+        partner = self.env["res.partner"].search([("pc_contact_id", "=", "wh-30")])
+        self.assertEqual(partner.city, "New", "older data is not applied over newer")
+
+    def test_apply_inbound_jobs(self):
+        self.Job._enqueue_webhook_events([
+            self._event("e10", "wh-10", email="wh10@example.com"),
+            {"id": "e11", "type": "deal.created", "data": {"id": "wh-d-10", "name": "Hooked", "contactId": "wh-10"}},
+        ])
+        self.Job.process_inbound_jobs()
+        partner = self.env["res.partner"].search([("pc_contact_id", "=", "wh-10")])
+        self.assertEqual(partner.email, "wh10@example.com")
+        lead = self.env["crm.lead"].search([("pc_deal_id", "=", "wh-d-10")])
+        self.assertEqual(lead.partner_id, partner)
+        self.assertFalse(self.Job.search_count([("direction", "=", "pc_to_odoo"), ("status", "!=", "done")]))
+        self.assertFalse(
+            self.Job.search_count([("direction", "=", "odoo_to_pc")]),
+            "applied webhook data is not echoed back to ProspectConnect",
+        )
+
+    def test_failed_inbound_jobs_are_retried_a_few_times(self):
+        self.Job._enqueue_webhook_events([self._event("e20", "wh-20")])
+        job = self.Job.search([("event_id", "=", "e20")])
+        job.write({"status": "failed", "retry_count": MAX_RETRIES})
+        self.Job.process_inbound_jobs()
+        self.assertEqual(job.status, "failed", "jobs that failed too often are left for review")
+        job.retry_count = MAX_RETRIES - 1
+        self.Job.process_inbound_jobs()
+        self.assertEqual(job.status, "done")
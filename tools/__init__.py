@@ -0,0 +1,6 @@
+# prospectconnect_sync/tools/__init__.py
+from .pc_codec import ACCEPT_ENCODING, decode_response, json_dumps, json_loads, post_json
+from .pc_sql import CONCURRENCY_ERRORS, create_remote_id_index
+from .pc_tape import PcTape, TapeExhausted, current_tape, use_tape
+from .pc_testing import is_testing
+from .pc_transport import PcTransport, RateLimiter
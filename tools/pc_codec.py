@@ -0,0 +1,126 @@
+# prospectconnect_sync/tools/pc_codec.py
+"""JSON encoding and compression of ProspectConnect API traffic.
+
+Bodies are encoded with ``orjson`` when it is installed (several times
+faster on large pages) and the standard library otherwise. Responses are
+requested gzip or brotli compressed; requests decompresses them
+transparently. Request bodies are gzipped when the caller's headers ask
+for it (``Content-Encoding: gzip``), which is only sent when the server is
+known to accept it.
+
+Calls are recorded to or replayed from the active tape, see ``pc_tape``.
+"""
+import gzip
+import json
+import threading
+import time
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
+
+try:
+    import brotli  # noqa: F401  (lets urllib3 decode "br" responses)
+except Exception:  # pragma: no cover
+    try:
+        import brotlicffi as brotli  # noqa: F401
+    except Exception:
+        brotli = None
+
+try:
+    import requests
+except Exception:  # pragma: no cover
+    requests = None
+
+from .pc_tape import current_tape
+
+ACCEPT_ENCODING = "br, gzip" if brotli else "gzip"
+# Smaller bodies are sent as is: compressing them costs more than it saves
+MIN_COMPRESS_SIZE = 1024
+
+_stats_lock = threading.Lock()
+
+
+def json_dumps(obj):
+    """Encode ``obj`` to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def json_loads(data):
+    """Decode JSON ``bytes`` or ``str``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_body(payload, headers):
+    """Encode a request body, gzipped if ``headers`` ask for it.
+
+    :return: ``(body, headers)`` to send
+    """
+    body = json_dumps(payload)
+    headers = dict(headers, **{"Content-Type": "application/json"})
+    if headers.get("Content-Encoding") == "gzip":
+        if len(body) >= MIN_COMPRESS_SIZE:
+            body = gzip.compress(body, compresslevel=5)
+        else:
+            del headers["Content-Encoding"]
+    return body, headers
+
+
+def post_json(url, payload, headers, timeout, session=None, stats=None, tape=None):
+    """POST ``payload`` to ``url`` with the fast codec.
+
+    The response is returned undecoded so callers keep their own status
+    handling; decode it with :func:`decode_response`.
+
+    :param stats: optional wire statistics, see :func:`record_wire`
+    :param tape: tape recording or replaying the call (defaults to the
+        active tape of the current thread)
+    """
+    tape = tape or current_tape()
+    body, headers = encode_body(payload, headers)
+    if tape is not None and tape.replaying:
+        resp = tape.replay(url)
+    else:
+        started = time.perf_counter()
+        resp = (session or requests).post(url, data=body, headers=headers, timeout=timeout)
+        if tape is not None:
+            tape.record(url, payload, resp, _wire_size(resp), time.perf_counter() - started)
+    if stats is not None:
+        record_wire(stats, url, len(body), _wire_size(resp))
+    return resp
+
+
+def decode_response(resp, stats=None):
+    """Decoded JSON body of ``resp`` (``{}`` when empty)."""
+    content = resp.content
+    if not content:
+        return {}
+    started = time.perf_counter()
+    data = json_loads(content)
+    if stats is not None:
+        record_wire(stats, resp.url, 0, 0, decode_time=time.perf_counter() - started, calls=0)
+    return data
+
+
+def _wire_size(resp):
+    # Content-Length is the compressed size when the body was compressed
+    try:
+        return int(resp.headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return len(resp.content)
+
+
+def record_wire(stats, url, sent, received, decode_time=0.0, calls=1):
+    """Add one call to ``stats``: ``{path: [calls, sent, received, decode time]}``."""
+    path = "/" + url.split("://", 1)[-1].split("/", 1)[-1].split("?", 1)[0] if url else ""
+    with _stats_lock:
+        entry = stats.setdefault(path, [0, 0, 0, 0.0])
+        entry[0] += calls
+        entry[1] += sent
+        entry[2] += received
+        entry[3] += decode_time
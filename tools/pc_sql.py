@@ -0,0 +1,50 @@
+# prospectconnect_sync/tools/pc_sql.py
+"""Database helpers for the ProspectConnect id columns."""
+import logging
+
+from psycopg2.errors import DeadlockDetected, SerializationFailure, UniqueViolation
+
+from odoo.tools.sql import index_exists
+
+_logger = logging.getLogger(__name__)
+
+# Raised when another transaction applied the same remote record first, or
+# locked the same rows in another order: the work is retried in a new
+# transaction, which sees its result
+CONCURRENCY_ERRORS = (SerializationFailure, UniqueViolation, DeadlockDetected)
+
+
+def create_remote_id_index(cr, table, column):
+    """Make ``column`` unique per account where it is set (one Odoo record
+    per remote id of an account; ``pc_account_id`` is empty for the
+    default account).
+
+    Duplicates left by earlier versions keep their id on the oldest record
+    only; the others are unlinked from ProspectConnect, with a warning. The
+    index replaces the one earlier versions made unique across accounts.
+    """
+    indexname = "%s_%s_account_uniq" % (table, column)
+    if index_exists(cr, indexname):
+        return
+    cr.execute('DROP INDEX IF EXISTS "%s_%s_uniq"' % (table, column))
+    cr.execute(
+        """
+        UPDATE "{table}" t SET "{column}" = NULL
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY COALESCE(pc_account_id, 0), "{column}" ORDER BY id
+            ) AS n
+            FROM "{table}" WHERE "{column}" IS NOT NULL
+        ) dup
+        WHERE t.id = dup.id AND dup.n > 1
+        """.format(table=table, column=column)
+    )
+    if cr.rowcount:
+        _logger.warning(
+            "ProspectConnect: %s duplicate %s cleared in %s, the oldest record keeps each id",
+            cr.rowcount, column, table,
+        )
+    cr.execute(
+        'CREATE UNIQUE INDEX "{index}" ON "{table}" (COALESCE(pc_account_id, 0), "{column}") '
+        'WHERE "{column}" IS NOT NULL'.format(index=indexname, table=table, column=column)
+    )
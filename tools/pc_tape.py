@@ -0,0 +1,200 @@
+# prospectconnect_sync/tools/pc_tape.py
+"""Recording and replay of ProspectConnect API traffic.
+
+A recording ("tape") is a gzipped JSON-lines file with one call per line:
+endpoint path, request body, response status, headers and body, size on the
+wire and how long the call took. Credentials are never written (request
+headers are not kept) and personal data in bodies is replaced by stable
+pseudonyms, so a tape recorded in production can be handed to developers.
+Pseudonyms are deterministic: an email pushed in a contact and pulled back
+in a page gets the same replacement, so matching behaves as it did live.
+
+Replay answers calls from the tape instead of the network, per endpoint in
+the recorded order, with the recorded latency or none at all.
+
+The tape of the current thread is used by ``pc_codec.post_json``; worker
+threads of ``PcTransport`` use the tape of the thread that created it.
+"""
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+try:
+    import requests
+    from requests.structures import CaseInsensitiveDict
+except Exception:  # pragma: no cover
+    requests = None
+
+# Body keys whose string values are pseudonymized when recording
+SENSITIVE_KEYS = {
+    "email", "phone",
+    "name", "firstName", "lastName", "first_name", "last_name",
+    "address1", "city", "state", "postal_code", "postalCode",
+    "body", "note", "notes", "description", "summary",
+    "tags", "source",
+}
+# Response headers worth replaying; everything else is dropped
+KEPT_HEADERS = ("Content-Type", "ETag", "Retry-After")
+
+_local = threading.local()
+
+
+class TapeExhausted(Exception):
+    """Raised when a replayed call has no recorded answer left."""
+
+
+def _path(url):
+    return "/" + url.split("://", 1)[-1].split("/", 1)[-1].split("?", 1)[0]
+
+
+def _pseudonym(key, value):
+    digest = hashlib.sha256(value.encode()).hexdigest()
+    if key == "email" and "@" in value:
+        return "%s@example.com" % digest[:12]
+    if key == "phone":
+        return "+1555%07d" % (int(digest[:12], 16) % 10 ** 7)
+    # Same length as the original so payload sizes stay realistic
+    return (digest * (len(value) // len(digest) + 1))[:len(value)]
+
+
+def sanitize(data, key=None):
+    """Copy of decoded JSON ``data`` with personal data pseudonymized."""
+    if isinstance(data, dict):
+        return {k: sanitize(v, k) for k, v in data.items()}
+    if isinstance(data, list):
+        return [sanitize(v, key) for v in data]
+    if isinstance(data, str) and key in SENSITIVE_KEYS and data:
+        return _pseudonym(key, data)
+    return data
+
+
+class PcTape:
+    """Recorder or player of API calls, usable as a context manager.
+
+    :param filename: tape file; recordings are appended to it
+    :param mode: ``"record"`` or ``"replay"``
+    :param timing: ``"original"`` to replay each call with its recorded
+        latency, ``"instant"`` for none
+    """
+
+    def __init__(self, filename, mode, timing="original"):
+        if mode not in ("record", "replay"):
+            raise ValueError("Unknown tape mode %r" % mode)
+        self.filename = filename
+        self.mode = mode
+        self.timing = timing
+        self._lock = threading.Lock()
+        self._file = None
+        self._calls = defaultdict(list)
+        self._positions = defaultdict(int)
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def __enter__(self):
+        if self.replaying:
+            self.load()
+        else:
+            directory = os.path.dirname(self.filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(self.filename, "at", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def load(self):
+        """Read the recorded calls, grouped per endpoint in recorded order."""
+        self._calls.clear()
+        self._positions.clear()
+        with gzip.open(self.filename, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    call = json.loads(line)
+                    self._calls[call["path"]].append(call)
+
+    # ------------- RECORD -------------
+
+    def record(self, url, payload, resp, wire_size, elapsed):
+        """Append one live call to the tape."""
+        try:
+            body = sanitize(json.loads(resp.content)) if resp.content else None
+        except ValueError:
+            body = resp.text
+        call = {
+            "path": _path(url),
+            "request": sanitize(payload),
+            "status": resp.status_code,
+            "headers": {k: resp.headers[k] for k in KEPT_HEADERS if k in resp.headers},
+            "body": body,
+            "wire": wire_size,
+            "elapsed": round(elapsed, 4),
+        }
+        line = json.dumps(call, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    # ------------- REPLAY -------------
+
+    def replay(self, url):
+        """Recorded answer to the next call to ``url``, as a response object.
+
+        :raise TapeExhausted: when every call to the endpoint was replayed
+        """
+        path = _path(url)
+        with self._lock:
+            position = self._positions[path]
+            calls = self._calls.get(path, ())
+            if position >= len(calls):
+                raise TapeExhausted("No recorded answer left for %s in %s" % (path, self.filename))
+            self._positions[path] = position + 1
+            call = calls[position]
+        if self.timing == "original" and call["elapsed"]:
+            time.sleep(call["elapsed"])
+
+        body = call["body"]
+        if body is None:
+            content = b""
+        elif isinstance(body, str):
+            content = body.encode()
+        else:
+            content = json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()
+        resp = requests.Response()
+        resp.status_code = call["status"]
+        resp.reason = http.client.responses.get(call["status"], "")
+        resp.url = url
+        resp.encoding = "utf-8"
+        resp._content = content
+        resp.headers = CaseInsensitiveDict(call["headers"])
+        # Reported as on the wire, so wire statistics match the recording
+        resp.headers["Content-Length"] = str(call.get("wire") or len(content))
+        return resp
+
+
+def current_tape():
+    """Tape active in the current thread, if any."""
+    return getattr(_local, "tape", None)
+
+
+@contextmanager
+def use_tape(tape):
+    """Make ``tape`` the active tape of the current thread."""
+    previous = current_tape()
+    _local.tape = tape
+    try:
+        yield tape
+    finally:
+        _local.tape = previous
@@ -0,0 +1,13 @@
+# prospectconnect_sync/tools/pc_testing.py
+"""Detection of the Odoo test runner.
+
+Tests run in a single transaction rolled back at the end: code that
+commits its own transactions or works in threads with their own cursors
+does neither while ``is_testing()`` is true.
+"""
+import threading
+
+
+def is_testing():
+    """Whether the current thread runs Odoo tests."""
+    return getattr(threading.current_thread(), "testing", False)
@@ -0,0 +1,134 @@
+# prospectconnect_sync/tools/pc_transport.py
+"""HTTP transport for bulk calls to ProspectConnect.
+
+Unlike the ORM side of the module it holds no environment or cursor, so it
+can be shared by worker threads: sessions are kept per thread and the rate
+limit is enforced across all of them.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .pc_codec import decode_response, post_json
+from .pc_tape import current_tape
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import requests
+except Exception:  # pragma: no cover
+    requests = None
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Spaces calls made from any number of threads ``1 / rate`` seconds apart.
+
+    :param rate: maximum calls per second (falsy for no limit)
+    """
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller may make its call."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class PcTransport:
+    """Rate-limited, retrying client issuing ProspectConnect calls concurrently.
+
+    :param rate_limit: maximum requests per second over all threads (falsy
+        for no limit)
+    :param concurrency: number of requests in flight in :meth:`post_many`
+    :param stats: optional dict collecting bytes on the wire per endpoint
+    """
+
+    def __init__(self, base_url, headers, rate_limit=None, concurrency=4, timeout=20, max_retries=3, stats=None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers)
+        self.limiter = RateLimiter(rate_limit)
+        self.concurrency = max(concurrency, 1)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.stats = stats
+        # Worker threads have no tape of their own: use the creator's
+        self.tape = current_tape()
+        self._local = threading.local()
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            # Headers are sent per call: Content-Encoding depends on the body
+            session = self._local.session = requests.Session()
+        return session
+
+    def _retry_delay(self, resp, attempt):
+        try:
+            return float(resp.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return float(2 ** attempt)
+
+    def post(self, path, payload, headers=None):
+        """POST ``payload`` to ``path``, retrying throttled and 5xx answers.
+
+        :param headers: sent on top of the client's headers (e.g. the
+            idempotency key that makes retrying a create safe)
+
+        :return: decoded JSON body (``{}`` when empty)
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait()
+            resp = post_json(
+                self.base_url + path, payload, dict(self.headers, **(headers or {})), self.timeout,
+                session=self._session(), stats=self.stats, tape=self.tape,
+            )
+            if resp.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_delay(resp, attempt)
+                _logger.debug("ProspectConnect %s answered %s, retrying in %ss", path, resp.status_code, delay)
+                time.sleep(delay)
+                continue
+            resp.raise_for_status()
+            return decode_response(resp, self.stats)
+
+    def post_many(self, calls):
+        """Run ``(path, payload)`` or ``(path, payload, headers)`` calls
+        concurrently.
+
+        :return: list of ``(data, error)`` in the order of ``calls``
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="pc_transport"
+            )
+        futures = [self._pool.submit(self.post, *call) for call in calls]
+        results = []
+        for future in futures:
+            try:
+                results.append((future.result(), None))
+            except Exception as e:
+                results.append((None, e))
+        return results